@@ -0,0 +1,42 @@
+"""add_keyset_pagination_indexes
+
+Índices compuestos para la paginación por cursor de las conexiones GraphQL
+(miembrosConexion, cuotasAnualesConexion, notificacionesConexion,
+historialEstadoConexion, ordenesCobroConexion). Cada índice cubre las
+claves de orden de la conexión, precedidas del filtro habitual cuando lo hay.
+
+Revision ID: g6h7i8j9k0l1
+Revises: f5g6h7i8j9k0
+Create Date: 2026-10-17 10:00:00.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+
+
+revision: str = 'g6h7i8j9k0l1'
+down_revision: Union[str, None] = 'f5g6h7i8j9k0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (nombre, tabla, columnas)
+INDICES = [
+    ('ix_miembros_fecha_alta_id', 'miembros', ['fecha_alta', 'id']),
+    ('ix_cuotas_anuales_ejercicio_id', 'cuotas_anuales', ['ejercicio', 'id']),
+    ('ix_cuotas_anuales_miembro_ejercicio_id', 'cuotas_anuales', ['miembro_id', 'ejercicio', 'id']),
+    ('ix_notificaciones_fecha_creacion_id', 'notificaciones', ['fecha_creacion', 'id']),
+    ('ix_notificaciones_usuario_fecha_creacion_id', 'notificaciones', ['usuario_id', 'fecha_creacion', 'id']),
+    ('ix_historial_estados_fecha_cambio_id', 'historial_estados', ['fecha_cambio', 'id']),
+    ('ix_historial_estados_entidad_fecha_cambio_id', 'historial_estados', ['entidad_tipo', 'entidad_id', 'fecha_cambio', 'id']),
+    ('ix_ordenes_cobro_remesa_id_id', 'ordenes_cobro', ['remesa_id', 'id']),
+]
+
+
+def upgrade() -> None:
+    for nombre, tabla, columnas in INDICES:
+        op.create_index(nombre, tabla, columnas, unique=False)
+
+
+def downgrade() -> None:
+    for nombre, tabla, _ in reversed(INDICES):
+        op.drop_index(nombre, table_name=tabla)
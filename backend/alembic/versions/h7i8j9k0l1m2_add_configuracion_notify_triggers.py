@@ -0,0 +1,44 @@
+"""add_configuracion_notify_triggers
+
+Triggers que emiten NOTIFY en el canal ``configuraciones_cambios`` tras
+cualquier escritura en ``configuraciones`` o ``reglas_validacion_config``.
+El registro de configuración de cada proceso escucha el canal y se recarga.
+
+Revision ID: h7i8j9k0l1m2
+Revises: g6h7i8j9k0l1
+Create Date: 2026-10-17 12:00:00.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+
+
+revision: str = 'h7i8j9k0l1m2'
+down_revision: Union[str, None] = 'g6h7i8j9k0l1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLAS = ['configuraciones', 'reglas_validacion_config']
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notificar_cambio_configuracion() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('configuraciones_cambios', TG_TABLE_NAME);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for tabla in TABLAS:
+        op.execute(f"""
+            CREATE TRIGGER trg_{tabla}_notificar
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {tabla}
+            FOR EACH STATEMENT EXECUTE FUNCTION notificar_cambio_configuracion()
+        """)
+
+
+def downgrade() -> None:
+    for tabla in TABLAS:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{tabla}_notificar ON {tabla}")
+    op.execute("DROP FUNCTION IF EXISTS notificar_cambio_configuracion()")
@@ -0,0 +1,57 @@
+"""add_estados_notify_triggers
+
+Triggers que emiten NOTIFY en el canal ``estados_cambios`` tras cualquier
+escritura en los catálogos de estados. El registro de estados de cada
+proceso escucha el canal y se recarga.
+
+Revision ID: i8j9k0l1m2n3
+Revises: h7i8j9k0l1m2
+Create Date: 2026-10-17 13:00:00.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+
+
+revision: str = 'i8j9k0l1m2n3'
+down_revision: Union[str, None] = 'h7i8j9k0l1m2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLAS = [
+    'estados_cuota',
+    'estados_campania',
+    'estados_tarea',
+    'estados_actividad',
+    'estados_participante',
+    'estados_orden_cobro',
+    'estados_remesa',
+    'estados_donacion',
+    'estados_notificacion',
+    'estados_miembro',
+    'estados_planificacion',
+    'estados_propuesta',
+]
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notificar_cambio_estados() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('estados_cambios', TG_TABLE_NAME);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for tabla in TABLAS:
+        op.execute(f"""
+            CREATE TRIGGER trg_{tabla}_notificar
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {tabla}
+            FOR EACH STATEMENT EXECUTE FUNCTION notificar_cambio_estados()
+        """)
+
+
+def downgrade() -> None:
+    for tabla in TABLAS:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{tabla}_notificar ON {tabla}")
+    op.execute("DROP FUNCTION IF EXISTS notificar_cambio_estados()")
@@ -0,0 +1,39 @@
+"""add_ips_bloqueadas_notify_trigger
+
+Trigger que emite NOTIFY en el canal ``ips_bloqueadas_cambios`` tras
+cualquier escritura en ``ips_bloqueadas``. La lista de bloqueo de cada
+proceso escucha el canal y relee las filas modificadas.
+
+Revision ID: j9k0l1m2n3o4
+Revises: i8j9k0l1m2n3
+Create Date: 2026-10-17 19:00:00.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+
+
+revision: str = 'j9k0l1m2n3o4'
+down_revision: Union[str, None] = 'i8j9k0l1m2n3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notificar_cambio_ips_bloqueadas() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('ips_bloqueadas_cambios', TG_OP);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_ips_bloqueadas_notificar
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON ips_bloqueadas
+        FOR EACH STATEMENT EXECUTE FUNCTION notificar_cambio_ips_bloqueadas()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_ips_bloqueadas_notificar ON ips_bloqueadas")
+    op.execute("DROP FUNCTION IF EXISTS notificar_cambio_ips_bloqueadas()")
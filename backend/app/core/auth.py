@@ -1,8 +1,16 @@
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any
 
 import jwt
 from passlib.context import CryptContext
+from starlette.datastructures import Headers
 
 from .config import get_settings
 
@@ -17,6 +25,41 @@ def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
+# bcrypt tarda ~100-300 ms por hash y libera el GIL: desde código async se
+# ejecuta en un pool de hilos acotado para no bloquear el event loop. El
+# tamaño del pool (``hash_concurrencia``) limita los hashes simultáneos; el
+# resto espera turno en la cola del pool sin ocupar CPU.
+_pool_hash: ThreadPoolExecutor | None = None
+
+
+def _get_pool_hash() -> ThreadPoolExecutor:
+    global _pool_hash
+    if _pool_hash is None:
+        _pool_hash = ThreadPoolExecutor(
+            max_workers=max(1, get_settings().hash_concurrencia),
+            thread_name_prefix="bcrypt",
+        )
+    return _pool_hash
+
+
+async def ahash_password(password: str) -> str:
+    """``hash_password`` en el pool de hash (no bloquea el event loop)."""
+    return await asyncio.get_running_loop().run_in_executor(_get_pool_hash(), hash_password, password)
+
+
+async def averify_password(plain: str, hashed: str) -> bool:
+    """``verify_password`` en el pool de hash (no bloquea el event loop)."""
+    return await asyncio.get_running_loop().run_in_executor(_get_pool_hash(), verify_password, plain, hashed)
+
+
+def cerrar_pool_hash() -> None:
+    """Cierra el pool de hash (al parar la aplicación)."""
+    global _pool_hash
+    if _pool_hash is not None:
+        _pool_hash.shutdown(wait=False, cancel_futures=True)
+        _pool_hash = None
+
+
 def create_token(user_id: int, roles: list[str]) -> str:
     settings = get_settings()
     expire = datetime.utcnow() + timedelta(minutes=settings.jwt_expire_minutes)
@@ -28,9 +71,62 @@ def create_token(user_id: int, roles: list[str]) -> str:
     return jwt.encode(payload, settings.jwt_secret, algorithm=settings.jwt_algorithm)
 
 
+# Tokens verificados recientemente: sha256(token) -> (payload, exp). Una
+# misma sesión repite su token en cada petición; mientras no caduque, se
+# reutiliza el payload sin volver a verificar la firma.
+MAX_TOKENS_VERIFICADOS = 1024
+_tokens_verificados: "OrderedDict[bytes, tuple[dict[str, Any], float]]" = OrderedDict()
+_lock_tokens = threading.Lock()
+
+
 def decode_token(token: str) -> dict[str, Any] | None:
+    clave = hashlib.sha256(token.encode()).digest()
+    with _lock_tokens:
+        verificado = _tokens_verificados.get(clave)
+        if verificado is not None:
+            if verificado[1] > time.time():
+                _tokens_verificados.move_to_end(clave)
+                return dict(verificado[0])
+            del _tokens_verificados[clave]
+
     settings = get_settings()
     try:
-        return jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
+        payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
     except jwt.PyJWTError:
         return None
+
+    if "exp" in payload:
+        with _lock_tokens:
+            _tokens_verificados[clave] = (payload, float(payload["exp"]))
+            if len(_tokens_verificados) > MAX_TOKENS_VERIFICADOS:
+                _tokens_verificados.popitem(last=False)
+    return dict(payload)
+
+
+@dataclass(frozen=True)
+class Claims:
+    """Datos del token de una petición, ya verificado."""
+    sub: str
+    roles: tuple[str, ...]
+
+
+def claims_de_peticion(scope) -> Claims | None:
+    """Claims del token Bearer de la petición ASGI, o None si no hay token válido.
+
+    Se verifica una sola vez por petición: el resultado se guarda en el
+    estado de la petición (``request.state``), compartido por los
+    middlewares y el contexto GraphQL.
+    """
+    estado = scope.setdefault("state", {})
+    if "claims" not in estado:
+        estado["claims"] = _claims_de_autorizacion(Headers(scope=scope).get("Authorization", ""))
+    return estado["claims"]
+
+
+def _claims_de_autorizacion(auth: str) -> Claims | None:
+    if not auth.startswith("Bearer "):
+        return None
+    payload = decode_token(auth[7:])
+    if not payload:
+        return None
+    return Claims(sub=str(payload["sub"]), roles=tuple(payload.get("roles", [])))
@@ -0,0 +1,50 @@
+"""Middleware que rechaza las peticiones de IPs bloqueadas.
+
+Consulta la lista de bloqueo en memoria (``ListaBloqueoIP``, con rangos CIDR
+y expiración) antes de cualquier otra cosa: una IP bloqueada recibe 403 sin
+consumir presupuesto del límite de tasa ni tocar la base de datos.
+"""
+
+import math
+import time
+
+from starlette.responses import JSONResponse
+
+from ..infrastructure.services.lista_bloqueo_ip import get_lista_bloqueo_ip
+
+
+def ip_cliente(scope) -> str:
+    """IP del cliente de la conexión ASGI."""
+    cliente = scope.get("client")
+    return cliente[0] if cliente else "desconocida"
+
+
+class BloqueoIPMiddleware:
+    """Middleware ASGI que responde 403 a las IPs de la lista de bloqueo."""
+
+    def __init__(self, app, prefijo: str = "/graphql"):
+        self.app = app
+        self.prefijo = prefijo
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefijo):
+            await self.app(scope, receive, send)
+            return
+
+        expira = get_lista_bloqueo_ip().expira(ip_cliente(scope))
+        if expira is None:
+            await self.app(scope, receive, send)
+            return
+
+        cabeceras = {}
+        if not math.isinf(expira):
+            cabeceras["Retry-After"] = str(max(1, math.ceil(expira - time.time())))
+        respuesta = JSONResponse(
+            {"errors": [{
+                "message": "Esta IP está bloqueada.",
+                "extensions": {"code": "IP_BLOQUEADA"},
+            }]},
+            status_code=403,
+            headers=cabeceras,
+        )
+        await respuesta(scope, receive, send)
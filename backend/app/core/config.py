@@ -11,11 +11,57 @@ class Settings(BaseSettings):
     db_user: str
     db_password: str
 
+    # Pool de conexiones del engine
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 10.0  # segundos esperando una conexión libre
+    db_pool_recycle: int = 1800  # segundos de vida máxima de una conexión
+    db_pool_pre_ping: bool = True
+    # Pooler en modo transacción (pgbouncer/Supavisor): sin caché de sentencias preparadas
+    db_pgbouncer: bool = True
+
+    # Supabase Session Pooler o conexión directa (las mismas DB_SESSION_* que usa alembic).
+    # La conexión de LISTEN necesita sesión propia: a través del pooler en modo
+    # transacción no recibe los NOTIFY.
+    db_session_host: str | None = None
+    db_session_port: int = 5432
+
+    # Réplica de lectura opcional (URL postgresql+asyncpg://...) para queries e informes.
+    # Tras una mutation, las queries del mismo usuario van a la primaria durante la ventana.
+    db_replica_url: str | None = None
+    db_replica_ventana_segundos: int = 5
+
     # JWT
     jwt_secret: str
     jwt_algorithm: str = "HS256"
     jwt_expire_minutes: int = 1440
 
+    # Hashes bcrypt simultáneos como máximo (hilos del pool de ahash_password/averify_password)
+    hash_concurrencia: int = 4
+
+    # Límite de tasa de /graphql (peticiones por periodo, por IP y por usuario)
+    limite_periodo_segundos: int = 60
+    limite_ip_peticiones: int = 600
+    limite_usuario_peticiones: int = 300
+
+    # Control de admisión de /graphql por worker (operaciones en curso, cola y espera máxima en segundos)
+    graphql_max_concurrentes: int = 16
+    graphql_max_en_cola: int = 64
+    graphql_espera_cola: float = 2.0
+
+    # Coste estático de las operaciones GraphQL (ver graphql/coste.py): máximos por operación
+    # y presupuesto de coste por usuario o IP cada limite_periodo_segundos
+    graphql_profundidad_maxima: int = 8
+    graphql_coste_maximo: int = 10000
+    graphql_coste_periodo: int = 60000
+
+    # Token Bearer para GET /metrics; sin él, solo se sirven a clientes locales (127.0.0.1/::1)
+    metrics_token: str | None = None
+
+    # statement_timeout (ms) de la transacción de cada operación GraphQL según su tipo
+    db_statement_timeout_query_ms: int = 5000
+    db_statement_timeout_mutation_ms: int = 15000
+
     @computed_field
     @property
     def database_url(self) -> str:
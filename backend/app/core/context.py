@@ -5,7 +5,7 @@ from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from strawberry.fastapi import BaseContext
 
-from .auth import decode_token
+from .auth import Claims, claims_de_peticion
 from .database import async_session
 
 
@@ -13,27 +13,21 @@ from .database import async_session
 class Context(BaseContext):
     request: Request
 
+    @cached_property
+    def claims(self) -> Claims | None:
+        return claims_de_peticion(self.request.scope)
+
     @cached_property
     def user_id(self) -> int | None:
-        auth = self.request.headers.get("Authorization", "")
-        if not auth.startswith("Bearer "):
+        if self.claims is None:
             return None
-        token = auth[7:]
-        payload = decode_token(token)
-        if not payload:
-            return None
-        return int(payload["sub"])
+        return int(self.claims.sub)
 
     @cached_property
     def user_roles(self) -> list[str]:
-        auth = self.request.headers.get("Authorization", "")
-        if not auth.startswith("Bearer "):
-            return []
-        token = auth[7:]
-        payload = decode_token(token)
-        if not payload:
+        if self.claims is None:
             return []
-        return payload.get("roles", [])
+        return list(self.claims.roles)
 
     async def get_db(self) -> AsyncSession:
         return async_session()
@@ -1,15 +1,103 @@
+import asyncio
+import uuid
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-from .config import get_settings
+from .config import Settings, get_settings
 
-# PostgreSQL local - configuración simple sin pool complejo
-engine = create_async_engine(
-    get_settings().database_url,
-    echo=False,
-)
+
+class PoolMedido(AsyncAdaptedQueuePool):
+    """Pool del engine que cuenta las peticiones esperando conexión libre."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.esperando = 0
+
+    def _do_get(self):
+        # Sin conexiones libres ni overflow disponible: la petición espera en la cola
+        espera = self.checkedin() == 0 and 0 <= self._max_overflow <= self.overflow()
+        if not espera:
+            return super()._do_get()
+        self.esperando += 1
+        try:
+            return super()._do_get()
+        finally:
+            self.esperando -= 1
+
+
+def _argumentos_conexion(settings: Settings) -> dict:
+    """Argumentos de asyncpg. Con un pooler en modo transacción cada sentencia
+    puede ir a una conexión de servidor distinta: sin caché de sentencias
+    preparadas y con nombres únicos para que no colisionen entre clientes."""
+    if not settings.db_pgbouncer:
+        return {}
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+    }
+
+
+def _crear_engine(settings: Settings, url: str):
+    return create_async_engine(
+        url,
+        echo=False,
+        poolclass=PoolMedido,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args=_argumentos_conexion(settings),
+    )
+
+
+_settings = get_settings()
+engine = _crear_engine(_settings, _settings.database_url)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+# Sesiones de solo lectura: misma pool, transacciones ``BEGIN READ ONLY`` (se
+# restablece al devolver la conexión al pool)
+async_session_lectura = async_sessionmaker(
+    engine.execution_options(postgresql_readonly=True), class_=AsyncSession, expire_on_commit=False
+)
+
+# Réplica de lectura (``db_replica_url``). Sin réplica configurada,
+# ``async_session_replica`` abre sesiones de solo lectura en la primaria, así
+# que informes y exportaciones pueden usarla siempre.
+engine_replica = _crear_engine(_settings, _settings.db_replica_url) if _settings.db_replica_url else None
+async_session_replica = async_sessionmaker(
+    (engine_replica or engine).execution_options(postgresql_readonly=True),
+    class_=AsyncSession, expire_on_commit=False,
+)
+
+
+# Clave en session.info: statement_timeout (ms) de las transacciones de la sesión
+STATEMENT_TIMEOUT = 'statement_timeout_ms'
+
+
+@event.listens_for(Session, 'after_begin')
+def _aplicar_statement_timeout(session: Session, transaction, connection) -> None:
+    # SET LOCAL dura lo que la transacción: no se filtra a otras sesiones del pool ni del pooler
+    timeout = session.info.get(STATEMENT_TIMEOUT)
+    if timeout:
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout)}")
+
+
+# Clave en session.info: tareas lanzadas en after_commit (invalidación de cachés)
+# que la petición espera antes de responder
+TAREAS_TRAS_COMMIT = 'tareas_tras_commit'
+
+
+async def esperar_tareas_tras_commit(session) -> None:
+    """Espera a las tareas de after_commit de ``session``: la siguiente lectura ya no ve datos viejos."""
+    tareas = session.info.pop(TAREAS_TRAS_COMMIT, None)
+    if tareas:
+        await asyncio.gather(*tareas, return_exceptions=True)
+
 
 class Base(DeclarativeBase):
     pass
@@ -29,3 +117,25 @@ async def get_session() -> AsyncSession:
     """Obtiene una sesión de base de datos (para uso en resolvers GraphQL)."""
     async with async_session() as session:
         yield session
+
+
+def exportar_metricas_pool() -> str:
+    """Estado de los pools de conexiones en formato de texto de Prometheus."""
+    pools = [("principal", engine.sync_engine.pool)]
+    if engine_replica is not None:
+        pools.append(("replica", engine_replica.sync_engine.pool))
+
+    gauges = {
+        "db_pool_conexiones_en_uso": ("Conexiones prestadas a sesiones", lambda p: p.checkedout()),
+        "db_pool_conexiones_libres": ("Conexiones abiertas sin usar en el pool", lambda p: p.checkedin()),
+        "db_pool_overflow": ("Conexiones abiertas por encima de pool_size", lambda p: max(0, p.overflow())),
+        "db_pool_esperando": ("Peticiones esperando una conexión libre", lambda p: getattr(p, "esperando", 0)),
+        "db_pool_tamano": ("Tamaño configurado del pool", lambda p: p.size()),
+    }
+    lineas = []
+    for nombre, (ayuda, valor) in gauges.items():
+        lineas.append(f"# HELP {nombre} {ayuda}")
+        lineas.append(f"# TYPE {nombre} gauge")
+        for etiqueta, pool in pools:
+            lineas.append(f'{nombre}{{engine="{etiqueta}"}} {valor(pool)}')
+    return '\n'.join(lineas) + '\n'
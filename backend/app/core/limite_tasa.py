@@ -0,0 +1,71 @@
+"""Middleware de límite de tasa para el endpoint GraphQL.
+
+Cada petición a ``/graphql`` consume del presupuesto de su IP y, si trae un
+token válido, también del de su usuario (``LimitadorTasa``, GCRA). Si alguno
+se agota se responde 429 con ``Retry-After`` sin llegar a ejecutar la
+operación; si no, la respuesta lleva ``RateLimit-Limit`` y
+``RateLimit-Remaining`` del presupuesto más ajustado.
+"""
+
+import math
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+
+from .auth import claims_de_peticion
+from .bloqueo_ip import ip_cliente
+from .config import get_settings
+from ..infrastructure.services.limitador_tasa import Limite, get_limitador_tasa
+
+
+class LimiteTasaMiddleware:
+    """Middleware ASGI con presupuestos por IP y por usuario."""
+
+    def __init__(self, app, prefijo: str = "/graphql"):
+        self.app = app
+        self.prefijo = prefijo
+        settings = get_settings()
+        periodo = settings.limite_periodo_segundos
+        self.limite_ip = Limite("graphql_ip", settings.limite_ip_peticiones, periodo)
+        self.limite_usuario = Limite("graphql_usuario", settings.limite_usuario_peticiones, periodo)
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or scope["method"] == "OPTIONS"
+                or not scope["path"].startswith(self.prefijo)):
+            await self.app(scope, receive, send)
+            return
+
+        limitador = get_limitador_tasa()
+        limite, resultado = self.limite_ip, await limitador.consumir(self.limite_ip, ip_cliente(scope))
+        claims = claims_de_peticion(scope)
+        if resultado.permitido and claims is not None:
+            resultado_usuario = await limitador.consumir(self.limite_usuario, claims.sub)
+            if not resultado_usuario.permitido or resultado_usuario.restantes < resultado.restantes:
+                limite, resultado = self.limite_usuario, resultado_usuario
+
+        cabeceras = {
+            "RateLimit-Limit": str(limite.peticiones),
+            "RateLimit-Remaining": str(resultado.restantes),
+        }
+        if not resultado.permitido:
+            cabeceras["Retry-After"] = str(max(1, math.ceil(resultado.reintentar_en)))
+            respuesta = JSONResponse(
+                {"errors": [{
+                    "message": "Demasiadas peticiones. Intente nuevamente más tarde.",
+                    "extensions": {"code": "DEMASIADAS_PETICIONES"},
+                }]},
+                status_code=429,
+                headers=cabeceras,
+            )
+            await respuesta(scope, receive, send)
+            return
+
+        async def send_con_cabeceras(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for nombre, valor in cabeceras.items():
+                    headers[nombre] = valor
+            await send(message)
+
+        await self.app(scope, receive, send_con_cabeceras)
+
@@ -2,9 +2,9 @@ from functools import wraps
 from typing import Callable, Any
 
 from strawberry.types import Info
-from sqlalchemy import select
 
 from .context import Context
+from ..infrastructure.registro_permisos import registro_permisos
 
 
 class PermissionError(Exception):
@@ -37,7 +37,7 @@ def requiere_rol(*roles_permitidos: str) -> Callable:
 
 
 def requiere_transaccion(codigo_transaccion: str) -> Callable:
-    """Decorator: verifica permiso via tabla rol_transaccion."""
+    """Decorator: verifica permiso via tabla rol_transaccion (matriz en memoria)."""
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(*args, info: Info[Context, Any], **kwargs):
@@ -48,24 +48,10 @@ def requiere_transaccion(codigo_transaccion: str) -> Callable:
             if not user_roles:
                 raise PermissionError("Sin roles asignados")
 
-            from ..models import RolTransaccion, Transaccion, Rol
-
-            async with await info.context.get_db() as db:
-                # Buscar si alguno de los roles del usuario tiene permiso para esta transacción
-                result = await db.execute(
-                    select(RolTransaccion)
-                    .join(Rol, RolTransaccion.rol_id == Rol.id)
-                    .join(Transaccion, RolTransaccion.transaccion_id == Transaccion.id)
-                    .where(
-                        Rol.codigo.in_(user_roles),
-                        Transaccion.codigo == codigo_transaccion,
-                        Transaccion.activo == True
-                    )
-                )
-                permiso = result.scalar_one_or_none()
-
-                if not permiso:
-                    raise PermissionError(f"Sin permiso para: {codigo_transaccion}")
+            # Matriz rol -> transacciones en memoria: sin consultas por llamada
+            await registro_permisos.asegurar_cargado()
+            if not registro_permisos.permite(user_roles, codigo_transaccion):
+                raise PermissionError(f"Sin permiso para: {codigo_transaccion}")
 
             return await func(*args, info=info, **kwargs)
         return wrapper
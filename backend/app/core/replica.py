@@ -0,0 +1,33 @@
+"""Lectura de lo escrito (read-your-writes) con réplica de lectura.
+
+La réplica va con algo de retraso respecto a la primaria, así que tras una
+mutation el mismo usuario podría no ver su cambio en la siguiente query.
+Cada mutation confirmada marca al usuario durante
+``db_replica_ventana_segundos`` (en la caché compartida, para que lo vean
+todos los workers) y, mientras dure la marca, sus queries van a la
+primaria. Sin réplica configurada no se marca nada.
+"""
+
+from .config import get_settings
+from .database import engine_replica
+from ..infrastructure.services.cache_service import get_cache_service, generar_cache_key
+
+
+def _clave(usuario: str) -> str:
+    return generar_cache_key("escritura_reciente", usuario)
+
+
+async def marcar_escritura(usuario: str) -> None:
+    """Registra que ``usuario`` acaba de confirmar cambios en la primaria."""
+    if engine_replica is None:
+        return
+    await get_cache_service().aset(_clave(usuario), True, ttl=get_settings().db_replica_ventana_segundos)
+
+
+async def puede_leer_de_replica(usuario: str | None) -> bool:
+    """Si las lecturas de ``usuario`` pueden ir a la réplica."""
+    if engine_replica is None:
+        return False
+    if usuario is None:
+        return True
+    return not await get_cache_service().aexists(_clave(usuario))
@@ -9,6 +9,8 @@ from sqlalchemy import String, Integer, Uuid, ForeignKey, Date, Numeric, Text, B
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ....infrastructure.base_model import BaseModel
+from ....infrastructure.maquinas_estado import Transicion
+from ...core.models.estados import TRANSICIONES_TAREA
 
 
 # === PROPUESTAS ===
@@ -46,10 +48,10 @@ class PropuestaActividad(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
-    estado = relationship('EstadoPropuesta', back_populates='propuestas', lazy='selectin')
-    tareas = relationship('TareaPropuesta', back_populates='propuesta', lazy='selectin')
-    recursos = relationship('RecursoPropuesta', back_populates='propuesta', lazy='selectin')
-    grupos_asignados = relationship('GrupoPropuesta', back_populates='propuesta', lazy='selectin')
+    estado = relationship('EstadoPropuesta', back_populates='propuestas', lazy='raise_on_sql')
+    tareas = relationship('TareaPropuesta', back_populates='propuesta', lazy='raise_on_sql')
+    recursos = relationship('RecursoPropuesta', back_populates='propuesta', lazy='raise_on_sql')
+    grupos_asignados = relationship('GrupoPropuesta', back_populates='propuesta', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<PropuestaActividad(codigo='{self.codigo}', titulo='{self.titulo}')>"
@@ -76,7 +78,7 @@ class TareaPropuesta(BaseModel):
     horas_estimadas: Mapped[Optional[Decimal]] = mapped_column(Numeric(6, 2), nullable=True)
 
     # Relaciones
-    propuesta = relationship('PropuestaActividad', back_populates='tareas', lazy='selectin')
+    propuesta = relationship('PropuestaActividad', back_populates='tareas', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<TareaPropuesta(nombre='{self.nombre}', propuesta_id='{self.propuesta_id}')>"
@@ -102,8 +104,8 @@ class RecursoPropuesta(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
-    propuesta = relationship('PropuestaActividad', back_populates='recursos', lazy='selectin')
-    tipo_recurso = relationship('TipoRecurso', lazy='selectin')
+    propuesta = relationship('PropuestaActividad', back_populates='recursos', lazy='raise_on_sql')
+    tipo_recurso = relationship('TipoRecurso', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<RecursoPropuesta(descripcion='{self.descripcion}', cantidad={self.cantidad})>"
@@ -121,7 +123,7 @@ class GrupoPropuesta(BaseModel):
     horas_estimadas: Mapped[Optional[Decimal]] = mapped_column(Numeric(6, 2), nullable=True)
 
     # Relaciones
-    propuesta = relationship('PropuestaActividad', back_populates='grupos_asignados', lazy='selectin')
+    propuesta = relationship('PropuestaActividad', back_populates='grupos_asignados', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<GrupoPropuesta(propuesta_id='{self.propuesta_id}', grupo_id='{self.grupo_trabajo_id}')>"
@@ -133,6 +135,14 @@ class Actividad(BaseModel):
     """Actividad de la organización."""
     __tablename__ = 'actividades'
 
+    # Transiciones de estado permitidas (ver maquinas_estado)
+    TRANSICIONES = (
+        Transicion('PROPUESTA', ('APROBADA', 'CANCELADA')),
+        Transicion('APROBADA', ('PROGRAMADA', 'CANCELADA')),
+        Transicion('PROGRAMADA', ('EN_CURSO', 'CANCELADA')),
+        Transicion('EN_CURSO', ('COMPLETADA', 'CANCELADA')),
+    )
+
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     codigo: Mapped[str] = mapped_column(String(50), unique=True, nullable=False, index=True)
     nombre: Mapped[str] = mapped_column(String(200), nullable=False, index=True)
@@ -182,15 +192,15 @@ class Actividad(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
-    campania = relationship('Campania', back_populates='actividades', lazy='selectin')
-    tipo_actividad = relationship('TipoActividad', back_populates='actividades', lazy='selectin')
-    estado = relationship('EstadoActividad', back_populates='actividades', lazy='selectin')
-    propuesta = relationship('PropuestaActividad', lazy='selectin')
-    tareas = relationship('TareaActividad', back_populates='actividad', lazy='selectin')
-    recursos = relationship('RecursoActividad', back_populates='actividad', lazy='selectin')
-    participantes = relationship('ParticipanteActividad', back_populates='actividad', lazy='selectin')
-    grupos_trabajo = relationship('GrupoActividad', back_populates='actividad', lazy='selectin')
-    kpis = relationship('KPIActividad', back_populates='actividad', lazy='selectin')
+    campania = relationship('Campania', back_populates='actividades', lazy='raise_on_sql')
+    tipo_actividad = relationship('TipoActividad', back_populates='actividades', lazy='raise_on_sql')
+    estado = relationship('EstadoActividad', back_populates='actividades', lazy='raise_on_sql')
+    propuesta = relationship('PropuestaActividad', lazy='raise_on_sql')
+    tareas = relationship('TareaActividad', back_populates='actividad', lazy='raise_on_sql')
+    recursos = relationship('RecursoActividad', back_populates='actividad', lazy='raise_on_sql')
+    participantes = relationship('ParticipanteActividad', back_populates='actividad', lazy='raise_on_sql')
+    grupos_trabajo = relationship('GrupoActividad', back_populates='actividad', lazy='raise_on_sql')
+    kpis = relationship('KPIActividad', back_populates='actividad', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<Actividad(codigo='{self.codigo}', nombre='{self.nombre}')>"
@@ -206,6 +216,9 @@ class TareaActividad(BaseModel):
     """Tarea asociada a una actividad."""
     __tablename__ = 'tareas_actividad'
 
+    # Transiciones de estado permitidas (ver maquinas_estado)
+    TRANSICIONES = TRANSICIONES_TAREA
+
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     actividad_id: Mapped[uuid.UUID] = mapped_column(Uuid, ForeignKey('actividades.id'), nullable=False, index=True)
 
@@ -229,8 +242,8 @@ class TareaActividad(BaseModel):
     horas_reales: Mapped[Optional[Decimal]] = mapped_column(Numeric(6, 2), nullable=True)
 
     # Relaciones
-    actividad = relationship('Actividad', back_populates='tareas', lazy='selectin')
-    estado = relationship('EstadoTarea', foreign_keys=[estado_id], lazy='selectin')
+    actividad = relationship('Actividad', back_populates='tareas', lazy='raise_on_sql')
+    estado = relationship('EstadoTarea', foreign_keys=[estado_id], lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<TareaActividad(nombre='{self.nombre}', actividad_id='{self.actividad_id}')>"
@@ -261,8 +274,8 @@ class RecursoActividad(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
-    actividad = relationship('Actividad', back_populates='recursos', lazy='selectin')
-    tipo_recurso = relationship('TipoRecurso', lazy='selectin')
+    actividad = relationship('Actividad', back_populates='recursos', lazy='raise_on_sql')
+    tipo_recurso = relationship('TipoRecurso', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<RecursoActividad(descripcion='{self.descripcion}', cantidad={self.cantidad})>"
@@ -281,7 +294,7 @@ class GrupoActividad(BaseModel):
     horas_reales: Mapped[Optional[Decimal]] = mapped_column(Numeric(6, 2), nullable=True)
 
     # Relaciones
-    actividad = relationship('Actividad', back_populates='grupos_trabajo', lazy='selectin')
+    actividad = relationship('Actividad', back_populates='grupos_trabajo', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<GrupoActividad(actividad_id='{self.actividad_id}', grupo_id='{self.grupo_trabajo_id}')>"
@@ -302,7 +315,7 @@ class ParticipanteActividad(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
-    actividad = relationship('Actividad', back_populates='participantes', lazy='selectin')
+    actividad = relationship('Actividad', back_populates='participantes', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<ParticipanteActividad(miembro_id='{self.miembro_id}', rol='{self.rol}')>"
@@ -327,7 +340,7 @@ class KPI(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    tipo_kpi = relationship('TipoKPI', back_populates='kpis', lazy='selectin')
+    tipo_kpi = relationship('TipoKPI', back_populates='kpis', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<KPI(codigo='{self.codigo}', nombre='{self.nombre}')>"
@@ -349,9 +362,9 @@ class KPIActividad(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
-    actividad = relationship('Actividad', back_populates='kpis', lazy='selectin')
-    kpi = relationship('KPI', lazy='selectin')
-    mediciones = relationship('MedicionKPI', back_populates='kpi_actividad', lazy='selectin')
+    actividad = relationship('Actividad', back_populates='kpis', lazy='raise_on_sql')
+    kpi = relationship('KPI', lazy='raise_on_sql')
+    mediciones = relationship('MedicionKPI', back_populates='kpi_actividad', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<KPIActividad(kpi_id='{self.kpi_id}', objetivo={self.valor_objetivo})>"
@@ -370,7 +383,7 @@ class MedicionKPI(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
-    kpi_actividad = relationship('KPIActividad', back_populates='mediciones', lazy='selectin')
+    kpi_actividad = relationship('KPIActividad', back_populates='mediciones', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<MedicionKPI(valor={self.valor_medido}, fecha='{self.fecha_medicion}')>"
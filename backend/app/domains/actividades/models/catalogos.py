@@ -23,7 +23,7 @@ class TipoActividad(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    actividades = relationship('Actividad', back_populates='tipo_actividad', lazy='selectin')
+    actividades = relationship('Actividad', back_populates='tipo_actividad', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<TipoActividad(nombre='{self.nombre}')>"
@@ -41,7 +41,7 @@ class EstadoPropuesta(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    propuestas = relationship('PropuestaActividad', back_populates='estado', lazy='selectin')
+    propuestas = relationship('PropuestaActividad', back_populates='estado', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<EstadoPropuesta(nombre='{self.nombre}')>"
@@ -71,7 +71,7 @@ class TipoKPI(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    kpis = relationship('KPI', back_populates='tipo_kpi', lazy='selectin')
+    kpis = relationship('KPI', back_populates='tipo_kpi', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<TipoKPI(nombre='{self.nombre}')>"
@@ -9,6 +9,7 @@ from sqlalchemy import String, Integer, Uuid, ForeignKey, Date, Numeric, Text, B
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ....infrastructure.base_model import BaseModel
+from ....infrastructure.maquinas_estado import Transicion
 
 
 class TipoCampania(BaseModel):
@@ -21,7 +22,7 @@ class TipoCampania(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    campanias = relationship('Campania', back_populates='tipo_campania', lazy='selectin')
+    campanias = relationship('Campania', back_populates='tipo_campania', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<TipoCampania(nombre='{self.nombre}')>"
@@ -41,7 +42,7 @@ class RolParticipante(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    participantes = relationship('ParticipanteCampania', back_populates='rol_participante', lazy='selectin')
+    participantes = relationship('ParticipanteCampania', back_populates='rol_participante', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<RolParticipante(nombre='{self.nombre}')>"
@@ -51,6 +52,14 @@ class Campania(BaseModel):
     """Campaña de la organización."""
     __tablename__ = 'campanias'
 
+    # Transiciones de estado permitidas (ver maquinas_estado)
+    TRANSICIONES = (
+        Transicion('BORRADOR', ('PROGRAMADA', 'CANCELADA')),
+        Transicion('PROGRAMADA', ('EN_CURSO', 'BORRADOR', 'CANCELADA')),
+        Transicion('EN_CURSO', ('PAUSADA', 'FINALIZADA', 'CANCELADA')),
+        Transicion('PAUSADA', ('EN_CURSO', 'CANCELADA')),
+    )
+
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     nombre: Mapped[str] = mapped_column(String(200), nullable=False, index=True)
     lema: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)  # Eslogan de la campaña
@@ -79,13 +88,13 @@ class Campania(BaseModel):
     agrupacion_id: Mapped[Optional[uuid.UUID]] = mapped_column(Uuid, ForeignKey('agrupaciones_territoriales.id'), nullable=True, index=True)
 
     # Relaciones
-    tipo_campania = relationship('TipoCampania', back_populates='campanias', lazy='selectin')
-    estado = relationship('EstadoCampania', foreign_keys=[estado_id], lazy='selectin')
-    agrupacion = relationship('AgrupacionTerritorial', lazy='selectin')
-    responsable = relationship('Miembro', foreign_keys=[responsable_id], lazy='selectin')
-    actividades = relationship('Actividad', back_populates='campania', lazy='selectin')
-    participantes = relationship('ParticipanteCampania', back_populates='campania', lazy='selectin')
-    firmas = relationship('FirmaCampania', back_populates='campania', lazy='selectin')
+    tipo_campania = relationship('TipoCampania', back_populates='campanias', lazy='raise_on_sql')
+    estado = relationship('EstadoCampania', foreign_keys=[estado_id], lazy='raise_on_sql')
+    agrupacion = relationship('AgrupacionTerritorial', lazy='raise_on_sql')
+    responsable = relationship('Miembro', foreign_keys=[responsable_id], lazy='raise_on_sql')
+    actividades = relationship('Actividad', back_populates='campania', lazy='raise_on_sql')
+    participantes = relationship('ParticipanteCampania', back_populates='campania', lazy='raise_on_sql')
+    firmas = relationship('FirmaCampania', back_populates='campania', lazy='raise_on_sql')
     # Las donaciones están en financiero/models/donaciones.py con campania_id
 
     def __repr__(self) -> str:
@@ -114,8 +123,8 @@ class ParticipanteCampania(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
-    campania = relationship('Campania', back_populates='participantes', lazy='selectin')
-    rol_participante = relationship('RolParticipante', back_populates='participantes', lazy='selectin')
+    campania = relationship('Campania', back_populates='participantes', lazy='raise_on_sql')
+    rol_participante = relationship('RolParticipante', back_populates='participantes', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<ParticipanteCampania(miembro_id='{self.miembro_id}', rol='{self.rol_participante_id}', confirmado={self.confirmado})>"
@@ -149,8 +158,8 @@ class Firmante(BaseModel):
     acepta_comunicaciones: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
     # Relaciones
-    pais = relationship('Pais', lazy='selectin')
-    firmas = relationship('FirmaCampania', back_populates='firmante', lazy='selectin')
+    pais = relationship('Pais', lazy='raise_on_sql')
+    firmas = relationship('FirmaCampania', back_populates='firmante', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<Firmante(email='{self.email}', nombre='{self.nombre} {self.apellidos}')>"
@@ -180,8 +189,8 @@ class FirmaCampania(BaseModel):
     ip_origen: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
 
     # Relaciones
-    campania = relationship('Campania', back_populates='firmas', lazy='selectin')
-    firmante = relationship('Firmante', back_populates='firmas', lazy='selectin')
+    campania = relationship('Campania', back_populates='firmas', lazy='raise_on_sql')
+    firmante = relationship('Firmante', back_populates='firmas', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<FirmaCampania(campania_id='{self.campania_id}', firmante_id='{self.firmante_id}', fecha='{self.fecha_firma}')>"
@@ -21,7 +21,7 @@ class TipoAsociacion(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    asociaciones = relationship('Asociacion', back_populates='tipo', lazy='selectin')
+    asociaciones = relationship('Asociacion', back_populates='tipo', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<TipoAsociacion(nombre='{self.nombre}')>"
@@ -102,9 +102,10 @@ class Asociacion(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
-    tipo = relationship('TipoAsociacion', back_populates='asociaciones', lazy='selectin')
-    direccion = relationship('Direccion', lazy='selectin')
-    provincia = relationship('Provincia', lazy='selectin')
+    tipo = relationship('TipoAsociacion', back_populates='asociaciones', lazy='raise_on_sql')
+    direccion = relationship('Direccion', lazy='raise_on_sql')
+    provincia = relationship('Provincia', lazy='raise_on_sql')
+    # selectin: la recorre tiene_convenio_vigente
     convenios = relationship('Convenio', back_populates='asociacion', lazy='selectin')
 
     def __repr__(self) -> str:
@@ -129,7 +130,7 @@ class EstadoConvenio(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    convenios = relationship('Convenio', back_populates='estado', lazy='selectin')
+    convenios = relationship('Convenio', back_populates='estado', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<EstadoConvenio(nombre='{self.nombre}')>"
@@ -199,8 +200,8 @@ class Convenio(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    asociacion = relationship('Asociacion', back_populates='convenios', lazy='selectin')
-    estado = relationship('EstadoConvenio', back_populates='convenios', lazy='selectin')
+    asociacion = relationship('Asociacion', back_populates='convenios', lazy='raise_on_sql')
+    estado = relationship('EstadoConvenio', back_populates='convenios', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<Convenio(nombre='{self.nombre}')>"
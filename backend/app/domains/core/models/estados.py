@@ -4,10 +4,11 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import String, Integer, Boolean, Text, DateTime, Uuid, ForeignKey, func
+from sqlalchemy import String, Integer, Boolean, Text, DateTime, Uuid, ForeignKey, func, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ....infrastructure.base_model import BaseModel
+from ....infrastructure.maquinas_estado import Transicion
 
 
 class EstadoBase(BaseModel):
@@ -29,6 +30,9 @@ class EstadoCuota(EstadoBase):
     """Estados para cuotas anuales."""
     __tablename__ = 'estados_cuota'
 
+    # Estados sin transiciones de salida (ver registro_estados)
+    CODIGOS_FINALES = frozenset({'COBRADA', 'ANULADA', 'EXENTA'})
+
     # Posibles estados:
     # PENDIENTE: Cuota creada pero no cobrada
     # COBRADA: Cuota cobrada exitosamente
@@ -41,6 +45,9 @@ class EstadoCampania(EstadoBase):
     """Estados para campañas."""
     __tablename__ = 'estados_campania'
 
+    # Estados sin transiciones de salida (ver registro_estados)
+    CODIGOS_FINALES = frozenset({'FINALIZADA', 'CANCELADA'})
+
     # Posibles estados:
     # BORRADOR: Campaña en creación
     # PROGRAMADA: Campaña programada para envío
@@ -54,6 +61,9 @@ class EstadoTarea(EstadoBase):
     """Estados para tareas."""
     __tablename__ = 'estados_tarea'
 
+    # Estados sin transiciones de salida (ver registro_estados)
+    CODIGOS_FINALES = frozenset({'COMPLETADA', 'CANCELADA'})
+
     # Posibles estados:
     # PENDIENTE: Tarea por hacer
     # EN_PROGRESO: Tarea en ejecución
@@ -62,12 +72,23 @@ class EstadoTarea(EstadoBase):
     # BLOQUEADA: Tarea bloqueada por dependencias
 
 
+# Transiciones de las tareas (TareaActividad y TareaGrupo comparten catálogo)
+TRANSICIONES_TAREA = (
+    Transicion('PENDIENTE', ('EN_PROGRESO', 'BLOQUEADA', 'CANCELADA')),
+    Transicion('EN_PROGRESO', ('COMPLETADA', 'BLOQUEADA', 'PENDIENTE', 'CANCELADA')),
+    Transicion('BLOQUEADA', ('PENDIENTE', 'EN_PROGRESO', 'CANCELADA')),
+)
+
+
 class EstadoActividad(EstadoBase):
     """Estados para actividades."""
     __tablename__ = 'estados_actividad'
 
+    # Estados sin transiciones de salida (ver registro_estados)
+    CODIGOS_FINALES = frozenset({'COMPLETADA', 'CANCELADA'})
+
     # Relaciones
-    actividades = relationship('Actividad', back_populates='estado', lazy='selectin')
+    actividades = relationship('Actividad', back_populates='estado', lazy='raise_on_sql')
 
     # Posibles estados:
     # PROPUESTA: Actividad propuesta pendiente de aprobación
@@ -82,6 +103,9 @@ class EstadoParticipante(EstadoBase):
     """Estados para participantes en campañas."""
     __tablename__ = 'estados_participante'
 
+    # Estados sin transiciones de salida (ver registro_estados)
+    CODIGOS_FINALES = frozenset({'RESPONDIDO', 'REBOTADO', 'EXCLUIDO'})
+
     # Posibles estados:
     # INCLUIDO: Participante añadido a la campaña
     # ENVIADO: Comunicación enviada
@@ -96,6 +120,9 @@ class EstadoOrdenCobro(EstadoBase):
     """Estados para órdenes de cobro."""
     __tablename__ = 'estados_orden_cobro'
 
+    # Estados sin transiciones de salida (ver registro_estados)
+    CODIGOS_FINALES = frozenset({'PROCESADA', 'FALLIDA', 'ANULADA'})
+
     # Posibles estados:
     # PENDIENTE: Orden creada, pendiente de procesar
     # PROCESADA: Orden procesada, cobro realizado
@@ -107,6 +134,9 @@ class EstadoRemesa(EstadoBase):
     """Estados para remesas SEPA."""
     __tablename__ = 'estados_remesa'
 
+    # Estados sin transiciones de salida (ver registro_estados)
+    CODIGOS_FINALES = frozenset({'PROCESADA', 'PARCIAL', 'RECHAZADA'})
+
     # Posibles estados:
     # BORRADOR: Remesa en creación
     # GENERADA: Remesa generada, pendiente de envío
@@ -120,6 +150,9 @@ class EstadoDonacion(EstadoBase):
     """Estados para donaciones."""
     __tablename__ = 'estados_donacion'
 
+    # Estados sin transiciones de salida (ver registro_estados)
+    CODIGOS_FINALES = frozenset({'CERTIFICADA', 'ANULADA'})
+
     # Posibles estados:
     # PENDIENTE: Donación prometida pero no recibida
     # RECIBIDA: Donación recibida
@@ -131,6 +164,9 @@ class EstadoNotificacion(EstadoBase):
     """Estados para notificaciones."""
     __tablename__ = 'estados_notificacion'
 
+    # Estados sin transiciones de salida (ver registro_estados)
+    CODIGOS_FINALES = frozenset({'LEIDA'})
+
     # Posibles estados:
     # PENDIENTE: Notificación creada pero no enviada
     # ENVIADA: Notificación enviada al canal correspondiente
@@ -145,6 +181,10 @@ class HistorialEstado(BaseModel):
     El campo estado_tabla indica la tabla de estados correspondiente.
     """
     __tablename__ = 'historial_estados'
+    __table_args__ = (
+        Index('ix_historial_estados_fecha_cambio_id', 'fecha_cambio', 'id'),
+        Index('ix_historial_estados_entidad_fecha_cambio_id', 'entidad_tipo', 'entidad_id', 'fecha_cambio', 'id'),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     entidad_tipo: Mapped[str] = mapped_column(String(50), nullable=False, index=True)  # Nombre de la clase (ej: 'cuotaanual')
@@ -157,7 +197,7 @@ class HistorialEstado(BaseModel):
     usuario_id: Mapped[Optional[uuid.UUID]] = mapped_column(Uuid, ForeignKey('usuarios.id'), nullable=True)
 
     # Relación con usuario que realizó el cambio
-    usuario = relationship('Usuario', foreign_keys=[usuario_id], lazy='selectin')
+    usuario = relationship('Usuario', foreign_keys=[usuario_id], lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return (f"<HistorialEstado(entidad='{self.entidad_tipo}:{self.entidad_id}', "
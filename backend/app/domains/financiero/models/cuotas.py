@@ -6,10 +6,12 @@ from decimal import Decimal
 from enum import Enum as PyEnum
 from typing import Optional
 
-from sqlalchemy import String, ForeignKey, Date, Numeric, Enum, Text, Uuid, Integer
+from sqlalchemy import String, ForeignKey, Date, Numeric, Enum, Text, Uuid, Integer, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ....infrastructure.base_model import BaseModel
+from ....infrastructure.maquinas_estado import Transicion
+from ....infrastructure.registro_estados import registro_estados
 
 
 class ModoIngreso(PyEnum):
@@ -38,7 +40,7 @@ class ImporteCuotaAnio(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relación
-    tipo_miembro = relationship('TipoMiembro', lazy='selectin')
+    tipo_miembro = relationship('TipoMiembro', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<ImporteCuotaAnio(ejercicio={self.ejercicio}, tipo_miembro_id='{self.tipo_miembro_id}', importe={self.importe})>"
@@ -51,6 +53,16 @@ class CuotaAnual(BaseModel):
     Mantiene histórico de todas las cuotas (pagadas y pendientes).
     """
     __tablename__ = "cuotas_anuales"
+    __table_args__ = (
+        Index('ix_cuotas_anuales_ejercicio_id', 'ejercicio', 'id'),
+        Index('ix_cuotas_anuales_miembro_ejercicio_id', 'miembro_id', 'ejercicio', 'id'),
+    )
+
+    # Transiciones de estado permitidas (ver maquinas_estado)
+    TRANSICIONES = (
+        Transicion('PENDIENTE', ('COBRADA', 'IMPAGADA', 'ANULADA', 'EXENTA')),
+        Transicion('IMPAGADA', ('COBRADA', 'PENDIENTE', 'ANULADA')),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     miembro_id: Mapped[uuid.UUID] = mapped_column(Uuid, ForeignKey("miembros.id"), nullable=False, index=True)
@@ -80,11 +92,11 @@ class CuotaAnual(BaseModel):
     referencia_pago: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)  # Número de transacción, etc.
 
     # Relaciones
-    miembro = relationship('Miembro', foreign_keys=[miembro_id], lazy='selectin')
-    agrupacion = relationship('AgrupacionTerritorial', foreign_keys=[agrupacion_id], lazy='selectin')
-    importe_cuota_anio = relationship('ImporteCuotaAnio', foreign_keys=[importe_cuota_anio_id], lazy='selectin')
-    estado = relationship('EstadoCuota', foreign_keys=[estado_id], lazy='selectin')
-    ordenes_cobro = relationship('OrdenCobro', back_populates='cuota', lazy='selectin')
+    miembro = relationship('Miembro', foreign_keys=[miembro_id], lazy='raise_on_sql')
+    agrupacion = relationship('AgrupacionTerritorial', foreign_keys=[agrupacion_id], lazy='raise_on_sql')
+    importe_cuota_anio = relationship('ImporteCuotaAnio', foreign_keys=[importe_cuota_anio_id], lazy='raise_on_sql')
+    estado = relationship('EstadoCuota', foreign_keys=[estado_id], lazy='raise_on_sql')
+    ordenes_cobro = relationship('OrdenCobro', back_populates='cuota', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<CuotaAnual(miembro_id='{self.miembro_id}', ejercicio={self.ejercicio}, estado_id='{self.estado_id}')>"
@@ -114,8 +126,6 @@ class CuotaAnual(BaseModel):
         if referencia:
             self.referencia_pago = referencia
 
-        # TODO: Actualizar estado requiere consultar EstadoCuota por código
-        # if self.esta_pagada:
-        #     self.estado_id = # buscar estado COBRADA
-        # elif self.importe_pagado > 0:
-        #     self.estado_id = # buscar COBRADA_PARCIAL o COBRADA
+        # Un pago parcial no cambia el estado (no hay estado de cobro parcial)
+        if self.esta_pagada:
+            self.estado_id = registro_estados.id_de('estados_cuota', 'COBRADA')
@@ -9,6 +9,8 @@ from sqlalchemy import String, ForeignKey, Date, Numeric, Boolean, Text, Uuid, I
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ....infrastructure.base_model import BaseModel
+from ....infrastructure.maquinas_estado import Transicion
+from ....infrastructure.registro_estados import registro_estados
 from .cuotas import ModoIngreso
 
 
@@ -22,7 +24,7 @@ class DonacionConcepto(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    donaciones = relationship('Donacion', back_populates='concepto', lazy='selectin')
+    donaciones = relationship('Donacion', back_populates='concepto', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<DonacionConcepto(nombre='{self.nombre}')>"
@@ -32,6 +34,14 @@ class Donacion(BaseModel):
     """Donaciones de miembros o externos."""
     __tablename__ = "donaciones"
 
+    # Transiciones de estado permitidas (ver maquinas_estado)
+    TRANSICIONES = (
+        Transicion('PENDIENTE', ('RECIBIDA', 'ANULADA')),
+        Transicion('RECIBIDA', 'CERTIFICADA',
+                   valores={'certificado_emitido': True, 'fecha_certificado': func.current_date()}),
+        Transicion('RECIBIDA', 'ANULADA'),
+    )
+
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     miembro_id: Mapped[Optional[uuid.UUID]] = mapped_column(Uuid, nullable=True, index=True)  # TODO: ForeignKey("miembros.id")
     concepto_id: Mapped[Optional[uuid.UUID]] = mapped_column(Uuid, ForeignKey("donaciones_conceptos.id"), nullable=True, index=True)
@@ -65,10 +75,10 @@ class Donacion(BaseModel):
 
     # Relaciones
     # TODO: Descomentar cuando existan los modelos
-    # miembro = relationship('Miembro', foreign_keys=[miembro_id], lazy='selectin')
-    concepto = relationship('DonacionConcepto', back_populates='donaciones', lazy='selectin')
-    # campania = relationship('Campania', foreign_keys=[campania_id], lazy='selectin')
-    estado = relationship('EstadoDonacion', foreign_keys=[estado_id], lazy='selectin')
+    # miembro = relationship('Miembro', foreign_keys=[miembro_id], lazy='raise_on_sql')
+    concepto = relationship('DonacionConcepto', back_populates='donaciones', lazy='raise_on_sql')
+    # campania = relationship('Campania', foreign_keys=[campania_id], lazy='raise_on_sql')
+    estado = relationship('EstadoDonacion', foreign_keys=[estado_id], lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<Donacion(importe={self.importe}, fecha={self.fecha}, estado_id='{self.estado_id}')>"
@@ -89,4 +99,4 @@ class Donacion(BaseModel):
         if not self.certificado_emitido:
             self.certificado_emitido = True
             self.fecha_certificado = date.today()
-            # TODO: self.estado_id = # buscar estado 'CERTIFICADA'
+            self.estado_id = registro_estados.id_de('estados_donacion', 'CERTIFICADA')
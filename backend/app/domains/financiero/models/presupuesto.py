@@ -9,6 +9,7 @@ from sqlalchemy import String, ForeignKey, Date, Numeric, Boolean, Text, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ....infrastructure.base_model import BaseModel
+from ....infrastructure.registro_estados import registro_estados
 
 
 class EstadoPlanificacion(BaseModel):
@@ -24,7 +25,7 @@ class EstadoPlanificacion(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    planificaciones = relationship('PlanificacionAnual', back_populates='estado', lazy='selectin')
+    planificaciones = relationship('PlanificacionAnual', back_populates='estado', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<EstadoPlanificacion(codigo='{self.codigo}', nombre='{self.nombre}')>"
@@ -41,7 +42,7 @@ class CategoriaPartida(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    partidas = relationship('PartidaPresupuestaria', back_populates='categoria', lazy='selectin')
+    partidas = relationship('PartidaPresupuestaria', back_populates='categoria', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<CategoriaPartida(codigo='{self.codigo}', nombre='{self.nombre}')>"
@@ -73,8 +74,8 @@ class PartidaPresupuestaria(BaseModel):
     planificacion_id: Mapped[Optional[uuid.UUID]] = mapped_column(Uuid, ForeignKey("planificaciones_anuales.id"), nullable=True, index=True)
 
     # Relaciones
-    categoria: Mapped[Optional["CategoriaPartida"]] = relationship(back_populates='partidas', lazy='selectin')
-    planificacion: Mapped[Optional["PlanificacionAnual"]] = relationship(back_populates='partidas', lazy='selectin')
+    categoria: Mapped[Optional["CategoriaPartida"]] = relationship(back_populates='partidas', lazy='raise_on_sql')
+    planificacion: Mapped[Optional["PlanificacionAnual"]] = relationship(back_populates='partidas', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<PartidaPresupuestaria(codigo='{self.codigo}', tipo='{self.tipo}', importe={self.importe_presupuestado})>"
@@ -139,9 +140,10 @@ class PlanificacionAnual(BaseModel):
     presupuesto_total: Mapped[Decimal] = mapped_column(Numeric(14, 2), default=Decimal('0.00'), nullable=False)
 
     # Relaciones
-    estado: Mapped["EstadoPlanificacion"] = relationship(back_populates='planificaciones', lazy='selectin')
+    estado: Mapped["EstadoPlanificacion"] = relationship(back_populates='planificaciones', lazy='raise_on_sql')
+    # selectin: la recorren los totales presupuestados y ejecutados
     partidas: Mapped[List["PartidaPresupuestaria"]] = relationship(back_populates='planificacion', lazy='selectin')
-    # propuestas: Mapped[List["PropuestaActividad"]] = relationship(back_populates='planificacion', lazy='selectin')
+    # propuestas: Mapped[List["PropuestaActividad"]] = relationship(back_populates='planificacion', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<PlanificacionAnual(ejercicio={self.ejercicio}, estado_id='{self.estado_id}')>"
@@ -187,15 +189,13 @@ class PlanificacionAnual(BaseModel):
 
     def aprobar(self, fecha_aprobacion: Optional[date] = None) -> None:
         """Marca la planificación como aprobada."""
-        # TODO: self.estado_id = # buscar estado 'APROBADO'
+        self.estado_id = registro_estados.id_de('estados_planificacion', 'APROBADO')
         self.fecha_aprobacion = fecha_aprobacion or date.today()
 
     def iniciar_ejecucion(self) -> None:
         """Inicia la ejecución de la planificación."""
-        # TODO: self.estado_id = # buscar estado 'EN_EJECUCION'
-        pass
+        self.estado_id = registro_estados.id_de('estados_planificacion', 'EN_EJECUCION')
 
     def cerrar(self) -> None:
         """Cierra la planificación."""
-        # TODO: self.estado_id = # buscar estado 'CERRADO'
-        pass
+        self.estado_id = registro_estados.id_de('estados_planificacion', 'CERRADO')
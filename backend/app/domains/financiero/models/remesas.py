@@ -5,16 +5,26 @@ from datetime import date
 from decimal import Decimal
 from typing import Optional, List
 
-from sqlalchemy import String, ForeignKey, Date, Numeric, Text, Uuid, func
+from sqlalchemy import String, ForeignKey, Date, Numeric, Text, Uuid, func, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ....infrastructure.base_model import BaseModel
+from ....infrastructure.maquinas_estado import Transicion
+from ....infrastructure.registro_estados import registro_estados
 
 
 class Remesa(BaseModel):
     """Lote de cobros SEPA."""
     __tablename__ = "remesas"
 
+    # Transiciones de estado permitidas (ver maquinas_estado)
+    TRANSICIONES = (
+        Transicion('BORRADOR', 'GENERADA', guarda=lambda remesa: remesa.num_ordenes > 0),
+        Transicion('GENERADA', 'BORRADOR'),
+        Transicion('GENERADA', 'ENVIADA', guarda=lambda remesa: remesa.puede_enviarse()),
+        Transicion('ENVIADA', ('PROCESADA', 'PARCIAL', 'RECHAZADA')),
+    )
+
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
 
     # Identificación
@@ -39,8 +49,9 @@ class Remesa(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
+    # selectin: la recorre calcular_totales
     ordenes: Mapped[List["OrdenCobro"]] = relationship(back_populates="remesa", lazy="selectin")
-    estado = relationship('EstadoRemesa', foreign_keys=[estado_id], lazy='selectin')
+    estado = relationship('EstadoRemesa', foreign_keys=[estado_id], lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<Remesa(referencia='{self.referencia}', estado_id='{self.estado_id}', importe={self.importe_total})>"
@@ -58,9 +69,8 @@ class Remesa(BaseModel):
 
     def puede_enviarse(self) -> bool:
         """Verifica si la remesa puede enviarse al banco."""
-        # TODO: Verificar estado_id contra estados 'BORRADOR' o 'GENERADA'
         return (
-            # self.estado_id in [borrador_id, generada_id] and
+            registro_estados.codigo_de(self.estado_id) in ('BORRADOR', 'GENERADA') and
             self.num_ordenes > 0 and
             self.archivo_sepa is not None
         )
@@ -69,6 +79,15 @@ class Remesa(BaseModel):
 class OrdenCobro(BaseModel):
     """Orden individual dentro de remesa SEPA."""
     __tablename__ = "ordenes_cobro"
+    __table_args__ = (
+        Index('ix_ordenes_cobro_remesa_id_id', 'remesa_id', 'id'),
+    )
+
+    # Transiciones de estado permitidas (ver maquinas_estado)
+    TRANSICIONES = (
+        Transicion('PENDIENTE', ('PROCESADA', 'FALLIDA'), valores={'fecha_procesamiento': func.current_date()}),
+        Transicion('PENDIENTE', 'ANULADA'),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     remesa_id: Mapped[uuid.UUID] = mapped_column(Uuid, ForeignKey("remesas.id"), nullable=False, index=True)
@@ -88,21 +107,21 @@ class OrdenCobro(BaseModel):
     motivo_rechazo: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
-    remesa: Mapped["Remesa"] = relationship(back_populates="ordenes", lazy="selectin")
-    cuota = relationship('CuotaAnual', foreign_keys=[cuota_id], back_populates='ordenes_cobro', lazy='selectin')
-    estado = relationship('EstadoOrdenCobro', foreign_keys=[estado_id], lazy='selectin')
+    remesa: Mapped["Remesa"] = relationship(back_populates="ordenes", lazy="raise_on_sql")
+    cuota = relationship('CuotaAnual', foreign_keys=[cuota_id], back_populates='ordenes_cobro', lazy='raise_on_sql')
+    estado = relationship('EstadoOrdenCobro', foreign_keys=[estado_id], lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<OrdenCobro(cuota_id='{self.cuota_id}', importe={self.importe}, estado_id='{self.estado_id}')>"
 
     def marcar_procesada(self) -> None:
         """Marca la orden como procesada exitosamente."""
-        # TODO: self.estado_id = # buscar estado 'PROCESADA'
+        self.estado_id = registro_estados.id_de('estados_orden_cobro', 'PROCESADA')
         self.fecha_procesamiento = date.today()
 
     def marcar_fallida(self, codigo_rechazo: str, motivo: str) -> None:
         """Marca la orden como fallida."""
-        # TODO: self.estado_id = # buscar estado 'FALLIDA'
+        self.estado_id = registro_estados.id_de('estados_orden_cobro', 'FALLIDA')
         self.fecha_procesamiento = date.today()
         self.codigo_rechazo = codigo_rechazo
         self.motivo_rechazo = motivo
@@ -62,19 +62,19 @@ class AgrupacionTerritorial(Base):
     # Relaciones (se mapean igual que en un modelo normal)
     @declared_attr
     def pais(cls):
-        return relationship('Pais', foreign_keys=[cls.pais_id], lazy='selectin')
+        return relationship('Pais', foreign_keys=[cls.pais_id], lazy='raise_on_sql')
 
     @declared_attr
     def provincia(cls):
-        return relationship('Provincia', foreign_keys=[cls.provincia_id], lazy='selectin')
+        return relationship('Provincia', foreign_keys=[cls.provincia_id], lazy='raise_on_sql')
 
     @declared_attr
     def municipio(cls):
-        return relationship('Municipio', foreign_keys=[cls.municipio_id], lazy='selectin')
+        return relationship('Municipio', foreign_keys=[cls.municipio_id], lazy='raise_on_sql')
 
     @declared_attr
     def direccion(cls):
-        return relationship('Direccion', foreign_keys=[cls.direccion_id], lazy='selectin')
+        return relationship('Direccion', foreign_keys=[cls.direccion_id], lazy='raise_on_sql')
 
     # Jerarquía (self-referencing)
     @declared_attr
@@ -84,7 +84,7 @@ class AgrupacionTerritorial(Base):
             remote_side=[cls.id],
             foreign_keys=[cls.agrupacion_padre_id],
             backref='agrupaciones_hijas',
-            lazy='selectin'
+            lazy='raise_on_sql'
         )
 
     def __repr__(self) -> str:
@@ -23,8 +23,8 @@ class Pais(BaseModel):
     activo: Mapped[bool] = mapped_column(Integer, default=True, nullable=False, index=True)
 
     # Relaciones
-    provincias = relationship('Provincia', back_populates='pais', lazy='selectin')
-    direcciones = relationship('Direccion', back_populates='pais', lazy='selectin')
+    provincias = relationship('Provincia', back_populates='pais', lazy='raise_on_sql')
+    direcciones = relationship('Direccion', back_populates='pais', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<Pais(codigo='{self.codigo}', nombre='{self.nombre}')>"
@@ -44,9 +44,9 @@ class Provincia(BaseModel):
     activo: Mapped[bool] = mapped_column(Integer, default=True, nullable=False, index=True)
 
     # Relaciones
-    pais = relationship('Pais', back_populates='provincias', lazy='selectin')
-    municipios = relationship('Municipio', back_populates='provincia', lazy='selectin')
-    direcciones = relationship('Direccion', back_populates='provincia', lazy='selectin')
+    pais = relationship('Pais', back_populates='provincias', lazy='raise_on_sql')
+    municipios = relationship('Municipio', back_populates='provincia', lazy='raise_on_sql')
+    direcciones = relationship('Direccion', back_populates='provincia', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<Provincia(codigo='{self.codigo}', nombre='{self.nombre}')>"
@@ -67,8 +67,8 @@ class Municipio(BaseModel):
     activo: Mapped[bool] = mapped_column(Integer, default=True, nullable=False, index=True)
 
     # Relaciones
-    provincia = relationship('Provincia', back_populates='municipios', lazy='selectin')
-    direcciones = relationship('Direccion', back_populates='municipio', lazy='selectin')
+    provincia = relationship('Provincia', back_populates='municipios', lazy='raise_on_sql')
+    direcciones = relationship('Direccion', back_populates='municipio', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<Municipio(codigo='{self.codigo}', nombre='{self.nombre}')>"
@@ -109,6 +109,7 @@ class Direccion(BaseModel):
     fecha_validacion: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
 
     # Relaciones
+    # selectin: las lee direccion_completa
     pais = relationship('Pais', back_populates='direcciones', lazy='selectin')
     provincia = relationship('Provincia', back_populates='direcciones', lazy='selectin')
     municipio = relationship('Municipio', back_populates='direcciones', lazy='selectin')
@@ -225,12 +226,12 @@ class AgrupacionTerritorial(BaseModel):
     activo: Mapped[bool] = mapped_column(Integer, default=True, nullable=False, index=True)
 
     # Relaciones
-    pais = relationship('Pais', lazy='selectin')
-    provincia = relationship('Provincia', lazy='selectin')
-    municipio = relationship('Municipio', lazy='selectin')
-    direccion = relationship('Direccion', lazy='selectin')
+    pais = relationship('Pais', lazy='raise_on_sql')
+    provincia = relationship('Provincia', lazy='raise_on_sql')
+    municipio = relationship('Municipio', lazy='raise_on_sql')
+    direccion = relationship('Direccion', lazy='raise_on_sql')
 
-    # Relación jerárquica
+    # Relación jerárquica (selectin: la recorren nombre_completo y ruta_jerarquica)
     agrupacion_padre = relationship(
         'AgrupacionTerritorial',
         remote_side=[id],
@@ -240,7 +241,7 @@ class AgrupacionTerritorial(BaseModel):
     agrupaciones_hijas: Mapped[List["AgrupacionTerritorial"]] = relationship(
         'AgrupacionTerritorial',
         back_populates='agrupacion_padre',
-        lazy='selectin'
+        lazy='raise_on_sql'
     )
 
     def __repr__(self) -> str:
@@ -9,6 +9,7 @@ from sqlalchemy import String, Integer, Uuid, ForeignKey, Date, Numeric, Text, B
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ....infrastructure.base_model import BaseModel
+from ...core.models.estados import TRANSICIONES_TAREA
 
 
 class TipoGrupo(BaseModel):
@@ -22,7 +23,7 @@ class TipoGrupo(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    grupos = relationship('GrupoTrabajo', back_populates='tipo_grupo', lazy='selectin')
+    grupos = relationship('GrupoTrabajo', back_populates='tipo_grupo', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<TipoGrupo(nombre='{self.nombre}')>"
@@ -43,7 +44,7 @@ class RolGrupo(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    miembros_grupo = relationship('MiembroGrupo', back_populates='rol_grupo', lazy='selectin')
+    miembros_grupo = relationship('MiembroGrupo', back_populates='rol_grupo', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<RolGrupo(nombre='{self.nombre}')>"
@@ -77,11 +78,11 @@ class GrupoTrabajo(BaseModel):
     agrupacion_id: Mapped[Optional[uuid.UUID]] = mapped_column(Uuid, ForeignKey('agrupaciones_territoriales.id'), nullable=True, index=True)
 
     # Relaciones
-    tipo_grupo = relationship('TipoGrupo', back_populates='grupos', lazy='selectin')
-    agrupacion = relationship('AgrupacionTerritorial', lazy='selectin')
-    miembros = relationship('MiembroGrupo', back_populates='grupo', lazy='selectin')
-    tareas = relationship('TareaGrupo', back_populates='grupo', lazy='selectin')
-    reuniones = relationship('ReunionGrupo', back_populates='grupo', lazy='selectin')
+    tipo_grupo = relationship('TipoGrupo', back_populates='grupos', lazy='raise_on_sql')
+    agrupacion = relationship('AgrupacionTerritorial', lazy='raise_on_sql')
+    miembros = relationship('MiembroGrupo', back_populates='grupo', lazy='raise_on_sql')
+    tareas = relationship('TareaGrupo', back_populates='grupo', lazy='raise_on_sql')
+    reuniones = relationship('ReunionGrupo', back_populates='grupo', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<GrupoTrabajo(nombre='{self.nombre}')>"
@@ -110,8 +111,8 @@ class MiembroGrupo(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
-    grupo = relationship('GrupoTrabajo', back_populates='miembros', lazy='selectin')
-    rol_grupo = relationship('RolGrupo', back_populates='miembros_grupo', lazy='selectin')
+    grupo = relationship('GrupoTrabajo', back_populates='miembros', lazy='raise_on_sql')
+    rol_grupo = relationship('RolGrupo', back_populates='miembros_grupo', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<MiembroGrupo(miembro_id='{self.miembro_id}', grupo_id='{self.grupo_id}')>"
@@ -121,6 +122,9 @@ class TareaGrupo(BaseModel):
     """Tarea asignada a un grupo de trabajo."""
     __tablename__ = 'tareas_grupo'
 
+    # Transiciones de estado permitidas (ver maquinas_estado)
+    TRANSICIONES = TRANSICIONES_TAREA
+
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     grupo_id: Mapped[uuid.UUID] = mapped_column(Uuid, ForeignKey('grupos_trabajo.id'), nullable=False, index=True)
 
@@ -139,8 +143,8 @@ class TareaGrupo(BaseModel):
     horas_reales: Mapped[Optional[Decimal]] = mapped_column(Numeric(6, 2), nullable=True)
 
     # Relaciones
-    grupo = relationship('GrupoTrabajo', back_populates='tareas', lazy='selectin')
-    estado = relationship('EstadoTarea', foreign_keys=[estado_id], lazy='selectin')
+    grupo = relationship('GrupoTrabajo', back_populates='tareas', lazy='raise_on_sql')
+    estado = relationship('EstadoTarea', foreign_keys=[estado_id], lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<TareaGrupo(titulo='{self.titulo}', grupo_id='{self.grupo_id}')>"
@@ -168,8 +172,8 @@ class ReunionGrupo(BaseModel):
     realizada: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
     # Relaciones
-    grupo = relationship('GrupoTrabajo', back_populates='reuniones', lazy='selectin')
-    asistentes = relationship('AsistenteReunion', back_populates='reunion', lazy='selectin')
+    grupo = relationship('GrupoTrabajo', back_populates='reuniones', lazy='raise_on_sql')
+    asistentes = relationship('AsistenteReunion', back_populates='reunion', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<ReunionGrupo(titulo='{self.titulo}', fecha='{self.fecha}')>"
@@ -188,7 +192,7 @@ class AsistenteReunion(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
-    reunion = relationship('ReunionGrupo', back_populates='asistentes', lazy='selectin')
+    reunion = relationship('ReunionGrupo', back_populates='asistentes', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<AsistenteReunion(miembro_id='{self.miembro_id}', reunion_id='{self.reunion_id}')>"
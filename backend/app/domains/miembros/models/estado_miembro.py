@@ -20,6 +20,9 @@ class EstadoMiembro(BaseModel):
     """
     __tablename__ = 'estados_miembro'
 
+    # Estados sin transiciones de salida (ver registro_estados)
+    CODIGOS_FINALES = frozenset({'BAJA'})
+
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     nombre: Mapped[str] = mapped_column(String(100), nullable=False)
     descripcion: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
@@ -4,11 +4,12 @@ import uuid
 from datetime import date
 from typing import Optional
 
-from sqlalchemy import String, Integer, Uuid, ForeignKey, Date, Boolean, Text, func
+from sqlalchemy import String, Integer, Uuid, ForeignKey, Date, Boolean, Text, func, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.ext.hybrid import hybrid_property
 
 from ....infrastructure.base_model import BaseModel
+from ....infrastructure.maquinas_estado import Transicion
 
 
 # Constantes para segmentación
@@ -30,7 +31,7 @@ class TipoMiembro(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    miembros = relationship('Miembro', back_populates='tipo_miembro', lazy='selectin')
+    miembros = relationship('Miembro', back_populates='tipo_miembro', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<TipoMiembro(nombre='{self.nombre}')>"
@@ -39,6 +40,16 @@ class TipoMiembro(BaseModel):
 class Miembro(BaseModel):
     """Miembro (socio) de la organización."""
     __tablename__ = 'miembros'
+    __table_args__ = (
+        Index('ix_miembros_fecha_alta_id', 'fecha_alta', 'id'),
+    )
+
+    # Transiciones de estado permitidas (ver maquinas_estado)
+    TRANSICIONES = (
+        Transicion('PENDIENTE_APROBACION', ('ACTIVO', 'BAJA')),
+        Transicion('ACTIVO', ('SUSPENDIDO', 'BAJA')),
+        Transicion('SUSPENDIDO', ('ACTIVO', 'BAJA')),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
 
@@ -113,14 +124,15 @@ class Miembro(BaseModel):
     disponibilidad_viajar: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
     # Relaciones
+    # selectin: la lee es_simpatizante
     tipo_miembro = relationship('TipoMiembro', back_populates='miembros', lazy='selectin')
-    estado = relationship('EstadoMiembro', lazy='selectin')
-    motivo_baja_rel = relationship('MotivoBaja', back_populates='miembros', lazy='selectin')
-    agrupacion = relationship('AgrupacionTerritorial', lazy='selectin')
-    cargo = relationship('TipoCargo', back_populates='miembros', lazy='selectin')
-    pais_documento = relationship('Pais', foreign_keys=[pais_documento_id], lazy='selectin')
-    pais_domicilio = relationship('Pais', foreign_keys=[pais_domicilio_id], lazy='selectin')
-    provincia = relationship('Provincia', lazy='selectin')
+    estado = relationship('EstadoMiembro', lazy='raise_on_sql')
+    motivo_baja_rel = relationship('MotivoBaja', back_populates='miembros', lazy='raise_on_sql')
+    agrupacion = relationship('AgrupacionTerritorial', lazy='raise_on_sql')
+    cargo = relationship('TipoCargo', back_populates='miembros', lazy='raise_on_sql')
+    pais_documento = relationship('Pais', foreign_keys=[pais_documento_id], lazy='raise_on_sql')
+    pais_domicilio = relationship('Pais', foreign_keys=[pais_domicilio_id], lazy='raise_on_sql')
+    provincia = relationship('Provincia', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<Miembro(nombre='{self.nombre} {self.apellido1}', tipo='{self.tipo_miembro_id}')>"
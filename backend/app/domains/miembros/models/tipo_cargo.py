@@ -31,7 +31,7 @@ class TipoCargo(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    miembros = relationship('Miembro', back_populates='cargo', lazy='selectin')
+    miembros = relationship('Miembro', back_populates='cargo', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<TipoCargo(codigo='{self.codigo}', nombre='{self.nombre}')>"
@@ -4,10 +4,11 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import String, Integer, Boolean, Text, DateTime, Uuid, ForeignKey, JSON, func
+from sqlalchemy import String, Integer, Boolean, Text, DateTime, Uuid, ForeignKey, JSON, func, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ....infrastructure.base_model import BaseModel
+from ....infrastructure.maquinas_estado import Transicion
 
 
 class TipoNotificacion(BaseModel):
@@ -41,8 +42,8 @@ class TipoNotificacion(BaseModel):
     color: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
 
     # Relaciones
-    notificaciones = relationship('Notificacion', back_populates='tipo', lazy='selectin')
-    preferencias = relationship('PreferenciaNotificacion', back_populates='tipo', lazy='selectin')
+    notificaciones = relationship('Notificacion', back_populates='tipo', lazy='raise_on_sql')
+    preferencias = relationship('PreferenciaNotificacion', back_populates='tipo', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<TipoNotificacion(codigo='{self.codigo}', nombre='{self.nombre}')>"
@@ -51,6 +52,17 @@ class TipoNotificacion(BaseModel):
 class Notificacion(BaseModel):
     """Notificaciones enviadas a usuarios."""
     __tablename__ = 'notificaciones'
+    __table_args__ = (
+        Index('ix_notificaciones_fecha_creacion_id', 'fecha_creacion', 'id'),
+        Index('ix_notificaciones_usuario_fecha_creacion_id', 'usuario_id', 'fecha_creacion', 'id'),
+    )
+
+    # Transiciones de estado permitidas (ver maquinas_estado)
+    TRANSICIONES = (
+        Transicion('PENDIENTE', ('ENVIADA', 'ERROR')),
+        Transicion('ERROR', ('PENDIENTE', 'ENVIADA')),
+        Transicion('ENVIADA', 'LEIDA'),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     tipo_id: Mapped[uuid.UUID] = mapped_column(Uuid, ForeignKey('tipos_notificacion.id'), nullable=False, index=True)
@@ -89,9 +101,9 @@ class Notificacion(BaseModel):
     entidad_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True, index=True)  # ID de entidad relacionada
 
     # Relaciones
-    tipo = relationship('TipoNotificacion', back_populates='notificaciones', lazy='selectin')
-    usuario = relationship('Usuario', foreign_keys=[usuario_id], lazy='selectin')
-    estado = relationship('EstadoNotificacion', foreign_keys=[estado_id], lazy='selectin')
+    tipo = relationship('TipoNotificacion', back_populates='notificaciones', lazy='raise_on_sql')
+    usuario = relationship('Usuario', foreign_keys=[usuario_id], lazy='raise_on_sql')
+    estado = relationship('EstadoNotificacion', foreign_keys=[estado_id], lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<Notificacion(titulo='{self.titulo}', usuario_id='{self.usuario_id}', estado_id='{self.estado_id}')>"
@@ -134,8 +146,8 @@ class PreferenciaNotificacion(BaseModel):
     hora_preferida: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # 0-23
 
     # Relaciones
-    usuario = relationship('Usuario', foreign_keys=[usuario_id], lazy='selectin')
-    tipo = relationship('TipoNotificacion', back_populates='preferencias', lazy='selectin')
+    usuario = relationship('Usuario', foreign_keys=[usuario_id], lazy='raise_on_sql')
+    tipo = relationship('TipoNotificacion', back_populates='preferencias', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<PreferenciaNotificacion(usuario_id='{self.usuario_id}', tipo_id='{self.tipo_id}')>"
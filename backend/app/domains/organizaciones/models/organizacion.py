@@ -57,7 +57,7 @@ class TipoOrganizacion(BaseModel, CatalogoMixin):
     permite_convenios: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
     # Relaciones
-    organizaciones = relationship('Organizacion', back_populates='tipo', lazy='selectin')
+    organizaciones = relationship('Organizacion', back_populates='tipo', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<TipoOrganizacion(nombre='{self.nombre}')>"
@@ -135,26 +135,28 @@ class Organizacion(BaseModel, ContactoCompletoMixin):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
+    # selectin: la leen es_agrupacion_territorial y es_asociacion_externa
     tipo = relationship('TipoOrganizacion', back_populates='organizaciones', lazy='selectin')
-    pais = relationship('Pais', lazy='selectin')
-    provincia = relationship('Provincia', lazy='selectin')
-    municipio = relationship('Municipio', lazy='selectin')
-    direccion = relationship('Direccion', lazy='selectin')
+    pais = relationship('Pais', lazy='raise_on_sql')
+    provincia = relationship('Provincia', lazy='raise_on_sql')
+    municipio = relationship('Municipio', lazy='raise_on_sql')
+    direccion = relationship('Direccion', lazy='raise_on_sql')
 
     # Jerarquía (para agrupaciones territoriales)
     organizacion_padre = relationship(
         'Organizacion',
         remote_side=[id],
         back_populates='organizaciones_hijas',
-        lazy='selectin'
+        lazy='raise_on_sql'
     )
     organizaciones_hijas: Mapped[List["Organizacion"]] = relationship(
         'Organizacion',
         back_populates='organizacion_padre',
-        lazy='selectin'
+        lazy='raise_on_sql'
     )
 
     # Convenios (para asociaciones externas)
+    # selectin: la recorre tiene_convenio_vigente
     convenios = relationship('Convenio', back_populates='organizacion', lazy='selectin')
 
     def __repr__(self) -> str:
@@ -189,7 +191,7 @@ class EstadoConvenio(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    convenios = relationship('Convenio', back_populates='estado', lazy='selectin')
+    convenios = relationship('Convenio', back_populates='estado', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<EstadoConvenio(nombre='{self.nombre}')>"
@@ -259,8 +261,8 @@ class Convenio(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    organizacion = relationship('Organizacion', back_populates='convenios', lazy='selectin')
-    estado = relationship('EstadoConvenio', back_populates='convenios', lazy='selectin')
+    organizacion = relationship('Organizacion', back_populates='convenios', lazy='raise_on_sql')
+    estado = relationship('EstadoConvenio', back_populates='convenios', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<Convenio(nombre='{self.nombre}')>"
@@ -28,13 +28,13 @@ class Usuario(BaseModel):
     roles: Mapped[List["UsuarioRol"]] = relationship(
         back_populates="usuario",
         foreign_keys="[UsuarioRol.usuario_id]",
-        lazy="selectin"
+        lazy="raise_on_sql"
     )
-    # miembro: Mapped[Optional["Miembro"]] = relationship(back_populates="usuario", lazy="selectin")
+    # miembro: Mapped[Optional["Miembro"]] = relationship(back_populates="usuario", lazy="raise_on_sql")
     sesiones: Mapped[List["Sesion"]] = relationship(
         back_populates="usuario",
         foreign_keys="[Sesion.usuario_id]",
-        lazy="selectin"
+        lazy="raise_on_sql"
     )
 
     def __repr__(self) -> str:
@@ -55,10 +55,10 @@ class UsuarioRol(BaseModel):
     usuario: Mapped["Usuario"] = relationship(
         back_populates="roles",
         foreign_keys=[usuario_id],
-        lazy="selectin"
+        lazy="raise_on_sql"
     )
-    # rol: Mapped["Rol"] = relationship(lazy="selectin")
-    # agrupacion: Mapped[Optional["AgrupacionTerritorial"]] = relationship(lazy="selectin")
+    # rol: Mapped["Rol"] = relationship(lazy="raise_on_sql")
+    # agrupacion: Mapped[Optional["AgrupacionTerritorial"]] = relationship(lazy="raise_on_sql")
 
     def __repr__(self) -> str:
         return f"<UsuarioRol(usuario_id='{self.usuario_id}', rol_id={self.rol_id})>"
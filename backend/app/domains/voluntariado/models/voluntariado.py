@@ -20,7 +20,7 @@ class CategoriaCompetencia(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    competencias = relationship('Competencia', back_populates='categoria', lazy='selectin')
+    competencias = relationship('Competencia', back_populates='categoria', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<CategoriaCompetencia(nombre='{self.nombre}')>"
@@ -37,8 +37,8 @@ class Competencia(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    categoria = relationship('CategoriaCompetencia', back_populates='competencias', lazy='selectin')
-    miembros_competencia = relationship('MiembroCompetencia', back_populates='competencia', lazy='selectin')
+    categoria = relationship('CategoriaCompetencia', back_populates='competencias', lazy='raise_on_sql')
+    miembros_competencia = relationship('MiembroCompetencia', back_populates='competencia', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<Competencia(nombre='{self.nombre}')>"
@@ -54,7 +54,7 @@ class NivelCompetencia(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    miembros_competencia = relationship('MiembroCompetencia', back_populates='nivel', lazy='selectin')
+    miembros_competencia = relationship('MiembroCompetencia', back_populates='nivel', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<NivelCompetencia(nombre='{self.nombre}')>"
@@ -74,8 +74,8 @@ class MiembroCompetencia(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
-    competencia = relationship('Competencia', back_populates='miembros_competencia', lazy='selectin')
-    nivel = relationship('NivelCompetencia', back_populates='miembros_competencia', lazy='selectin')
+    competencia = relationship('Competencia', back_populates='miembros_competencia', lazy='raise_on_sql')
+    nivel = relationship('NivelCompetencia', back_populates='miembros_competencia', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<MiembroCompetencia(miembro_id='{self.miembro_id}', competencia_id='{self.competencia_id}')>"
@@ -92,7 +92,7 @@ class TipoDocumentoVoluntario(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    documentos = relationship('DocumentoMiembro', back_populates='tipo_documento', lazy='selectin')
+    documentos = relationship('DocumentoMiembro', back_populates='tipo_documento', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<TipoDocumentoVoluntario(nombre='{self.nombre}')>"
@@ -120,7 +120,7 @@ class DocumentoMiembro(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    tipo_documento = relationship('TipoDocumentoVoluntario', back_populates='documentos', lazy='selectin')
+    tipo_documento = relationship('TipoDocumentoVoluntario', back_populates='documentos', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<DocumentoMiembro(nombre='{self.nombre}', miembro_id='{self.miembro_id}')>"
@@ -141,7 +141,7 @@ class TipoFormacion(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    formaciones = relationship('FormacionMiembro', back_populates='tipo_formacion', lazy='selectin')
+    formaciones = relationship('FormacionMiembro', back_populates='tipo_formacion', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<TipoFormacion(nombre='{self.nombre}')>"
@@ -168,7 +168,7 @@ class FormacionMiembro(BaseModel):
     es_interna: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)  # Formación interna de la organización
 
     # Relaciones
-    tipo_formacion = relationship('TipoFormacion', back_populates='formaciones', lazy='selectin')
+    tipo_formacion = relationship('TipoFormacion', back_populates='formaciones', lazy='raise_on_sql')
 
     def __repr__(self) -> str:
         return f"<FormacionMiembro(titulo='{self.titulo}', miembro_id='{self.miembro_id}')>"
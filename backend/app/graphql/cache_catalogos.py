@@ -0,0 +1,167 @@
+"""Caché de respuestas para los campos de catálogo.
+
+Los catálogos (estados, tipos, países, provincias...) cambian unas pocas
+veces al año pero se consultan en cada pantalla. ``CacheCatalogo`` es una
+extensión de campo que guarda en ``CacheService`` el resultado de un
+resolver de Strawchemy, con clave (campo, argumentos, selección, versiones
+de las tablas implicadas).
+
+La invalidación es por versión: cada tabla catalogada tiene un contador
+``catalogo_version:<tabla>`` que se incrementa cuando se confirma una
+transacción que ha escrito en ella (mutations ``crear_*``/``actualizar_*``/
+``eliminar_*`` incluidas, que Strawchemy ejecuta como INSERT/UPDATE/DELETE
+sobre la sesión). Las entradas con la versión antigua dejan de ser
+alcanzables y caducan por TTL. Al vivir en Redis, funciona entre workers.
+La petición que hace el cambio espera a la invalidación antes de responder,
+así que una consulta lanzada después ya no ve el catálogo anterior.
+
+Solo se cachean selecciones que no salen de tablas catalogadas: si una
+consulta de ``tiposMiembro`` pide también ``miembros``, se resuelve sin caché.
+"""
+
+import json
+import logging
+from types import SimpleNamespace
+from typing import Any, Awaitable, Dict, Iterable, List, Optional, Set, Type
+
+from sqlalchemy.inspection import inspect
+from sqlalchemy.orm import RelationshipProperty
+from strawberry import Info
+from strawberry.extensions import FieldExtension
+from strawberry.types.field import StrawberryField
+from strawberry.types.nodes import FragmentSpread, InlineFragment, Selection
+
+from .carga import arbol_seleccion
+from ..infrastructure.cambios_sesion import Cambios, al_confirmar, en_bucle
+from ..infrastructure.services.cache_service import get_cache_service, generar_cache_key
+
+logger = logging.getLogger(__name__)
+
+# TTL de las respuestas cacheadas (la invalidación no depende de él)
+TTL_CATALOGO = 3600
+
+# Tablas de los campos con CacheCatalogo (se rellena al construir el schema)
+_tablas_catalogo: Set[str] = set()
+
+
+class CacheCatalogo(FieldExtension):
+    """Cachea la respuesta de un campo de catálogo de Strawchemy."""
+
+    def __init__(self, ttl: int = TTL_CATALOGO):
+        self.ttl = ttl
+        self.modelo: Optional[Type[Any]] = None
+
+    def apply(self, field: StrawberryField) -> None:
+        self.modelo = _modelo_de_tipo(field.type)
+        if self.modelo is None:
+            raise TypeError(f"CacheCatalogo: el campo {field.python_name} no es de un tipo Strawchemy")
+        _tablas_catalogo.add(self.modelo.__tablename__)
+
+    async def resolve_async(self, next_, source: Any, info: Info[Any, Any], **kwargs: Any) -> Any:
+        arbol = arbol_seleccion(info)
+        tablas = _tablas_seleccion(self.modelo, arbol)
+        if tablas is None:
+            return await next_(source, info, **kwargs)
+
+        cache = get_cache_service()
+        versiones = await cache.aget_many([_clave_version(t) for t in sorted(tablas)])
+        clave = generar_cache_key(
+            'catalogo',
+            info.field_name,
+            [versiones, _firma(info.selected_fields)],
+        )
+
+        datos = await cache.aget(clave)
+        if datos is not None:
+            return _a_objetos(datos, arbol)
+
+        resultado = await next_(source, info, **kwargs)
+        await cache.aset(clave, _a_datos(resultado, arbol), ttl=self.ttl)
+        return resultado
+
+
+def invalidar_catalogos(tablas: Iterable[str]) -> None:
+    """Invalida las respuestas cacheadas que dependen de ``tablas``."""
+    cache = get_cache_service()
+    for tabla in tablas:
+        if tabla in _tablas_catalogo:
+            cache.increment(_clave_version(tabla))
+
+
+async def ainvalidar_catalogos(tablas: Iterable[str]) -> None:
+    """Invalida las respuestas cacheadas que dependen de ``tablas`` (async)."""
+    cache = get_cache_service()
+    for tabla in tablas:
+        if tabla in _tablas_catalogo:
+            await cache.aincrement(_clave_version(tabla))
+
+
+def _clave_version(tabla: str) -> str:
+    return generar_cache_key('catalogo_version', tabla)
+
+
+def _modelo_de_tipo(tipo: Any) -> Optional[Type[Any]]:
+    """Modelo SQLAlchemy de un tipo Strawchemy (desenvolviendo listas/opcionales)."""
+    while hasattr(tipo, 'of_type'):
+        tipo = tipo.of_type
+    return getattr(tipo, '__dto_model__', None)
+
+
+def _tablas_seleccion(modelo: Type[Any], arbol: Dict[str, Any]) -> Optional[Set[str]]:
+    """Tablas que recorre la selección, o None si alguna no es catálogo."""
+    tablas = {modelo.__tablename__}
+    mapper = inspect(modelo)
+    for clave, subarbol in arbol.items():
+        prop = mapper.attrs.get(clave)
+        if not isinstance(prop, RelationshipProperty):
+            continue
+        relacionadas = _tablas_seleccion(prop.mapper.class_, subarbol)
+        if relacionadas is None:
+            return None
+        tablas |= relacionadas
+    return tablas if tablas <= _tablas_catalogo else None
+
+
+def _firma(selecciones: List[Selection]) -> List[Any]:
+    """Representación canónica (JSON) de la selección con sus argumentos."""
+    firma = []
+    for seleccion in selecciones:
+        if isinstance(seleccion, (FragmentSpread, InlineFragment)):
+            firma.extend(_firma(seleccion.selections))
+            continue
+        argumentos = json.loads(json.dumps(seleccion.arguments, sort_keys=True, default=str))
+        firma.append([seleccion.name, argumentos, _firma(seleccion.selections)])
+    return sorted(firma, key=lambda f: json.dumps(f, sort_keys=True))
+
+
+def _a_datos(valor: Any, arbol: Dict[str, Any]) -> Any:
+    """Copia del resultado reducida a los campos seleccionados (serializable)."""
+    if valor is None or not arbol:
+        return valor
+    if isinstance(valor, (list, tuple)):
+        return [_a_datos(v, arbol) for v in valor]
+    return {clave: _a_datos(getattr(valor, clave, None), subarbol) for clave, subarbol in arbol.items()}
+
+
+def _a_objetos(datos: Any, arbol: Dict[str, Any]) -> Any:
+    """Reconstruye objetos con atributos a partir de ``_a_datos``."""
+    if datos is None or not arbol:
+        return datos
+    if isinstance(datos, list):
+        return [_a_objetos(d, arbol) for d in datos]
+    return SimpleNamespace(**{clave: _a_objetos(datos.get(clave), subarbol) for clave, subarbol in arbol.items()})
+
+
+# === Invalidación al confirmar escrituras (ver cambios_sesion) ===
+
+@al_confirmar
+def _invalidar_tras_commit(cambios: Cambios) -> Optional[Awaitable[None]]:
+    tablas = cambios.tablas & _tablas_catalogo
+    if not tablas:
+        return None
+    if en_bucle():
+        # Dentro de una petición: no bloquear el event loop con la ida y vuelta a Redis
+        return ainvalidar_catalogos(tablas)
+    # Scripts síncronos: invalidación síncrona
+    invalidar_catalogos(tablas)
+    return None
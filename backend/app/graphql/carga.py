@@ -0,0 +1,44 @@
+"""Opciones de carga SQLAlchemy derivadas de la selección GraphQL.
+
+Los campos ``strawchemy.field()`` ya traducen la selección a JOINs con
+``contains_eager`` y ``raiseload('*')``. Este módulo es para los resolvers
+escritos a mano: convierte la selección pedida por el cliente en un árbol
+de campos que ``infrastructure.carga.opciones_carga`` traduce a
+``joinedload``/``selectinload``, de forma que solo se cargan las relaciones
+que realmente se van a devolver.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from strawberry import Info
+from strawberry.types.nodes import FragmentSpread, InlineFragment, Selection
+from strawberry.utils.str_converters import to_snake_case
+
+
+def arbol_seleccion(info: Info[Any, Any], ruta: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Devuelve el árbol de campos (snake_case) pedido bajo el campo actual.
+
+    Args:
+        info: Info del resolver
+        ruta: Campos GraphQL a descender antes de construir el árbol
+            (p. ej. ``['edges', 'node']`` en una conexión Relay)
+    """
+    arbol: Dict[str, Any] = {}
+    for campo in info.selected_fields:
+        _fusionar(arbol, campo.selections)
+
+    for nombre in ruta or ():
+        arbol = arbol.get(to_snake_case(nombre), {})
+
+    return arbol
+
+
+def _fusionar(arbol: Dict[str, Any], selecciones: List[Selection]) -> None:
+    """Añade al árbol las selecciones, resolviendo fragmentos."""
+    for seleccion in selecciones:
+        if isinstance(seleccion, (FragmentSpread, InlineFragment)):
+            _fusionar(arbol, seleccion.selections)
+            continue
+        if seleccion.name.startswith('__'):
+            continue
+        _fusionar(arbol.setdefault(to_snake_case(seleccion.name), {}), seleccion.selections)
@@ -0,0 +1,130 @@
+"""Campos de conexión (paginación por cursor) para los listados grandes.
+
+Complementan a los listados ``strawchemy.field()`` equivalentes, que siguen
+disponibles para catálogos y consultas con filtros arbitrarios. Cada
+conexión ordena por claves estables respaldadas por un índice compuesto
+(ver migración ``g6h7i8j9k0l1``).
+"""
+
+import uuid
+from typing import Any, Optional
+
+from sqlalchemy import select
+from strawberry import Info
+
+from .paginacion import Conexion, OrdenKeyset, paginar
+from .types_auto import (
+    MiembroType,
+    CuotaAnualType,
+    NotificacionType,
+    HistorialEstadoType,
+    OrdenCobroType,
+)
+from ..domains.core.models import HistorialEstado
+from ..domains.financiero.models import CuotaAnual, OrdenCobro
+from ..domains.miembros.models import Miembro
+from ..domains.notificaciones.models import Notificacion
+
+
+ORDEN_MIEMBROS = OrdenKeyset((Miembro.fecha_alta, Miembro.id))
+ORDEN_CUOTAS_ANUALES = OrdenKeyset((CuotaAnual.ejercicio, CuotaAnual.id))
+ORDEN_NOTIFICACIONES = OrdenKeyset((Notificacion.fecha_creacion, Notificacion.id), descendente=True)
+ORDEN_HISTORIAL_ESTADO = OrdenKeyset((HistorialEstado.fecha_cambio, HistorialEstado.id), descendente=True)
+ORDEN_ORDENES_COBRO = OrdenKeyset((OrdenCobro.remesa_id, OrdenCobro.id))
+
+
+def _filtrar(modelo, **condiciones: Any):
+    """SELECT del modelo con filtros de igualdad sobre los argumentos informados."""
+    stmt = select(modelo)
+    for campo, valor in condiciones.items():
+        if valor is not None:
+            stmt = stmt.where(getattr(modelo, campo) == valor)
+    return stmt
+
+
+async def miembros_conexion(
+    info: Info[Any, Any],
+    first: Optional[int] = None,
+    after: Optional[str] = None,
+    agrupacion_id: Optional[uuid.UUID] = None,
+    tipo_miembro_id: Optional[uuid.UUID] = None,
+    estado_id: Optional[uuid.UUID] = None,
+    activo: Optional[bool] = None,
+) -> Conexion[MiembroType]:
+    """Miembros ordenados por (fecha_alta, id)."""
+    stmt = _filtrar(
+        Miembro,
+        agrupacion_id=agrupacion_id,
+        tipo_miembro_id=tipo_miembro_id,
+        estado_id=estado_id,
+        activo=activo,
+    )
+    return await paginar(info, Miembro, stmt, ORDEN_MIEMBROS, first, after)
+
+
+async def cuotas_anuales_conexion(
+    info: Info[Any, Any],
+    first: Optional[int] = None,
+    after: Optional[str] = None,
+    miembro_id: Optional[uuid.UUID] = None,
+    ejercicio: Optional[int] = None,
+    estado_id: Optional[uuid.UUID] = None,
+) -> Conexion[CuotaAnualType]:
+    """Cuotas anuales ordenadas por (ejercicio, id)."""
+    stmt = _filtrar(
+        CuotaAnual,
+        miembro_id=miembro_id,
+        ejercicio=ejercicio,
+        estado_id=estado_id,
+    )
+    return await paginar(info, CuotaAnual, stmt, ORDEN_CUOTAS_ANUALES, first, after)
+
+
+async def notificaciones_conexion(
+    info: Info[Any, Any],
+    first: Optional[int] = None,
+    after: Optional[str] = None,
+    usuario_id: Optional[uuid.UUID] = None,
+    leida: Optional[bool] = None,
+    archivada: Optional[bool] = None,
+) -> Conexion[NotificacionType]:
+    """Notificaciones de la más reciente a la más antigua."""
+    stmt = _filtrar(
+        Notificacion,
+        usuario_id=usuario_id,
+        leida=leida,
+        archivada=archivada,
+    )
+    return await paginar(info, Notificacion, stmt, ORDEN_NOTIFICACIONES, first, after)
+
+
+async def historial_estado_conexion(
+    info: Info[Any, Any],
+    first: Optional[int] = None,
+    after: Optional[str] = None,
+    entidad_tipo: Optional[str] = None,
+    entidad_id: Optional[uuid.UUID] = None,
+) -> Conexion[HistorialEstadoType]:
+    """Cambios de estado del más reciente al más antiguo."""
+    stmt = _filtrar(
+        HistorialEstado,
+        entidad_tipo=entidad_tipo,
+        entidad_id=entidad_id,
+    )
+    return await paginar(info, HistorialEstado, stmt, ORDEN_HISTORIAL_ESTADO, first, after)
+
+
+async def ordenes_cobro_conexion(
+    info: Info[Any, Any],
+    first: Optional[int] = None,
+    after: Optional[str] = None,
+    remesa_id: Optional[uuid.UUID] = None,
+    estado_id: Optional[uuid.UUID] = None,
+) -> Conexion[OrdenCobroType]:
+    """Órdenes de cobro ordenadas por (remesa_id, id)."""
+    stmt = _filtrar(
+        OrdenCobro,
+        remesa_id=remesa_id,
+        estado_id=estado_id,
+    )
+    return await paginar(info, OrdenCobro, stmt, ORDEN_ORDENES_COBRO, first, after)
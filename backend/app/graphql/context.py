@@ -1,35 +1,131 @@
-"""Contexto GraphQL con sesión de base de datos."""
+"""Contexto GraphQL con sesión de base de datos.
 
-from dataclasses import dataclass
-from typing import AsyncGenerator
+La sesión se abre la primera vez que un resolver usa ``context.session``,
+no al recibir la petición: las operaciones que no tocan la base de datos
+(catálogos cacheados, introspección) no ocupan una conexión del pool.
+
+La extensión ``SesionPorOperacion`` indica al contexto el tipo de operación
+antes de ejecutarla y cierra la sesión en cuanto termina el último
+resolver, de modo que la conexión vuelve al pool antes de serializar y
+enviar la respuesta:
+
+- query: transacción de solo lectura (``BEGIN READ ONLY``) que se cierra
+  sin commit, en la réplica de lectura si hay una configurada y el usuario
+  no ha escrito en los últimos segundos (``core/replica.py``).
+- mutation: commit al terminar (rollback si falla) para persistir los
+  cambios de las mutations de Strawchemy. Los campos que devuelve la
+  mutation se leen en la misma sesión, en la primaria. Antes de responder
+  se espera a las invalidaciones de caché lanzadas por el commit.
+
+Cada tipo de operación tiene su ``statement_timeout``
+(``db_statement_timeout_query_ms`` / ``db_statement_timeout_mutation_ms``),
+de modo que una consulta atascada no retiene la conexión indefinidamente.
+"""
+
+from dataclasses import dataclass, field
+from typing import AsyncGenerator, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
+from strawberry.extensions import SchemaExtension
 from strawberry.fastapi import BaseContext
+from strawberry.types.graphql import OperationType
 
-from ..core.database import async_session
+from ..core.auth import claims_de_peticion
+from ..core.config import get_settings
+from ..core.database import (
+    STATEMENT_TIMEOUT,
+    async_session,
+    async_session_lectura,
+    async_session_replica,
+    esperar_tareas_tras_commit,
+)
+from ..core.replica import marcar_escritura, puede_leer_de_replica
 
 
 @dataclass
 class Context(BaseContext):
-    """Contexto GraphQL con sesión de base de datos."""
-    session: AsyncSession
+    """Contexto GraphQL con sesión de base de datos perezosa."""
+    solo_lectura: bool = False
+    replica: bool = False
+    _session: Optional[AsyncSession] = field(default=None, repr=False)
 
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            if self.replica:
+                self._session = async_session_replica()
+            elif self.solo_lectura:
+                self._session = async_session_lectura()
+            else:
+                self._session = async_session()
+            settings = get_settings()
+            self._session.info[STATEMENT_TIMEOUT] = (
+                settings.db_statement_timeout_query_ms if self.solo_lectura
+                else settings.db_statement_timeout_mutation_ms
+            )
+        return self._session
 
-async def get_context() -> AsyncGenerator[Context, None]:
-    """
-    Obtiene el contexto GraphQL con una sesión de base de datos.
+    @property
+    def usuario(self) -> Optional[str]:
+        """Usuario del token de la petición, si lo hay."""
+        request = getattr(self, "request", None)
+        if request is None:
+            return None
+        claims = claims_de_peticion(request.scope)
+        return claims.sub if claims else None
 
-    Usa un generador asíncrono para mantener la sesión abierta
-    durante toda la petición GraphQL. Strawberry FastAPI soporta
-    generadores asíncronos como context_getter.
+    async def finalizar(self, confirmar: bool) -> bool:
+        """Confirma si ``confirmar`` y cierra la sesión, devolviendo su conexión al pool.
 
-    IMPORTANTE: Hace commit automático al finalizar para persistir
-    los cambios de las mutations de Strawchemy.
-    """
-    async with async_session() as session:
+        Devuelve si había sesión abierta.
+        """
+        session, self._session = self._session, None
+        if session is None:
+            return False
         try:
-            yield Context(session=session)
-            await session.commit()
+            if confirmar:
+                await session.commit()
+                await esperar_tareas_tras_commit(session)
         except Exception:
             await session.rollback()
             raise
+        finally:
+            await session.close()
+        return True
+
+
+class SesionPorOperacion(SchemaExtension):
+    """Sesión de solo lectura para queries y cierre de la sesión al acabar la ejecución."""
+
+    async def on_execute(self):
+        context = self.execution_context.context
+        if not isinstance(context, Context):
+            yield
+            return
+
+        es_query = self.execution_context.operation_type == OperationType.QUERY
+        context.solo_lectura = es_query
+        if es_query:
+            context.replica = await puede_leer_de_replica(context.usuario)
+        try:
+            yield
+        except Exception:
+            await context.finalizar(confirmar=False)
+            raise
+        if await context.finalizar(confirmar=not es_query) and not es_query and context.usuario:
+            await marcar_escritura(context.usuario)
+
+
+async def get_context() -> AsyncGenerator[Context, None]:
+    """
+    Obtiene el contexto GraphQL.
+
+    La sesión se abre bajo demanda y la cierra ``SesionPorOperacion``; al
+    terminar la petición se cierra por si la operación no llegó a
+    ejecutarse (errores de validación).
+    """
+    context = Context()
+    try:
+        yield context
+    finally:
+        await context.finalizar(confirmar=False)
@@ -0,0 +1,245 @@
+"""Análisis estático de coste y profundidad de las operaciones GraphQL.
+
+Los tipos generados exponen todas las relaciones, así que una sola
+operación como ``tiposMiembro { miembros { agrupacion { ... } cuotas { ... } } }``
+puede multiplicar las filas leídas sin límite. ``LimiteCoste`` calcula, justo
+después de validar el documento y antes de ejecutar ningún resolver (y por
+tanto antes de emitir SQL), una estimación de los objetos que devolverá la
+operación:
+
+- Cada objeto devuelto pesa ``PESO_OBJETO`` (``PESO_AGREGADO`` los
+  ``*Aggregate``, que lanzan una subconsulta de agregación) y los escalares
+  no pesan. ``PESOS`` permite fijar el peso de campos concretos.
+- Un campo lista cuesta, por cada fila, su peso más lo que cuelga de él. Las
+  filas son el argumento ``first``/``limit`` si lo hay (literal o variable);
+  sin él Strawchemy devuelve la tabla entera, así que se suponen
+  ``TAMANIO_LISTA_SIN_LIMITE``. Las conexiones (campos con argumento
+  ``first``) aplican a sus ``edges`` el ``first`` pedido o, sin él, la página
+  por defecto, como hace ``paginar``.
+- Un campo de tipo union o interfaz cuesta lo que el más caro de sus tipos
+  posibles, con los fragmentos que aplican a cada uno.
+
+La operación se rechaza si supera ``graphql_profundidad_maxima`` o
+``graphql_coste_maximo``. Las que pasan consumen su coste de un presupuesto
+por usuario (o por IP si no hay token) de ``graphql_coste_periodo`` cada
+``limite_periodo_segundos``, con el mismo ``LimitadorTasa`` que el límite de
+peticiones: quien encadena consultas caras se frena aunque cada una quepa.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+from graphql import (
+    ExecutionResult,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLList,
+    GraphQLNonNull,
+    GraphQLObjectType,
+    InlineFragmentNode,
+    IntValueNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    VariableNode,
+    get_named_type,
+    is_abstract_type,
+    is_composite_type,
+)
+from graphql.utilities import get_operation_ast
+from strawberry.extensions import SchemaExtension
+
+from .paginacion import PAGINA_MAXIMA, PAGINA_POR_DEFECTO
+from ..core.bloqueo_ip import ip_cliente
+from ..core.config import get_settings
+from ..infrastructure.services.limitador_tasa import Limite, get_limitador_tasa
+
+PESO_OBJETO = 1
+PESO_AGREGADO = 2
+
+# Filas supuestas de una lista sin ``first``/``limit`` (Strawchemy las devuelve todas)
+TAMANIO_LISTA_SIN_LIMITE = 1000
+
+# Argumentos que fijan el tamaño de una lista o de la página de una conexión
+ARGUMENTOS_TAMANIO = ("first", "limit")
+
+# Pesos de campos concretos ("Tipo.campo": peso), por encima de los de por defecto
+PESOS: Dict[str, int] = {}
+
+
+def _error(mensaje: str, codigo: str, **extensiones: Any) -> ExecutionResult:
+    return ExecutionResult(data=None, errors=[
+        GraphQLError(mensaje, extensions={"code": codigo, **extensiones})
+    ])
+
+
+class AnalizadorCoste:
+    """Coste y profundidad de una operación sobre el schema de graphql-core."""
+
+    def __init__(self, schema, fragmentos: Dict[str, FragmentDefinitionNode],
+                 variables: Optional[Dict[str, Any]] = None,
+                 operacion: Optional[OperationDefinitionNode] = None):
+        self.schema = schema
+        self.fragmentos = fragmentos
+        self.variables = dict(variables or {})
+        if operacion is not None:
+            # Variables no enviadas: su valor por defecto en la operación
+            for definicion in operacion.variable_definitions or ():
+                nombre = definicion.variable.name.value
+                if nombre not in self.variables and isinstance(definicion.default_value, IntValueNode):
+                    self.variables[nombre] = int(definicion.default_value.value)
+        self._cache_fragmentos: Dict[Tuple[str, str, Optional[int]], Tuple[int, int]] = {}
+
+    def analizar(self, operacion: OperationDefinitionNode) -> Tuple[int, int]:
+        """Devuelve ``(coste, profundidad)`` de ``operacion``."""
+        raiz = self.schema.get_root_type(operacion.operation)
+        return self._seleccion(raiz, operacion.selection_set, None)
+
+    def _tamanio(self, campo: FieldNode) -> Optional[int]:
+        for argumento in campo.arguments or ():
+            if argumento.name.value not in ARGUMENTOS_TAMANIO:
+                continue
+            valor = argumento.value
+            if isinstance(valor, IntValueNode):
+                return max(0, int(valor.value))
+            if isinstance(valor, VariableNode):
+                variable = self.variables.get(valor.name.value)
+                if isinstance(variable, int):
+                    return max(0, variable)
+        return None
+
+    def _seleccion(self, tipo, seleccion: SelectionSetNode, pagina: Optional[int]) -> Tuple[int, int]:
+        if is_abstract_type(tipo):
+            # El objeto será de uno de los tipos posibles: cuesta lo que el más caro
+            costes = [self._seleccion(posible, seleccion, pagina) for posible in self.schema.get_possible_types(tipo)]
+            if not costes:
+                return 0, 0
+            return max(c for c, _ in costes), max(p for _, p in costes)
+
+        coste = profundidad = 0
+        for nodo in seleccion.selections:
+            if isinstance(nodo, FieldNode):
+                c, p = self._campo(tipo, nodo, pagina)
+            elif isinstance(nodo, InlineFragmentNode):
+                if nodo.type_condition is not None and not self._aplica(nodo.type_condition.name.value, tipo):
+                    continue
+                c, p = self._seleccion(tipo, nodo.selection_set, pagina)
+            elif isinstance(nodo, FragmentSpreadNode):
+                c, p = self._fragmento(nodo.name.value, tipo, pagina)
+            else:
+                continue
+            coste += c
+            profundidad = max(profundidad, p)
+        return coste, profundidad
+
+    def _aplica(self, condicion: str, tipo: GraphQLObjectType) -> bool:
+        """Si un fragmento ``on condicion`` se aplica a un objeto de ``tipo``."""
+        tipo_condicion = self.schema.get_type(condicion)
+        if tipo_condicion is None:
+            return False
+        if is_abstract_type(tipo_condicion):
+            return self.schema.is_sub_type(tipo_condicion, tipo)
+        return tipo_condicion.name == tipo.name
+
+    def _fragmento(self, nombre: str, tipo: GraphQLObjectType, pagina: Optional[int]) -> Tuple[int, int]:
+        # Memoizado: un fragmento repetido en muchos sitios se analiza una vez por tipo
+        clave = (nombre, tipo.name, pagina)
+        if clave not in self._cache_fragmentos:
+            fragmento = self.fragmentos[nombre]
+            if self._aplica(fragmento.type_condition.name.value, tipo):
+                self._cache_fragmentos[clave] = self._seleccion(tipo, fragmento.selection_set, pagina)
+            else:
+                self._cache_fragmentos[clave] = (0, 0)
+        return self._cache_fragmentos[clave]
+
+    def _campo(self, tipo: GraphQLObjectType, nodo: FieldNode, pagina: Optional[int]) -> Tuple[int, int]:
+        nombre = nodo.name.value
+        if nombre.startswith("__"):
+            # Introspección: no toca la base de datos
+            return 0, 0
+        definicion = tipo.fields.get(nombre)
+        if definicion is None:
+            return 0, 0
+
+        tipo_campo = definicion.type
+        if isinstance(tipo_campo, GraphQLNonNull):
+            tipo_campo = tipo_campo.of_type
+        es_lista = isinstance(tipo_campo, GraphQLList)
+        tipo_final = get_named_type(tipo_campo)
+        if not is_composite_type(tipo_final) or nodo.selection_set is None:
+            return PESOS.get(f"{tipo.name}.{nombre}", 0), 0
+
+        peso = PESOS.get(
+            f"{tipo.name}.{nombre}", PESO_AGREGADO if nombre.endswith("Aggregate") else PESO_OBJETO
+        )
+        tamanio = self._tamanio(nodo)
+        if es_lista:
+            # El tamaño de página de la conexión padre se aplica a la primera lista
+            filas = tamanio if tamanio is not None else pagina if pagina is not None else TAMANIO_LISTA_SIN_LIMITE
+            coste, profundidad = self._seleccion(tipo_final, nodo.selection_set, None)
+            return filas * (peso + coste), profundidad + 1
+        if "first" in definicion.args:
+            # Conexión: sin first, paginar usa la página por defecto
+            tamanio = min(tamanio if tamanio is not None else PAGINA_POR_DEFECTO, PAGINA_MAXIMA)
+        coste, profundidad = self._seleccion(tipo_final, nodo.selection_set, tamanio)
+        return peso + coste, profundidad + 1
+
+
+class LimiteCoste(SchemaExtension):
+    """Rechaza o frena las operaciones por coste estimado antes de ejecutarlas."""
+
+    async def on_validate(self):
+        yield
+        contexto = self.execution_context
+        if contexto.errors or contexto.graphql_document is None:
+            return
+
+        documento = contexto.graphql_document
+        operacion = get_operation_ast(documento, contexto.operation_name)
+        if operacion is None:
+            return
+        fragmentos = {
+            definicion.name.value: definicion
+            for definicion in documento.definitions
+            if isinstance(definicion, FragmentDefinitionNode)
+        }
+        analizador = AnalizadorCoste(contexto.schema._schema, fragmentos, contexto.variables, operacion)
+        coste, profundidad = analizador.analizar(operacion)
+
+        settings = get_settings()
+        if profundidad > settings.graphql_profundidad_maxima:
+            contexto.result = _error(
+                f"La consulta tiene profundidad {profundidad}; el máximo es {settings.graphql_profundidad_maxima}.",
+                "CONSULTA_DEMASIADO_PROFUNDA",
+                profundidad=profundidad, maximo=settings.graphql_profundidad_maxima,
+            )
+            return
+        if coste > settings.graphql_coste_maximo:
+            contexto.result = _error(
+                f"La consulta tiene un coste estimado de {coste}; el máximo es {settings.graphql_coste_maximo}. "
+                "Pida menos relaciones anidadas o use las conexiones paginadas.",
+                "CONSULTA_DEMASIADO_COSTOSA",
+                coste=coste, maximo=settings.graphql_coste_maximo,
+            )
+            return
+
+        identificador = self._identificador()
+        if identificador is None or coste == 0:
+            return
+        limite = Limite("graphql_coste", settings.graphql_coste_periodo, settings.limite_periodo_segundos)
+        resultado = await get_limitador_tasa().consumir(limite, identificador, coste=coste)
+        if not resultado.permitido:
+            contexto.result = _error(
+                "Presupuesto de consultas agotado. Intente nuevamente más tarde.",
+                "PRESUPUESTO_COSTE_AGOTADO",
+                coste=coste, reintentarEn=round(resultado.reintentar_en, 1),
+            )
+
+    def _identificador(self) -> Optional[str]:
+        """Usuario del token o, sin token, IP de la petición."""
+        context = self.execution_context.context
+        request = getattr(context, "request", None)
+        if request is None:
+            return None
+        usuario = getattr(context, "usuario", None)
+        return f"usuario:{usuario}" if usuario else f"ip:{ip_cliente(request.scope)}"
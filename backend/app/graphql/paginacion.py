@@ -0,0 +1,174 @@
+"""Paginación por cursor (keyset) estilo Relay.
+
+A diferencia de ``limit``/``offset``, cada página se obtiene con
+``WHERE (clave1, clave2) > (:v1, :v2) ORDER BY clave1, clave2 LIMIT n``,
+que recorre el índice compuesto correspondiente y cuesta lo mismo en la
+página 1 que en la 1000. La última clave de orden debe ser única (el ``id``)
+para que el orden sea total y estable.
+
+El cursor es opaco para el cliente: los valores de las claves de orden de
+la fila, serializados en JSON y codificados en base64.
+"""
+
+import base64
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Generic, List, Optional, Sequence, Type, TypeVar
+
+import strawberry
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+from strawberry import Info
+
+from .carga import arbol_seleccion
+from ..infrastructure.carga import opciones_carga
+
+T = TypeVar("T")
+
+# Tamaño de página si el cliente no indica `first`, y máximo permitido
+PAGINA_POR_DEFECTO = 50
+PAGINA_MAXIMA = 500
+
+
+@strawberry.type
+class PageInfo:
+    """Información de paginación (especificación Relay)."""
+    has_next_page: bool
+    has_previous_page: bool
+    start_cursor: Optional[str]
+    end_cursor: Optional[str]
+
+
+@strawberry.type
+class Arista(Generic[T]):
+    """Elemento de una conexión con su cursor."""
+    cursor: str
+    node: T
+
+
+@strawberry.type
+class Conexion(Generic[T]):
+    """Página de resultados de una conexión Relay."""
+    edges: List[Arista[T]]
+    page_info: PageInfo
+
+
+@dataclass(frozen=True)
+class OrdenKeyset:
+    """Claves de orden de una conexión.
+
+    Attributes:
+        columnas: Atributos del modelo por los que se ordena; el último
+            debe ser único (normalmente ``Modelo.id``)
+        descendente: Ordenar de mayor a menor (p. ej. más recientes primero)
+    """
+    columnas: Sequence[InstrumentedAttribute]
+    descendente: bool = False
+
+
+class CursorInvalido(ValueError):
+    """El cursor recibido no corresponde a las claves de la conexión."""
+
+
+def codificar_cursor(valores: Sequence[Any]) -> str:
+    """Codifica los valores de las claves de orden en un cursor opaco."""
+    serializados = [
+        v.isoformat() if isinstance(v, (date, datetime)) else str(v) if isinstance(v, uuid.UUID) else v
+        for v in valores
+    ]
+    payload = json.dumps(serializados, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor: str, orden: OrdenKeyset) -> List[Any]:
+    """Decodifica un cursor a los valores tipados de las claves de orden."""
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        if not isinstance(valores, list) or len(valores) != len(orden.columnas):
+            raise CursorInvalido(f"Cursor inválido: {cursor}")
+        return [_convertir(valor, columna) for valor, columna in zip(valores, orden.columnas)]
+    except (ValueError, TypeError) as e:
+        raise CursorInvalido(f"Cursor inválido: {cursor}") from e
+
+
+def _convertir(valor: Any, columna: InstrumentedAttribute) -> Any:
+    """Convierte un valor JSON al tipo Python de la columna."""
+    if valor is None:
+        return None
+    tipo = columna.type.python_type
+    if tipo is datetime:
+        return datetime.fromisoformat(valor)
+    if tipo is date:
+        return date.fromisoformat(valor)
+    if tipo is uuid.UUID:
+        return uuid.UUID(valor)
+    return tipo(valor)
+
+
+def tamano_pagina(first: Optional[int]) -> int:
+    """Normaliza el tamaño de página pedido a [1, PAGINA_MAXIMA]."""
+    if first is None:
+        return PAGINA_POR_DEFECTO
+    return max(1, min(first, PAGINA_MAXIMA))
+
+
+async def paginar(
+    info: Info[Any, Any],
+    modelo: Type[Any],
+    stmt: Select,
+    orden: OrdenKeyset,
+    first: Optional[int] = None,
+    after: Optional[str] = None,
+) -> Conexion[Any]:
+    """Ejecuta ``stmt`` paginado por keyset y devuelve la conexión.
+
+    Las relaciones se cargan según lo pedido en ``edges { node { ... } }``.
+
+    Args:
+        info: Info del resolver (sesión y selección)
+        modelo: Modelo raíz de la consulta
+        stmt: SELECT del modelo con los filtros ya aplicados
+        orden: Claves de orden de la conexión
+        first: Tamaño de página pedido
+        after: Cursor de la última fila de la página anterior
+    """
+    limite = tamano_pagina(first)
+    clave = tuple_(*orden.columnas)
+
+    if after:
+        valores = decodificar_cursor(after, orden)
+        limite_inferior = tuple_(*valores, types=[c.type for c in orden.columnas])
+        stmt = stmt.where(clave < limite_inferior if orden.descendente else clave > limite_inferior)
+
+    # Las claves de orden se cargan siempre: hacen falta para el cursor
+    arbol = dict(arbol_seleccion(info, ['edges', 'node']))
+    for columna in orden.columnas:
+        arbol.setdefault(columna.key, {})
+
+    stmt = (
+        stmt.options(*opciones_carga(modelo, arbol))
+        .order_by(*(c.desc() if orden.descendente else c.asc() for c in orden.columnas))
+        .limit(limite + 1)
+    )
+    result = await info.context.session.execute(stmt)
+    filas = list(result.scalars().unique().all())
+
+    hay_siguiente = len(filas) > limite
+    filas = filas[:limite]
+    aristas = [
+        Arista(cursor=codificar_cursor([getattr(fila, c.key) for c in orden.columnas]), node=fila)
+        for fila in filas
+    ]
+
+    return Conexion(
+        edges=aristas,
+        page_info=PageInfo(
+            has_next_page=hay_siguiente,
+            has_previous_page=after is not None,
+            start_cursor=aristas[0].cursor if aristas else None,
+            end_cursor=aristas[-1].cursor if aristas else None,
+        ),
+    )
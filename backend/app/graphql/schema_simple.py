@@ -5,6 +5,12 @@ Strawchemy genera automáticamente:
 - Queries con filtrado, ordenamiento y paginación
 - Mutations CRUD (Create, Read, Update, Delete)
 - Resolvers optimizados con N+1 prevention
+
+Los listados grandes tienen además un campo ``*Conexion`` con paginación
+por cursor (ver ``conexiones.py``). Los catálogos se sirven desde caché
+(``CacheCatalogo``, ver ``cache_catalogos.py``). Las operaciones demasiado
+profundas o costosas se rechazan antes de ejecutarse (``LimiteCoste``, ver
+``coste.py``).
 """
 
 import strawberry
@@ -12,6 +18,8 @@ import strawberry
 from . import strawchemy
 from .types_auto import *  # Importar todos los tipos generados
 from .inputs_auto import *  # Importar inputs y filtros
+from . import conexiones
+from .cache_catalogos import CacheCatalogo
 
 
 @strawberry.type
@@ -28,71 +36,76 @@ class Query:
 
     # === CORE ===
     configuraciones: list[ConfiguracionType] = strawchemy.field()
-    reglasValidacionConfig: list[ReglaValidacionConfigType] = strawchemy.field()
+    reglasValidacionConfig: list[ReglaValidacionConfigType] = strawchemy.field(extensions=[CacheCatalogo()])
     historialConfiguracion: list[HistorialConfiguracionType] = strawchemy.field()
-    estadosCuota: list[EstadoCuotaType] = strawchemy.field()
-    estadosCampania: list[EstadoCampaniaType] = strawchemy.field()
-    estadosTarea: list[EstadoTareaType] = strawchemy.field()
-    estadosParticipante: list[EstadoParticipanteType] = strawchemy.field()
-    estadosOrdenCobro: list[EstadoOrdenCobroType] = strawchemy.field()
-    estadosRemesa: list[EstadoRemesaType] = strawchemy.field()
-    estadosDonacion: list[EstadoDonacionType] = strawchemy.field()
-    estadosNotificacion: list[EstadoNotificacionType] = strawchemy.field()
+    estadosCuota: list[EstadoCuotaType] = strawchemy.field(extensions=[CacheCatalogo()])
+    estadosCampania: list[EstadoCampaniaType] = strawchemy.field(extensions=[CacheCatalogo()])
+    estadosTarea: list[EstadoTareaType] = strawchemy.field(extensions=[CacheCatalogo()])
+    estadosParticipante: list[EstadoParticipanteType] = strawchemy.field(extensions=[CacheCatalogo()])
+    estadosOrdenCobro: list[EstadoOrdenCobroType] = strawchemy.field(extensions=[CacheCatalogo()])
+    estadosRemesa: list[EstadoRemesaType] = strawchemy.field(extensions=[CacheCatalogo()])
+    estadosDonacion: list[EstadoDonacionType] = strawchemy.field(extensions=[CacheCatalogo()])
+    estadosNotificacion: list[EstadoNotificacionType] = strawchemy.field(extensions=[CacheCatalogo()])
     historialEstado: list[HistorialEstadoType] = strawchemy.field()
+    historialEstadoConexion = strawberry.field(resolver=conexiones.historial_estado_conexion)
     sesiones: list[SesionType] = strawchemy.field()
     historialSeguridad: list[HistorialSeguridadType] = strawchemy.field()
     ipsBloqueadas: list[IPBloqueadaType] = strawchemy.field()
     intentosAcceso: list[IntentoAccesoType] = strawchemy.field()
 
     # === GEOGRÁFICO ===
-    paises: list[PaisType] = strawchemy.field()
-    provincias: list[ProvinciaType] = strawchemy.field()
-    municipios: list[MunicipioType] = strawchemy.field()
+    paises: list[PaisType] = strawchemy.field(extensions=[CacheCatalogo()])
+    provincias: list[ProvinciaType] = strawchemy.field(extensions=[CacheCatalogo()])
+    municipios: list[MunicipioType] = strawchemy.field(extensions=[CacheCatalogo()])
     direcciones: list[DireccionType] = strawchemy.field()
     agrupacionesTerritoriales: list[AgrupacionTerritorialType] = strawchemy.field()
 
     # === NOTIFICACIONES ===
-    tiposNotificacion: list[TipoNotificacionType] = strawchemy.field()
+    tiposNotificacion: list[TipoNotificacionType] = strawchemy.field(extensions=[CacheCatalogo()])
     notificaciones: list[NotificacionType] = strawchemy.field()
+    notificacionesConexion = strawberry.field(resolver=conexiones.notificaciones_conexion)
     preferenciasNotificacion: list[PreferenciaNotificacionType] = strawchemy.field()
 
     # === FINANCIERO ===
-    importesCuotaAnio: list[ImporteCuotaAnioType] = strawchemy.field()
+    importesCuotaAnio: list[ImporteCuotaAnioType] = strawchemy.field(extensions=[CacheCatalogo()])
     cuotasAnuales: list[CuotaAnualType] = strawchemy.field()
-    donacionConceptos: list[DonacionConceptoType] = strawchemy.field()
+    cuotasAnualesConexion = strawberry.field(resolver=conexiones.cuotas_anuales_conexion)
+    donacionConceptos: list[DonacionConceptoType] = strawchemy.field(extensions=[CacheCatalogo()])
     donaciones: list[DonacionType] = strawchemy.field()
     remesas: list[RemesaType] = strawchemy.field()
     ordenesCobro: list[OrdenCobroType] = strawchemy.field()
-    estadosPlanificacion: list[EstadoPlanificacionType] = strawchemy.field()
-    categoriasPartida: list[CategoriaPartidaType] = strawchemy.field()
+    ordenesCobroConexion = strawberry.field(resolver=conexiones.ordenes_cobro_conexion)
+    estadosPlanificacion: list[EstadoPlanificacionType] = strawchemy.field(extensions=[CacheCatalogo()])
+    categoriasPartida: list[CategoriaPartidaType] = strawchemy.field(extensions=[CacheCatalogo()])
     partidasPresupuestarias: list[PartidaPresupuestariaType] = strawchemy.field()
     planificacionesAnuales: list[PlanificacionAnualType] = strawchemy.field()
 
     # === COLABORACIONES ===
-    tiposAsociacion: list[TipoAsociacionType] = strawchemy.field()
+    tiposAsociacion: list[TipoAsociacionType] = strawchemy.field(extensions=[CacheCatalogo()])
     asociaciones: list[AsociacionType] = strawchemy.field()
-    estadosConvenio: list[EstadoConvenioType] = strawchemy.field()
+    estadosConvenio: list[EstadoConvenioType] = strawchemy.field(extensions=[CacheCatalogo()])
     convenios: list[ConvenioType] = strawchemy.field()
 
     # === MIEMBROS ===
-    tiposMiembro: list[TipoMiembroType] = strawchemy.field()
-    estadosMiembro: list[EstadoMiembroType] = strawchemy.field()
-    motivosBaja: list[MotivoBajaType] = strawchemy.field()
-    tiposCargo: list[TipoCargoType] = strawchemy.field()
+    tiposMiembro: list[TipoMiembroType] = strawchemy.field(extensions=[CacheCatalogo()])
+    estadosMiembro: list[EstadoMiembroType] = strawchemy.field(extensions=[CacheCatalogo()])
+    motivosBaja: list[MotivoBajaType] = strawchemy.field(extensions=[CacheCatalogo()])
+    tiposCargo: list[TipoCargoType] = strawchemy.field(extensions=[CacheCatalogo()])
     miembros: list[MiembroType] = strawchemy.field(filter_input=MiembroFilter)
+    miembrosConexion = strawberry.field(resolver=conexiones.miembros_conexion)
 
     # === CAMPAÑAS ===
-    tiposCampania: list[TipoCampaniaType] = strawchemy.field(filter_input=TipoCampaniaFilter)
+    tiposCampania: list[TipoCampaniaType] = strawchemy.field(filter_input=TipoCampaniaFilter, extensions=[CacheCatalogo()])
     campanias: list[CampaniaType] = strawchemy.field(filter_input=CampaniaFilter)
-    rolesParticipante: list[RolParticipanteType] = strawchemy.field()
+    rolesParticipante: list[RolParticipanteType] = strawchemy.field(extensions=[CacheCatalogo()])
     participantesCampania: list[ParticipanteCampaniaType] = strawchemy.field()
 
     # === ACTIVIDADES ===
-    tiposActividad: list[TipoActividadType] = strawchemy.field()
-    estadosActividad: list[EstadoActividadType] = strawchemy.field()
-    estadosPropuesta: list[EstadoPropuestaType] = strawchemy.field()
-    tiposRecurso: list[TipoRecursoType] = strawchemy.field()
-    tiposKpi: list[TipoKPIType] = strawchemy.field()
+    tiposActividad: list[TipoActividadType] = strawchemy.field(extensions=[CacheCatalogo()])
+    estadosActividad: list[EstadoActividadType] = strawchemy.field(extensions=[CacheCatalogo()])
+    estadosPropuesta: list[EstadoPropuestaType] = strawchemy.field(extensions=[CacheCatalogo()])
+    tiposRecurso: list[TipoRecursoType] = strawchemy.field(extensions=[CacheCatalogo()])
+    tiposKpi: list[TipoKPIType] = strawchemy.field(extensions=[CacheCatalogo()])
     propuestasActividad: list[PropuestaActividadType] = strawchemy.field()
     tareasPropuesta: list[TareaPropuestaType] = strawchemy.field()
     recursosPropuesta: list[RecursoPropuestaType] = strawchemy.field()
@@ -107,8 +120,8 @@ class Query:
     medicionesKpi: list[MedicionKPIType] = strawchemy.field()
 
     # === GRUPOS ===
-    tiposGrupo: list[TipoGrupoType] = strawchemy.field()
-    rolesGrupo: list[RolGrupoType] = strawchemy.field()
+    tiposGrupo: list[TipoGrupoType] = strawchemy.field(extensions=[CacheCatalogo()])
+    rolesGrupo: list[RolGrupoType] = strawchemy.field(extensions=[CacheCatalogo()])
     gruposTrabajo: list[GrupoTrabajoType] = strawchemy.field()
     miembrosGrupo: list[MiembroGrupoType] = strawchemy.field()
     tareasGrupo: list[TareaGrupoType] = strawchemy.field()
@@ -116,18 +129,20 @@ class Query:
     asistentesReunion: list[AsistenteReunionType] = strawchemy.field()
 
     # === VOLUNTARIADO ===
-    categoriasCompetencia: list[CategoriaCompetenciaType] = strawchemy.field()
-    competencias: list[CompetenciaType] = strawchemy.field()
-    nivelesCompetencia: list[NivelCompetenciaType] = strawchemy.field()
+    categoriasCompetencia: list[CategoriaCompetenciaType] = strawchemy.field(extensions=[CacheCatalogo()])
+    competencias: list[CompetenciaType] = strawchemy.field(extensions=[CacheCatalogo()])
+    nivelesCompetencia: list[NivelCompetenciaType] = strawchemy.field(extensions=[CacheCatalogo()])
     miembrosCompetencia: list[MiembroCompetenciaType] = strawchemy.field()
-    tiposDocumentoVoluntario: list[TipoDocumentoVoluntarioType] = strawchemy.field()
+    tiposDocumentoVoluntario: list[TipoDocumentoVoluntarioType] = strawchemy.field(extensions=[CacheCatalogo()])
     documentosMiembro: list[DocumentoMiembroType] = strawchemy.field()
-    tiposFormacion: list[TipoFormacionType] = strawchemy.field()
+    tiposFormacion: list[TipoFormacionType] = strawchemy.field(extensions=[CacheCatalogo()])
     formacionesMiembro: list[FormacionMiembroType] = strawchemy.field()
 
 
 # Importar mutations
 from .mutations import Mutation
+from .context import SesionPorOperacion
+from .coste import LimiteCoste
 
 
 # Schema principal con queries y mutations
@@ -135,4 +150,5 @@ from .mutations import Mutation
 schema = strawberry.Schema(
     query=Query,
     mutation=Mutation,
+    extensions=[LimiteCoste, SesionPorOperacion],
 )
@@ -1,5 +1,10 @@
 """Capa de infraestructura - Servicios técnicos y base de datos."""
 
 from .base_model import BaseModel, AuditoriaMixin
+from .carga import opciones_carga
 
-__all__ = ['BaseModel', 'AuditoriaMixin']
+__all__ = [
+    'BaseModel',
+    'AuditoriaMixin',
+    'opciones_carga',
+]
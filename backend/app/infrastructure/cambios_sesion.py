@@ -0,0 +1,147 @@
+"""Seguimiento de las escrituras de cada transacción.
+
+Varios subsistemas reaccionan a lo que confirma una transacción: la caché
+de catálogos y las etiquetas de modelo se invalidan, y los registros de
+estados y permisos se recargan. En lugar de que cada uno registre sus
+propios listeners de ``Session``, este módulo registra uno de cada:
+
+- ``after_flush`` y ``do_orm_execute`` anotan en ``session.info`` las
+  tablas, las filas (clase e identidad) y las clases afectadas por
+  INSERT/UPDATE/DELETE masivos.
+- ``after_commit`` entrega esos ``Cambios`` a las funciones registradas con
+  ``al_confirmar``; ``after_rollback`` los descarta.
+
+Una función registrada puede devolver un awaitable (solo si hay bucle de
+eventos, ver ``en_bucle``): se lanza como tarea para no bloquear el commit
+y queda en ``session.info[TAREAS_TRAS_COMMIT]``, donde la petición la espera
+antes de responder (``esperar_tareas_tras_commit``)::
+
+    @al_confirmar
+    def _invalidar(cambios: Cambios):
+        if en_bucle():
+            return ainvalidar(cambios.tablas)
+        invalidar(cambios.tablas)
+"""
+
+import asyncio
+import inspect as inspect_py
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.inspection import inspect
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from ..core.database import TAREAS_TRAS_COMMIT
+
+logger = logging.getLogger(__name__)
+
+# Clave en session.info con los cambios de la transacción en curso
+_CAMBIOS = 'cambios_transaccion'
+
+
+@dataclass
+class Cambios:
+    """Escrituras de una transacción confirmada."""
+    tablas: Set[str] = field(default_factory=set)
+    # (clase, identidad) de las filas de la unidad de trabajo; identidad None si aún no la tiene
+    filas: Set[Tuple[type, Optional[tuple]]] = field(default_factory=set)
+    # Clases con INSERT/UPDATE/DELETE emitidos con session.execute (Strawchemy)
+    clases_dml: Set[type] = field(default_factory=set)
+    # Las de UPDATE/DELETE masivos, que no identifican las filas
+    masivas: Set[type] = field(default_factory=set)
+
+
+AlConfirmar = Callable[[Cambios], Optional[Awaitable[Any]]]
+
+_funciones: List[AlConfirmar] = []
+
+# Tareas lanzadas tras el commit (referencia fuerte hasta que terminan)
+_tareas: Set[asyncio.Task] = set()
+
+
+def al_confirmar(funcion: AlConfirmar) -> AlConfirmar:
+    """Registra ``funcion`` para cada commit con escrituras (una sola vez)."""
+    if funcion not in _funciones:
+        _funciones.append(funcion)
+    return funcion
+
+
+def en_bucle() -> bool:
+    """Si el commit ocurre dentro de un bucle de eventos (petición) y no en un script síncrono."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _cambios(session: Session) -> Cambios:
+    cambios = session.info.get(_CAMBIOS)
+    if cambios is None:
+        cambios = session.info[_CAMBIOS] = Cambios()
+    return cambios
+
+
+@event.listens_for(Session, 'after_flush')
+def _registrar_flush(session: Session, flush_context: Any) -> None:
+    """Escrituras de la unidad de trabajo (``session.add``/``delete``)."""
+    objetos = (*session.new, *session.dirty, *session.deleted)
+    if not objetos:
+        return
+    cambios = _cambios(session)
+    for obj in objetos:
+        tabla = getattr(obj, '__table__', None)
+        if tabla is not None:
+            cambios.tablas.add(tabla.name)
+        cambios.filas.add((type(obj), inspect(obj).identity))
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _registrar_dml(orm_execute_state: ORMExecuteState) -> None:
+    """INSERT/UPDATE/DELETE emitidos con ``session.execute``."""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    tabla = mapper.local_table if mapper is not None else getattr(orm_execute_state.statement, 'table', None)
+    nombre = getattr(tabla, 'name', None)
+    if not nombre and mapper is None:
+        return
+    cambios = _cambios(orm_execute_state.session)
+    if nombre:
+        cambios.tablas.add(nombre)
+    if mapper is not None:
+        cambios.clases_dml.add(mapper.class_)
+        if not orm_execute_state.is_insert:
+            cambios.masivas.add(mapper.class_)
+
+
+@event.listens_for(Session, 'after_commit')
+def _tras_commit(session: Session) -> None:
+    cambios = session.info.pop(_CAMBIOS, None)
+    if cambios is None:
+        return
+    for funcion in _funciones:
+        try:
+            resultado = funcion(cambios)
+        except Exception as e:
+            logger.error(f"Error tras el commit en {funcion.__module__}.{funcion.__name__}: {e}")
+            continue
+        if inspect_py.isawaitable(resultado):
+            tarea = asyncio.ensure_future(_registrando_errores(funcion, resultado))
+            _tareas.add(tarea)
+            tarea.add_done_callback(_tareas.discard)
+            session.info.setdefault(TAREAS_TRAS_COMMIT, []).append(tarea)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _descartar_tras_rollback(session: Session) -> None:
+    session.info.pop(_CAMBIOS, None)
+
+
+async def _registrando_errores(funcion: AlConfirmar, pendiente: Awaitable[Any]) -> None:
+    try:
+        await pendiente
+    except Exception as e:
+        logger.error(f"Error tras el commit en {funcion.__module__}.{funcion.__name__}: {e}")
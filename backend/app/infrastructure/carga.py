@@ -0,0 +1,87 @@
+"""Opciones de carga de relaciones para consultas SQLAlchemy.
+
+Las relaciones de los modelos se declaran con ``lazy='raise_on_sql'``:
+acceder a una relación no cargada lanza un error en lugar de emitir SQL
+implícito (que además fallaría en async). Quien necesite relaciones debe
+pedirlas explícitamente, derivando las opciones de un árbol de campos (p. ej.
+la selección GraphQL). Solo las relaciones que leen las propiedades y métodos
+de los propios modelos (``Miembro.es_simpatizante``,
+``Direccion.direccion_completa``, ``Remesa.calcular_totales``...) siguen en
+``lazy='selectin'``, para que funcionen con cualquier instancia.
+
+Un árbol de campos es un dict ``{nombre_atributo: subarbol}`` donde el
+subárbol de una columna es ``{}`` y el de una relación contiene los campos
+pedidos del modelo relacionado::
+
+    {'nombre': {}, 'tipo_miembro': {'nombre': {}}, 'agrupacion': {}}
+"""
+
+from typing import Any, List, Mapping, Optional, Type
+
+from sqlalchemy.inspection import inspect
+from sqlalchemy.orm import joinedload, selectinload, load_only, ColumnProperty, RelationshipProperty
+
+ArbolCampos = Mapping[str, "ArbolCampos"]
+
+
+def opciones_carga(modelo: Type[Any], arbol: ArbolCampos, _padre: Optional[Any] = None) -> List[Any]:
+    """Deriva opciones de carga a partir de un árbol de campos.
+
+    Las relaciones escalares (many-to-one) se cargan con ``joinedload`` y las
+    colecciones con ``selectinload``, para no multiplicar filas. Si el árbol
+    de una relación incluye columnas, se limita la carga con ``load_only``.
+    Los campos que no son atributos mapeados (propiedades, ``__typename``...)
+    se ignoran.
+    """
+    mapper = inspect(modelo)
+    opciones = []
+
+    if _padre is None:
+        columnas = _columnas(modelo, arbol)
+        if columnas:
+            opciones.append(load_only(*columnas))
+
+    for clave, subarbol in arbol.items():
+        prop = mapper.attrs.get(clave)
+        if not isinstance(prop, RelationshipProperty):
+            continue
+
+        atributo = getattr(modelo, clave)
+        if _padre is None:
+            carga = selectinload(atributo) if prop.uselist else joinedload(atributo)
+        else:
+            carga = _padre.selectinload(atributo) if prop.uselist else _padre.joinedload(atributo)
+
+        relacionado = prop.mapper.class_
+        columnas = _columnas(relacionado, subarbol or {})
+        if columnas:
+            carga = carga.load_only(*columnas)
+
+        hijas = opciones_carga(relacionado, subarbol or {}, _padre=carga)
+        opciones.extend(hijas if hijas else [carga])
+
+    return opciones
+
+
+def _columnas(modelo: Type[Any], arbol: ArbolCampos) -> List[Any]:
+    """Columnas del árbol, más las claves necesarias para enlazar relaciones."""
+    mapper = inspect(modelo)
+    nombres = [
+        clave for clave in arbol
+        if isinstance(mapper.attrs.get(clave), ColumnProperty)
+    ]
+    if not nombres:
+        return []
+
+    # Incluir PK y FKs locales de las relaciones pedidas
+    nombres.extend(col.key for col in mapper.primary_key)
+    for clave in arbol:
+        prop = mapper.attrs.get(clave)
+        if isinstance(prop, RelationshipProperty):
+            nombres.extend(
+                mapper.get_property_by_column(col).key
+                for col in prop.local_columns
+                if col in mapper.columns.values()
+            )
+
+    return [getattr(modelo, nombre) for nombre in dict.fromkeys(nombres)]
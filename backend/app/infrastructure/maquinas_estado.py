@@ -0,0 +1,138 @@
+"""Máquinas de estados declarativas de las entidades.
+
+Cada modelo con estado declara sus transiciones permitidas como atributo
+de clase, por códigos de estado del catálogo::
+
+    class OrdenCobro(BaseModel):
+        TRANSICIONES = (
+            Transicion('PENDIENTE', ('PROCESADA', 'FALLIDA'),
+                       valores={'fecha_procesamiento': func.current_date()}),
+            Transicion('PENDIENTE', 'ANULADA'),
+        )
+
+- ``guarda``: función ``entidad -> bool`` que además debe cumplirse.
+- ``efecto``: función ``entidad -> None`` que se ejecuta tras el cambio.
+- ``valores``: columnas que se fijan junto con el estado (admiten
+  expresiones SQL); se aplican también en los cambios masivos.
+
+La primera vez que se usa un modelo, sus transiciones se compilan en una
+tabla ``(modelo, origen, destino) -> Transicion``, así que validar una
+transición es una búsqueda en un dict. Las transiciones con guarda o efecto
+necesitan la entidad cargada y no se aplican en los cambios masivos.
+
+La columna de estado de cada modelo (la FK a un catálogo de estados) se
+resuelve una vez por clase con ``campo_estado``.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy.inspection import inspect
+
+from .registro_estados import registro_estados
+
+Codigos = Union[str, Sequence[str]]
+
+
+@dataclass(frozen=True, eq=False)
+class Transicion:
+    """Transición permitida de uno o varios estados origen a uno o varios destino."""
+    origen: Codigos
+    destino: Codigos
+    guarda: Optional[Callable[[Any], bool]] = None
+    efecto: Optional[Callable[[Any], None]] = None
+    valores: Optional[Dict[str, Any]] = None
+
+    @property
+    def masiva(self) -> bool:
+        """Si puede aplicarse con un UPDATE sin cargar las entidades."""
+        return self.guarda is None and self.efecto is None
+
+
+@dataclass(frozen=True)
+class CampoEstado:
+    """Atributo de estado de un modelo y tabla del catálogo al que apunta."""
+    atributo: str
+    tabla: str
+
+
+class MaquinaEstados:
+    """Transiciones compiladas de un modelo."""
+
+    def __init__(self, modelo: type, campo: CampoEstado, transiciones: Iterable[Transicion]):
+        self.modelo = modelo
+        self.campo = campo
+        self._destinos: Dict[str, List[Transicion]] = {}
+        for transicion in transiciones:
+            for origen in _codigos(transicion.origen):
+                for destino in _codigos(transicion.destino):
+                    _TABLA[(modelo, origen, destino)] = transicion
+                    if transicion not in self._destinos.setdefault(destino, []):
+                        self._destinos[destino].append(transicion)
+
+    def transicion(self, origen: str, destino: str) -> Optional[Transicion]:
+        return _TABLA.get((self.modelo, origen, destino))
+
+    def permite(self, entidad: Any, origen: str, destino: str) -> bool:
+        transicion = _TABLA.get((self.modelo, origen, destino))
+        if transicion is None:
+            return False
+        return transicion.guarda is None or bool(transicion.guarda(entidad))
+
+    def masivas(self, destino: str) -> List[Tuple[Transicion, FrozenSet[str]]]:
+        """Transiciones aplicables en bloque hacia ``destino`` con sus orígenes."""
+        return [
+            (transicion, frozenset(_codigos(transicion.origen)))
+            for transicion in self._destinos.get(destino, [])
+            if transicion.masiva
+        ]
+
+
+# (modelo, origen, destino) -> Transicion, de todas las máquinas compiladas
+_TABLA: Dict[Tuple[type, str, str], Transicion] = {}
+
+_maquinas: Dict[type, Optional[MaquinaEstados]] = {}
+_campos: Dict[type, Optional[CampoEstado]] = {}
+
+
+def campo_estado(modelo: type) -> Optional[CampoEstado]:
+    """Columna de ``modelo`` con FK a un catálogo de estados (cacheado por clase)."""
+    try:
+        return _campos[modelo]
+    except KeyError:
+        pass
+
+    campo = None
+    for prop in inspect(modelo).column_attrs:
+        for columna in prop.columns:
+            for fk in columna.foreign_keys:
+                tabla = fk.target_fullname.split('.')[0]
+                if registro_estados.es_tabla_estados(tabla):
+                    campo = CampoEstado(prop.key, tabla)
+                    break
+            if campo:
+                break
+        if campo:
+            break
+    _campos[modelo] = campo
+    return campo
+
+
+def maquina_de(modelo: type) -> Optional[MaquinaEstados]:
+    """Máquina de estados de ``modelo``, o None si no declara ``TRANSICIONES``."""
+    try:
+        return _maquinas[modelo]
+    except KeyError:
+        pass
+
+    maquina = None
+    transiciones = getattr(modelo, 'TRANSICIONES', None)
+    campo = campo_estado(modelo)
+    if transiciones and campo:
+        maquina = MaquinaEstados(modelo, campo, transiciones)
+    _maquinas[modelo] = maquina
+    return maquina
+
+
+def _codigos(codigos: Codigos) -> Tuple[str, ...]:
+    return (codigos,) if isinstance(codigos, str) else tuple(codigos)
@@ -0,0 +1,222 @@
+"""Registro en memoria de los catálogos de estados.
+
+Los catálogos de estados (``estados_cuota``, ``estados_remesa``...) se
+identifican por UUID y casi no cambian, pero resolver un código de estado
+exigía una consulta. El registro los carga al arrancar y permite resolverlos
+de forma síncrona, incluso desde métodos de modelo::
+
+    from ....infrastructure.registro_estados import registro_estados
+
+    self.estado_id = registro_estados.id_de('estados_cuota', 'COBRADA')
+
+El código de un estado es su columna ``codigo`` si el catálogo la tiene y, si
+no, el ``nombre`` normalizado ('En Curso' -> 'EN_CURSO', 'Leído' -> 'LEIDO').
+``es_final`` sale de la columna del mismo nombre o, en su defecto, de
+``CODIGOS_FINALES`` del modelo; el estado inicial es el activo de menor
+``orden``.
+
+El registro se recarga cuando otra transacción confirma cambios en un
+catálogo: los triggers de la migración ``i8j9k0l1m2n3`` emiten ``NOTIFY`` en
+``CANAL_ESTADOS`` (para todos los procesos) y, en este proceso, una función
+de ``cambios_sesion`` programa la recarga en cuanto se confirma el cambio.
+"""
+
+import logging
+import re
+import unicodedata
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
+
+from sqlalchemy import select
+
+from .cambios_sesion import Cambios, al_confirmar
+
+logger = logging.getLogger(__name__)
+
+CANAL_ESTADOS = 'estados_cambios'
+
+
+@dataclass(frozen=True)
+class InfoEstado:
+    """Datos de un estado que se consultan sin ir a la base de datos."""
+    id: uuid.UUID
+    tabla: str
+    codigo: str
+    nombre: str
+    orden: int
+    activo: bool
+    es_inicial: bool
+    es_final: bool
+
+
+def codigo_de_nombre(nombre: str) -> str:
+    """Código de un estado a partir de su nombre: 'En Curso' -> 'EN_CURSO'."""
+    sin_acentos = unicodedata.normalize('NFKD', nombre).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^A-Z0-9]+', '_', sin_acentos.upper()).strip('_')
+
+
+def _catalogos() -> list:
+    """Modelos de los catálogos de estados."""
+    from ..domains.core.models import estados
+    from ..domains.miembros.models.estado_miembro import EstadoMiembro
+    from ..domains.financiero.models.presupuesto import EstadoPlanificacion
+    from ..domains.actividades.models.catalogos import EstadoPropuesta
+
+    return [
+        estados.EstadoCuota,
+        estados.EstadoCampania,
+        estados.EstadoTarea,
+        estados.EstadoActividad,
+        estados.EstadoParticipante,
+        estados.EstadoOrdenCobro,
+        estados.EstadoRemesa,
+        estados.EstadoDonacion,
+        estados.EstadoNotificacion,
+        EstadoMiembro,
+        EstadoPlanificacion,
+        EstadoPropuesta,
+    ]
+
+
+ModeloOTabla = Union[type, str]
+
+
+class RegistroEstados:
+    """Estados de todos los catálogos indexados por tabla/código y por id."""
+
+    def __init__(self):
+        self._por_codigo: Dict[str, Dict[str, InfoEstado]] = {}
+        self._por_id: Dict[uuid.UUID, InfoEstado] = {}
+        self._tablas: Optional[set] = None
+        self.cargado = False
+
+    # === Consulta (síncrona, sin E/S) ===
+
+    def buscar(self, catalogo: ModeloOTabla, codigo: str) -> Optional[InfoEstado]:
+        """Estado ``codigo`` del catálogo (modelo o nombre de tabla), o None."""
+        return self._por_codigo.get(_tabla(catalogo), {}).get(codigo.upper())
+
+    def id_de(self, catalogo: ModeloOTabla, codigo: str) -> uuid.UUID:
+        """UUID del estado ``codigo``; ValueError si no existe o no hay registro cargado."""
+        estado = self.buscar(catalogo, codigo)
+        if estado is None:
+            if not self.cargado:
+                raise ValueError("El registro de estados no está cargado")
+            raise ValueError(f"Estado {codigo} no encontrado en {_tabla(catalogo)}")
+        return estado.id
+
+    def estado(self, estado_id: Any) -> Optional[InfoEstado]:
+        """Estado por su UUID (de cualquier catálogo)."""
+        if estado_id is None:
+            return None
+        if not isinstance(estado_id, uuid.UUID):
+            try:
+                estado_id = uuid.UUID(str(estado_id))
+            except ValueError:
+                return None
+        return self._por_id.get(estado_id)
+
+    def codigo_de(self, estado_id: Any) -> Optional[str]:
+        estado = self.estado(estado_id)
+        return estado.codigo if estado else None
+
+    def estados(self, catalogo: ModeloOTabla, solo_activos: bool = True) -> List[InfoEstado]:
+        """Estados del catálogo ordenados por ``orden``."""
+        return [
+            estado for estado in self._por_codigo.get(_tabla(catalogo), {}).values()
+            if estado.activo or not solo_activos
+        ]
+
+    def inicial(self, catalogo: ModeloOTabla) -> Optional[InfoEstado]:
+        for estado in self._por_codigo.get(_tabla(catalogo), {}).values():
+            if estado.es_inicial:
+                return estado
+        return None
+
+    def es_tabla_estados(self, tabla: str) -> bool:
+        if self._tablas is None:
+            self._tablas = {modelo.__tablename__ for modelo in _catalogos()}
+        return tabla in self._tablas
+
+    # === Carga ===
+
+    async def cargar(self, session_factory=None) -> None:
+        """Carga todos los catálogos de estados desde la base de datos."""
+        from ..core.database import async_session
+
+        por_codigo: Dict[str, Dict[str, InfoEstado]] = {}
+        por_id: Dict[uuid.UUID, InfoEstado] = {}
+        async with (session_factory or async_session)() as session:
+            for modelo in _catalogos():
+                filas = (await session.execute(
+                    select(modelo).where(modelo.eliminado == False).order_by(modelo.orden)
+                )).scalars().all()
+                estados_tabla = _info_catalogo(modelo, filas)
+                por_codigo[modelo.__tablename__] = estados_tabla
+                for estado in estados_tabla.values():
+                    por_id[estado.id] = estado
+
+        # Sustitución atómica: los lectores ven el registro anterior o el nuevo
+        self._por_codigo = por_codigo
+        self._por_id = por_id
+        self.cargado = True
+        logger.info(f"Registro de estados cargado: {len(por_id)} estados en {len(por_codigo)} catálogos")
+
+    async def asegurar_cargado(self) -> None:
+        if not self.cargado:
+            await self.cargar()
+
+    async def iniciar(self) -> None:
+        """Carga el registro y se suscribe a los avisos de cambio. No falla si no hay base de datos."""
+        from .services.escucha_postgres import get_escucha_postgres
+
+        try:
+            await self.cargar()
+        except Exception as e:
+            logger.error(f"No se pudo cargar el registro de estados: {e}")
+        get_escucha_postgres().suscribir(CANAL_ESTADOS, self.cargar)
+
+
+def _tabla(catalogo: ModeloOTabla) -> str:
+    return catalogo if isinstance(catalogo, str) else catalogo.__tablename__
+
+
+def _info_catalogo(modelo: type, filas: list) -> Dict[str, InfoEstado]:
+    """``{codigo: InfoEstado}`` de un catálogo, en orden."""
+    tabla = modelo.__tablename__
+    columnas = modelo.__table__.c
+    finales = getattr(modelo, 'CODIGOS_FINALES', frozenset())
+    inicial = next((fila.id for fila in filas if fila.activo), None)
+
+    estados_tabla: Dict[str, InfoEstado] = {}
+    for fila in filas:
+        codigo = fila.codigo if 'codigo' in columnas else codigo_de_nombre(fila.nombre)
+        es_final = fila.es_final if 'es_final' in columnas else codigo in finales
+        estados_tabla[codigo] = InfoEstado(
+            id=fila.id,
+            tabla=tabla,
+            codigo=codigo,
+            nombre=fila.nombre,
+            orden=fila.orden,
+            activo=fila.activo,
+            es_inicial=fila.id == inicial,
+            es_final=bool(es_final),
+        )
+    return estados_tabla
+
+
+registro_estados = RegistroEstados()
+
+
+# === Recarga local al confirmar cambios en un catálogo ===
+
+@al_confirmar
+def _recargar_tras_commit(cambios: Cambios) -> None:
+    if any(registro_estados.es_tabla_estados(tabla) for tabla in cambios.tablas):
+        from .services.escucha_postgres import get_escucha_postgres
+        try:
+            get_escucha_postgres().programar_recarga(CANAL_ESTADOS)
+        except RuntimeError:
+            # Sin bucle de eventos (scripts síncronos): se recargará con el NOTIFY
+            pass
@@ -0,0 +1,158 @@
+"""Matriz de permisos rol -> transacciones en memoria.
+
+``requiere_transaccion`` consultaba ``rol_transaccion`` (JOIN con roles y
+transacciones) en una sesión nueva en cada llamada a un resolver. El
+registro carga la matriz completa una vez (``{codigo de rol: frozenset de
+codigos de transacción activas}``) y autorizar pasa a ser una búsqueda en
+conjuntos, sin consultas::
+
+    registro_permisos.permite(['TESORERO'], 'CREAR_REMESA')
+
+Se recarga cuando una transacción de este proceso confirma cambios en roles,
+transacciones o sus asignaciones (listener de sesión), cuando llega un
+aviso en ``CANAL_PERMISOS`` (el trigger que lo emite se añadirá con la
+migración que cree esas tablas) y, para acotar cuánto tarda otro worker en
+ver un permiso revocado, cada ``RECARGA_PERIODICA`` segundos.
+
+Los modelos ``Rol``, ``Transaccion`` y ``RolTransaccion`` todavía no existen
+en ``app.models``. Mientras falten, el registro no se carga ni se suscribe a
+nada (ni listeners de sesión ni ``LISTEN``) y ``permite`` deniega todo, como
+fallaba antes el decorador.
+"""
+
+import asyncio
+import logging
+from typing import Dict, FrozenSet, Iterable, Optional
+
+from sqlalchemy import select
+
+from .cambios_sesion import Cambios, al_confirmar
+
+logger = logging.getLogger(__name__)
+
+CANAL_PERMISOS = 'permisos_cambios'
+
+# Recarga completa de respaldo mientras no haya trigger que emita avisos
+RECARGA_PERIODICA = 300
+
+
+_MODELOS: Optional[tuple] = None
+
+
+def _modelos() -> Optional[tuple]:
+    """``(Rol, Transaccion, RolTransaccion)`` o None si no existen (se comprueba una vez)."""
+    global _MODELOS
+    if _MODELOS is None:
+        try:
+            from ..models import Rol, RolTransaccion, Transaccion
+            _MODELOS = (Rol, Transaccion, RolTransaccion)
+        except ImportError:
+            _MODELOS = ()
+    return _MODELOS or None
+
+
+class RegistroPermisos:
+    """Transacciones permitidas a cada rol."""
+
+    def __init__(self):
+        self._por_rol: Dict[str, FrozenSet[str]] = {}
+        self._tablas: FrozenSet[str] = frozenset()
+        self._tarea_recarga: Optional[asyncio.Task] = None
+        self.cargado = False
+
+    @property
+    def disponible(self) -> bool:
+        """Si existen los modelos de roles y transacciones."""
+        return _modelos() is not None
+
+    # === Consulta (síncrona, sin E/S) ===
+
+    def transacciones(self, rol: str) -> FrozenSet[str]:
+        return self._por_rol.get(rol, frozenset())
+
+    def permite(self, roles: Iterable[str], codigo_transaccion: str) -> bool:
+        """Si alguno de ``roles`` tiene permiso para ``codigo_transaccion``."""
+        por_rol = self._por_rol
+        return any(codigo_transaccion in por_rol.get(rol, ()) for rol in roles)
+
+    def es_tabla_permisos(self, tabla: str) -> bool:
+        return tabla in self._tablas
+
+    # === Carga ===
+
+    async def cargar(self, session_factory=None) -> None:
+        """Carga la matriz completa desde la base de datos."""
+        from ..core.database import async_session
+
+        modelos = _modelos()
+        if modelos is None:
+            return
+        Rol, Transaccion, RolTransaccion = modelos
+        async with (session_factory or async_session)() as session:
+            filas = (await session.execute(
+                select(Rol.codigo, Transaccion.codigo)
+                .select_from(RolTransaccion)
+                .join(Rol, RolTransaccion.rol_id == Rol.id)
+                .join(Transaccion, RolTransaccion.transaccion_id == Transaccion.id)
+                .where(Transaccion.activo == True)
+            )).all()
+
+        por_rol: Dict[str, set] = {}
+        for rol, transaccion in filas:
+            por_rol.setdefault(rol, set()).add(transaccion)
+
+        # Sustitución atómica: los lectores ven la matriz anterior o la nueva
+        self._por_rol = {rol: frozenset(transacciones) for rol, transacciones in por_rol.items()}
+        self.cargado = True
+        logger.info(f"Matriz de permisos cargada: {len(filas)} permisos en {len(por_rol)} roles")
+
+    async def asegurar_cargado(self) -> None:
+        if not self.cargado and self.disponible:
+            await self.cargar()
+
+    async def iniciar(self) -> None:
+        """Carga la matriz y se suscribe a los avisos de cambio. No falla si no hay base de datos."""
+        from .services.escucha_postgres import get_escucha_postgres
+
+        modelos = _modelos()
+        if modelos is None:
+            logger.warning("Sin modelos de roles/transacciones: requiere_transaccion denegará todos los permisos")
+            return
+        self._tablas = frozenset(modelo.__tablename__ for modelo in modelos)
+        al_confirmar(_recargar_tras_commit)
+        try:
+            await self.cargar()
+        except Exception as e:
+            logger.error(f"No se pudo cargar la matriz de permisos: {e}")
+        get_escucha_postgres().suscribir(CANAL_PERMISOS, self.cargar)
+        if self._tarea_recarga is None:
+            self._tarea_recarga = asyncio.create_task(self._recargar_periodicamente())
+
+    async def detener(self) -> None:
+        tarea, self._tarea_recarga = self._tarea_recarga, None
+        if tarea is not None:
+            tarea.cancel()
+
+    async def _recargar_periodicamente(self) -> None:
+        while True:
+            await asyncio.sleep(RECARGA_PERIODICA)
+            try:
+                await self.cargar()
+            except Exception as e:
+                logger.error(f"Error en la recarga periódica de la matriz de permisos: {e}")
+
+
+registro_permisos = RegistroPermisos()
+
+
+# === Recarga local al confirmar cambios en la matriz ===
+# Se registra en ``iniciar`` solo si existen las tablas.
+
+def _recargar_tras_commit(cambios: Cambios) -> None:
+    if any(registro_permisos.es_tabla_permisos(tabla) for tabla in cambios.tablas):
+        from .services.escucha_postgres import get_escucha_postgres
+        try:
+            get_escucha_postgres().programar_recarga(CANAL_PERMISOS)
+        except RuntimeError:
+            # Sin bucle de eventos (scripts síncronos): se recargará con el NOTIFY
+            pass
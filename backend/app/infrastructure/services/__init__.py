@@ -1,7 +1,12 @@
 """Servicios de infraestructura."""
 
 from .encriptacion_service import EncriptacionService, get_encriptacion_service
-from .cache_service import CacheService, get_cache_service, generar_cache_key, generar_cache_key_modelo
+from .cache_memoria import CacheMemoria
+from .cache_service import CacheService, get_cache_service, generar_cache_key, generar_cache_key_modelo, tags_modelo
+from .limitador_tasa import Limite, LimitadorTasa, get_limitador_tasa
+from . import cache_modelos  # noqa: F401  (registra los listeners de invalidación)
+from .lista_bloqueo_ip import ListaBloqueoIP, get_lista_bloqueo_ip
+from .registro_configuracion import RegistroConfiguracion, get_registro_configuracion
 from .configuracion_service import ConfiguracionService
 from .seguridad_service import SeguridadService, es_ip_interna, calcular_intensidad_ataque
 from .auditoria_service import AuditoriaService
@@ -11,10 +16,19 @@ from .notificacion_service import NotificacionService
 __all__ = [
     'EncriptacionService',
     'get_encriptacion_service',
+    'CacheMemoria',
     'CacheService',
     'get_cache_service',
     'generar_cache_key',
     'generar_cache_key_modelo',
+    'tags_modelo',
+    'Limite',
+    'LimitadorTasa',
+    'get_limitador_tasa',
+    'ListaBloqueoIP',
+    'get_lista_bloqueo_ip',
+    'RegistroConfiguracion',
+    'get_registro_configuracion',
     'ConfiguracionService',
     'SeguridadService',
     'es_ip_interna',
@@ -0,0 +1,121 @@
+"""Caché cercana (L1 por proceso) delante de Redis.
+
+Con varios workers, cada lectura de ``CacheService`` sería un viaje a Redis.
+En modo caché cercana, las claves leídas se guardan además en una
+``CacheMemoria`` pequeña del proceso y se sirven desde ahí. Para que los
+workers no sirvan copias obsoletas, toda escritura (set, delete, increment,
+flush) publica las claves afectadas en el canal ``CANAL_INVALIDACION``; un
+hilo suscriptor en cada proceso las elimina de su L1.
+
+Garantías:
+
+- El TTL de L1 es corto (``ttl_l1``) y acota el tiempo máximo de una copia
+  obsoleta si se pierde un mensaje.
+- Nunca supera el TTL que le queda a la clave en Redis (se lee con ``PTTL``
+  en el mismo viaje que el valor): la caducidad en Redis no publica
+  invalidación, así que una clave de pocos segundos no se sirve caducada.
+- Si la suscripción se cae, L1 se vacía y deja de usarse hasta reconectar.
+- Una lectura que va a Redis solo rellena L1 si no ha llegado ninguna
+  invalidación mientras tanto (contador de generación), para no guardar un
+  valor que otro worker acaba de cambiar.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Iterable, Optional
+
+from .cache_memoria import CacheMemoria
+
+logger = logging.getLogger(__name__)
+
+CANAL_INVALIDACION = 'cache:invalidacion'
+
+# Mensaje que invalida todo L1 (flush_all)
+TODAS = '*'
+
+# Espera antes de reintentar la suscripción tras un error
+ESPERA_RECONEXION = 1.0
+
+AUSENTE = object()
+
+
+class CacheCercana:
+    """L1 del proceso invalidada por pub/sub de Redis."""
+
+    def __init__(self, redis_client: Any, ttl_l1: int = 30, max_entradas: int = 2_000,
+                 max_bytes: int = 16 * 1024 * 1024):
+        self.redis_client = redis_client
+        self.ttl_l1 = ttl_l1
+        self.l1 = CacheMemoria(max_entradas=max_entradas, max_bytes=max_bytes)
+        self.generacion = 0
+        self._activa = False
+        self._parar = threading.Event()
+        self._hilo = threading.Thread(target=self._escuchar, name="cache-invalidacion", daemon=True)
+        self._hilo.start()
+
+    def obtener(self, key: str) -> Any:
+        """Valor en L1 o ``AUSENTE``."""
+        if not self._activa:
+            return AUSENTE
+        return self.l1.get(key, AUSENTE)
+
+    def guardar(self, key: str, valor: Any, generacion: int, pttl: Optional[int] = None) -> None:
+        """Rellena L1 con un valor leído de Redis en la ``generacion`` dada.
+
+        ``pttl`` es el ``PTTL`` de la clave en Redis (ms; -1 sin caducidad,
+        -2 si ya no existe); la copia en L1 no vive más que la clave.
+        """
+        if not self._activa or generacion != self.generacion:
+            return
+        ttl = self.ttl_l1
+        if pttl is not None and pttl != -1:
+            if pttl <= 0:
+                return
+            ttl = min(ttl, pttl / 1000)
+        self.l1.set(key, valor, ttl)
+
+    def invalidar_local(self, keys: Iterable[str]) -> None:
+        self.generacion += 1
+        for key in keys:
+            if key == TODAS:
+                self.l1.clear()
+            else:
+                self.l1.delete(key)
+
+    @staticmethod
+    def mensaje(keys: Iterable[str]) -> str:
+        """Cuerpo del mensaje de invalidación (claves separadas por saltos de línea)."""
+        return '\n'.join(keys)
+
+    def estadisticas(self) -> dict:
+        return {'activa': self._activa, **self.l1.estadisticas()}
+
+    def detener(self) -> None:
+        self._parar.set()
+
+    def _escuchar(self) -> None:
+        while not self._parar.is_set():
+            pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(CANAL_INVALIDACION)
+                self._activa = True
+                while not self._parar.is_set():
+                    mensaje = pubsub.get_message(timeout=1.0)
+                    if mensaje and mensaje['type'] == 'message':
+                        datos = mensaje['data']
+                        if isinstance(datos, bytes):
+                            datos = datos.decode('utf-8')
+                        self.invalidar_local(datos.split('\n'))
+            except Exception as e:
+                logger.error(f"Suscripción de invalidación de caché caída: {e}")
+            finally:
+                # Sin suscripción no podemos saber qué ha cambiado
+                self._activa = False
+                self.invalidar_local([TODAS])
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+            if not self._parar.is_set():
+                time.sleep(ESPERA_RECONEXION)
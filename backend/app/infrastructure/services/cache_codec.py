@@ -0,0 +1,216 @@
+"""Codecs de serialización de los valores guardados en Redis.
+
+Formato de un valor codificado::
+
+    <id codec: 1 byte> <compresión: 1 byte> <payload>
+
+- ``id codec``: ``M`` msgpack, ``J`` orjson, ``P`` pickle. Un valor escrito
+  con otro codec se decodifica con el suyo si está disponible; si no, se
+  trata como fallo de caché.
+- ``compresión``: ``Z`` zstd, ``-`` sin comprimir. Solo se comprime por
+  encima de ``umbral_compresion`` bytes y si ``zstandard`` está instalado.
+
+Los enteros se guardan en ASCII sin cabecera, igual que los deja
+``INCR``, para que contadores e ``increment`` compartan representación.
+
+msgpack conserva ``datetime``, ``date``, ``time``, ``UUID``, ``Decimal`` y
+``set`` mediante tipos extendidos; los ``Enum`` se guardan por su valor.
+orjson es más rápido pero devuelve fechas, ``UUID`` y ``Decimal`` como str.
+
+msgpack y zstandard son opcionales (extra ``cache`` de pyproject).
+"""
+
+import enum
+import logging
+from abc import ABC, abstractmethod
+import pickle
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Valor no decodificable (se trata como fallo de caché)
+INVALIDO = object()
+
+SIN_COMPRIMIR = b'-'
+ZSTD = b'Z'
+
+UMBRAL_COMPRESION = 1024
+
+
+class Codec(ABC):
+    """Serializa valores Python a bytes y viceversa."""
+
+    id: bytes = b''
+
+    @abstractmethod
+    def dumps(self, valor: Any) -> bytes:
+        """Codifica ``valor``."""
+
+    @abstractmethod
+    def loads(self, datos: bytes) -> Any:
+        """Decodifica lo producido por ``dumps``."""
+
+
+class CodecPickle(Codec):
+    id = b'P'
+
+    def dumps(self, valor: Any) -> bytes:
+        return pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, datos: bytes) -> Any:
+        return pickle.loads(datos)
+
+
+# Tipos extendidos de msgpack
+_EXT_DATETIME, _EXT_DATE, _EXT_TIME, _EXT_UUID, _EXT_DECIMAL, _EXT_SET = range(1, 7)
+
+
+class CodecMsgpack(Codec):
+    id = b'M'
+
+    def __init__(self):
+        import msgpack
+        self._msgpack = msgpack
+
+    def dumps(self, valor: Any) -> bytes:
+        return self._msgpack.packb(valor, default=self._default, use_bin_type=True)
+
+    def loads(self, datos: bytes) -> Any:
+        return self._msgpack.unpackb(datos, ext_hook=self._ext_hook, raw=False, strict_map_key=False)
+
+    def _default(self, valor: Any) -> Any:
+        ExtType = self._msgpack.ExtType
+        if isinstance(valor, datetime):
+            return ExtType(_EXT_DATETIME, valor.isoformat().encode())
+        if isinstance(valor, date):
+            return ExtType(_EXT_DATE, valor.isoformat().encode())
+        if isinstance(valor, time):
+            return ExtType(_EXT_TIME, valor.isoformat().encode())
+        if isinstance(valor, uuid.UUID):
+            return ExtType(_EXT_UUID, valor.bytes)
+        if isinstance(valor, Decimal):
+            return ExtType(_EXT_DECIMAL, str(valor).encode())
+        if isinstance(valor, (set, frozenset)):
+            return ExtType(_EXT_SET, self.dumps(list(valor)))
+        if isinstance(valor, enum.Enum):
+            return valor.value
+        raise TypeError(f"Tipo no serializable en caché: {type(valor).__name__}")
+
+    def _ext_hook(self, codigo: int, datos: bytes) -> Any:
+        if codigo == _EXT_DATETIME:
+            return datetime.fromisoformat(datos.decode())
+        if codigo == _EXT_DATE:
+            return date.fromisoformat(datos.decode())
+        if codigo == _EXT_TIME:
+            return time.fromisoformat(datos.decode())
+        if codigo == _EXT_UUID:
+            return uuid.UUID(bytes=datos)
+        if codigo == _EXT_DECIMAL:
+            return Decimal(datos.decode())
+        if codigo == _EXT_SET:
+            return set(self.loads(datos))
+        return self._msgpack.ExtType(codigo, datos)
+
+
+class CodecOrjson(Codec):
+    id = b'J'
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+        self._opciones = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, valor: Any) -> bytes:
+        return self._orjson.dumps(valor, default=self._default, option=self._opciones)
+
+    def loads(self, datos: bytes) -> Any:
+        return self._orjson.loads(datos)
+
+    @staticmethod
+    def _default(valor: Any) -> Any:
+        if isinstance(valor, Decimal):
+            return str(valor)
+        if isinstance(valor, (set, frozenset)):
+            return list(valor)
+        if isinstance(valor, enum.Enum):
+            return valor.value
+        raise TypeError(f"Tipo no serializable en caché: {type(valor).__name__}")
+
+
+_FABRICAS: Dict[str, Callable[[], Codec]] = {
+    'msgpack': CodecMsgpack,
+    'orjson': CodecOrjson,
+    'pickle': CodecPickle,
+}
+
+
+class Serializador:
+    """Codifica valores con un codec y compresión opcional."""
+
+    def __init__(self, codec: Codec, umbral_compresion: Optional[int] = UMBRAL_COMPRESION):
+        self.codec = codec
+        self.umbral_compresion = umbral_compresion
+        self._codecs: Dict[bytes, Codec] = {codec.id: codec}
+        self._compresor = None
+        self._descompresor = None
+        try:
+            import zstandard
+            self._compresor = zstandard.ZstdCompressor(level=3)
+            self._descompresor = zstandard.ZstdDecompressor()
+        except ImportError:
+            pass
+
+    def codificar(self, valor: Any) -> bytes:
+        if isinstance(valor, int) and not isinstance(valor, bool):
+            return str(valor).encode()
+        payload = self.codec.dumps(valor)
+        if (self._compresor is not None and self.umbral_compresion is not None
+                and len(payload) > self.umbral_compresion):
+            return self.codec.id + ZSTD + self._compresor.compress(payload)
+        return self.codec.id + SIN_COMPRIMIR + payload
+
+    def decodificar(self, datos: bytes) -> Any:
+        """Valor decodificado, o ``INVALIDO`` si no se puede leer."""
+        try:
+            if datos[:1].isdigit() or datos[:1] == b'-':
+                return int(datos)
+            codec = self._codec(datos[:1])
+            if codec is None:
+                return INVALIDO
+            payload = datos[2:]
+            if datos[1:2] == ZSTD:
+                if self._descompresor is None:
+                    return INVALIDO
+                payload = self._descompresor.decompress(payload)
+            return codec.loads(payload)
+        except Exception as e:
+            logger.debug(f"Valor de caché no decodificable: {e}")
+            return INVALIDO
+
+    def _codec(self, id_codec: bytes) -> Optional[Codec]:
+        if id_codec not in self._codecs:
+            for fabrica in _FABRICAS.values():
+                if getattr(fabrica, 'id', None) == id_codec:
+                    try:
+                        self._codecs[id_codec] = fabrica()
+                    except ImportError:
+                        self._codecs[id_codec] = None
+                    break
+        return self._codecs.get(id_codec)
+
+
+def crear_codec(nombre: Optional[str] = None) -> Codec:
+    """Crea el codec ``nombre``; por defecto msgpack si está instalado, si no pickle."""
+    if nombre:
+        try:
+            return _FABRICAS[nombre]()
+        except KeyError:
+            raise ValueError(f"Codec de caché desconocido: {nombre}") from None
+    try:
+        return CodecMsgpack()
+    except ImportError:
+        logger.info("msgpack no está instalado, usando pickle para la caché")
+        return CodecPickle()
@@ -0,0 +1,224 @@
+"""Caché en memoria del proceso, acotada y con expiración activa.
+
+Es el nivel L1 de ``CacheService`` (y su único almacén cuando no hay Redis):
+
+- Límite de entradas y de bytes; al superarlo se desalojan las entradas
+  usadas hace más tiempo (LRU sobre ``OrderedDict``, O(1) por operación).
+- Expiración en O(1): cada clave con TTL se apunta en el cubo del segundo
+  en que caduca (``{segundo: {claves}}``). Un hilo de barrido recorre los
+  cubos ya vencidos cada ``intervalo_barrido`` segundos, de modo que las
+  claves que nadie vuelve a leer también se liberan. Una lectura de una
+  clave caducada la elimina en el momento.
+- Estadísticas de aciertos, fallos, desalojos y expiraciones.
+
+El tamaño de cada valor es una estimación barata: ``sys.getsizeof`` del
+valor más el de sus elementos inmediatos si es una colección. No sigue
+los objetos anidados, así que el límite de bytes es orientativo, pero
+guardar una entrada no serializa el valor.
+"""
+
+import math
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+# Límites por defecto
+MAX_ENTRADAS = 10_000
+MAX_BYTES = 64 * 1024 * 1024
+INTERVALO_BARRIDO = 30
+
+
+@dataclass
+class EstadisticasCache:
+    """Contadores de uso de la caché en memoria."""
+    aciertos: int = 0
+    fallos: int = 0
+    desalojos: int = 0
+    expiraciones: int = 0
+    entradas: int = 0
+    bytes: int = 0
+
+    def como_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class CacheMemoria:
+    """Caché LRU acotada, thread-safe, con TTL por clave."""
+
+    def __init__(self, max_entradas: int = MAX_ENTRADAS, max_bytes: int = MAX_BYTES,
+                 intervalo_barrido: float = INTERVALO_BARRIDO,
+                 al_desalojar: Optional[Callable[[str], None]] = None):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.intervalo_barrido = intervalo_barrido
+        self.al_desalojar = al_desalojar
+
+        # clave -> (valor, tamaño, expira_en | None); el orden es el de uso (LRU primero)
+        self._datos: "OrderedDict[str, Tuple[Any, int, Optional[float]]]" = OrderedDict()
+        # segundo de expiración -> claves que caducan en ese segundo
+        self._cubos: Dict[int, Set[str]] = {}
+        self._ultimo_barrido = int(time.monotonic())
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._stats = EstadisticasCache()
+        self._hilo_barrido: Optional[threading.Thread] = None
+        self._parar = threading.Event()
+
+    # === API ===
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entrada = self._datos.get(key)
+            if entrada is None:
+                self._stats.fallos += 1
+                return default
+            valor, _, expira = entrada
+            if expira is not None and time.monotonic() >= expira:
+                self._eliminar(key)
+                self._stats.expiraciones += 1
+                self._stats.fallos += 1
+                return default
+            self._datos.move_to_end(key)
+            self._stats.aciertos += 1
+            return valor
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        tamano = _estimar_tamano(value)
+        if tamano > self.max_bytes:
+            return False
+        expira = time.monotonic() + ttl if ttl else None
+
+        with self._lock:
+            if key in self._datos:
+                self._eliminar(key)
+            self._datos[key] = (value, tamano, expira)
+            self._bytes += tamano
+            if expira is not None:
+                self._cubos.setdefault(math.ceil(expira), set()).add(key)
+            self._desalojar()
+
+        if expira is not None:
+            self._asegurar_barrido()
+        return True
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            if key in self._datos:
+                self._eliminar(key)
+                return True
+            return False
+
+    def exists(self, key: str) -> bool:
+        return self.get(key, _AUSENTE) is not _AUSENTE
+
+    def get_ttl(self, key: str) -> int:
+        """Segundos de vida restantes; -1 si la clave no tiene TTL o no existe."""
+        with self._lock:
+            entrada = self._datos.get(key)
+            if entrada is None or entrada[2] is None:
+                return -1
+            return max(0, int(entrada[2] - time.monotonic()))
+
+    def increment(self, key: str, amount: int = 1) -> int:
+        """Incrementa un contador conservando su TTL (como INCRBY en Redis)."""
+        with self._lock:
+            entrada = self._datos.get(key)
+            if entrada is not None and entrada[2] is not None and time.monotonic() >= entrada[2]:
+                self._eliminar(key)
+                entrada = None
+            if entrada is None:
+                self.set(key, amount)
+                return amount
+            valor, tamano, expira = entrada
+            if not isinstance(valor, (int, float)):
+                return 0
+            self._datos[key] = (valor + amount, tamano, expira)
+            self._datos.move_to_end(key)
+            return int(valor + amount)
+
+    def clear(self) -> bool:
+        with self._lock:
+            self._datos.clear()
+            self._cubos.clear()
+            self._bytes = 0
+        return True
+
+    def estadisticas(self) -> Dict[str, int]:
+        with self._lock:
+            self._stats.entradas = len(self._datos)
+            self._stats.bytes = self._bytes
+            return self._stats.como_dict()
+
+    def barrer(self) -> int:
+        """Elimina las claves de los cubos ya vencidos. Devuelve cuántas."""
+        ahora = time.monotonic()
+        limite = int(ahora)
+        eliminadas = 0
+        with self._lock:
+            if len(self._cubos) < limite - self._ultimo_barrido:
+                # Muchos segundos sin barrer: más barato recorrer los cubos existentes
+                vencidos = [s for s in self._cubos if s <= limite]
+            else:
+                vencidos = [s for s in range(self._ultimo_barrido, limite + 1) if s in self._cubos]
+            # Un cubo s <= int(ahora) solo contiene claves con expira <= s <= ahora
+            for segundo in vencidos:
+                for key in list(self._cubos.get(segundo, ())):
+                    self._eliminar(key)
+                    eliminadas += 1
+                self._cubos.pop(segundo, None)
+            self._ultimo_barrido = limite
+            self._stats.expiraciones += eliminadas
+        return eliminadas
+
+    def detener_barrido(self) -> None:
+        self._parar.set()
+
+    # === Internos (con el lock tomado) ===
+
+    def _eliminar(self, key: str) -> None:
+        _, tamano, expira = self._datos.pop(key)
+        self._bytes -= tamano
+        if expira is not None:
+            cubo = self._cubos.get(math.ceil(expira))
+            if cubo is not None:
+                cubo.discard(key)
+                if not cubo:
+                    del self._cubos[math.ceil(expira)]
+
+    def _desalojar(self) -> None:
+        while self._datos and (len(self._datos) > self.max_entradas or self._bytes > self.max_bytes):
+            key = next(iter(self._datos))
+            self._eliminar(key)
+            self._stats.desalojos += 1
+            if self.al_desalojar is not None:
+                self.al_desalojar(key)
+
+    def _asegurar_barrido(self) -> None:
+        if self._hilo_barrido is not None or self.intervalo_barrido <= 0:
+            return
+        with self._lock:
+            if self._hilo_barrido is None:
+                self._hilo_barrido = threading.Thread(
+                    target=self._bucle_barrido, name="cache-memoria-barrido", daemon=True
+                )
+                self._hilo_barrido.start()
+
+    def _bucle_barrido(self) -> None:
+        while not self._parar.wait(self.intervalo_barrido):
+            self.barrer()
+
+
+_AUSENTE = object()
+
+
+def _estimar_tamano(value: Any) -> int:
+    """``getsizeof`` del valor y de sus elementos de primer nivel."""
+    tamano = sys.getsizeof(value)
+    if isinstance(value, dict):
+        tamano += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        tamano += sum(sys.getsizeof(v) for v in value)
+    return tamano
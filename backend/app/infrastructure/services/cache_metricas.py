@@ -0,0 +1,118 @@
+"""Métricas de uso de la caché por prefijo de clave.
+
+El prefijo es el primer segmento de la clave (``generar_cache_key`` lo pone
+delante: ``intentos_login``, ``ip_bloqueada``, ``notificaciones_no_leidas``,
+``catalogo``...). Por prefijo se cuentan aciertos, fallos, escrituras,
+borrados y desalojos de la caché en memoria, y se acumula un histograma de
+latencia por operación. ``exportar()`` devuelve todo en formato de texto de
+Prometheus para el endpoint ``/metrics``.
+"""
+
+import threading
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+# Límites superiores (segundos) de los buckets del histograma de latencia
+BUCKETS_LATENCIA = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Máximo de prefijos distintos; el resto se agrupa en OTROS para acotar la cardinalidad
+MAX_PREFIJOS = 100
+OTROS = 'otros'
+
+_CONTADORES = {
+    'aciertos': 'Lecturas servidas desde la caché',
+    'fallos': 'Lecturas sin valor en la caché',
+    'escrituras': 'Escrituras (set, increment)',
+    'borrados': 'Borrados explícitos',
+    'desalojos': 'Entradas desalojadas de la caché en memoria por falta de espacio',
+}
+
+
+class Histograma:
+    """Histograma acumulado al estilo Prometheus."""
+
+    __slots__ = ('cuentas', 'suma', 'total')
+
+    def __init__(self):
+        self.cuentas = [0] * len(BUCKETS_LATENCIA)
+        self.suma = 0.0
+        self.total = 0
+
+    def observar(self, valor: float) -> None:
+        self.suma += valor
+        self.total += 1
+        for i, limite in enumerate(BUCKETS_LATENCIA):
+            if valor <= limite:
+                self.cuentas[i] += 1
+                break
+
+
+class MetricasCache:
+    """Contadores e histogramas de la caché agrupados por prefijo."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._contadores: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._latencias: Dict[Tuple[str, str], Histograma] = {}
+        self._prefijos: set = set()
+
+    def prefijo(self, key: str) -> str:
+        prefijo = key.split(':', 1)[0]
+        if prefijo in self._prefijos:
+            return prefijo
+        with self._lock:
+            if len(self._prefijos) >= MAX_PREFIJOS:
+                return OTROS
+            self._prefijos.add(prefijo)
+        return prefijo
+
+    def contar(self, contador: str, key: str, cantidad: int = 1) -> None:
+        prefijo = self.prefijo(key)
+        with self._lock:
+            self._contadores[(contador, prefijo)] += cantidad
+
+    def observar(self, operacion: str, key: str, segundos: float) -> None:
+        prefijo = self.prefijo(key)
+        with self._lock:
+            histograma = self._latencias.get((operacion, prefijo))
+            if histograma is None:
+                histograma = self._latencias[(operacion, prefijo)] = Histograma()
+            histograma.observar(segundos)
+
+    def lectura(self, key: str, acierto: bool, segundos: float) -> None:
+        self.contar('aciertos' if acierto else 'fallos', key)
+        self.observar('get', key, segundos)
+
+    def resumen(self) -> Dict[str, Dict[str, int]]:
+        """Contadores por prefijo: ``{prefijo: {contador: valor}}``."""
+        with self._lock:
+            resumen: Dict[str, Dict[str, int]] = defaultdict(dict)
+            for (contador, prefijo), valor in self._contadores.items():
+                resumen[prefijo][contador] = valor
+            return dict(resumen)
+
+    def exportar(self) -> str:
+        """Métricas en formato de texto de Prometheus."""
+        lineas: List[str] = []
+        with self._lock:
+            for contador, ayuda in _CONTADORES.items():
+                nombre = f"cache_{contador}_total"
+                lineas.append(f"# HELP {nombre} {ayuda}")
+                lineas.append(f"# TYPE {nombre} counter")
+                for (c, prefijo), valor in sorted(self._contadores.items()):
+                    if c == contador:
+                        lineas.append(f'{nombre}{{prefijo="{prefijo}"}} {valor}')
+
+            nombre = "cache_latencia_segundos"
+            lineas.append(f"# HELP {nombre} Latencia de las operaciones de caché")
+            lineas.append(f"# TYPE {nombre} histogram")
+            for (operacion, prefijo), histograma in sorted(self._latencias.items()):
+                etiquetas = f'operacion="{operacion}",prefijo="{prefijo}"'
+                acumulado = 0
+                for limite, cuenta in zip(BUCKETS_LATENCIA, histograma.cuentas):
+                    acumulado += cuenta
+                    lineas.append(f'{nombre}_bucket{{{etiquetas},le="{limite}"}} {acumulado}')
+                lineas.append(f'{nombre}_bucket{{{etiquetas},le="+Inf"}} {histograma.total}')
+                lineas.append(f'{nombre}_sum{{{etiquetas}}} {histograma.suma}')
+                lineas.append(f'{nombre}_count{{{etiquetas}}} {histograma.total}')
+        return '\n'.join(lineas) + '\n'
@@ -0,0 +1,55 @@
+"""Invalidación automática de las etiquetas de modelo al confirmar cambios.
+
+Las lecturas por entidad (ficha de miembro, resumen de campaña...) pueden
+cachearse con las etiquetas de ``tags_modelo``::
+
+    await cache.aset(clave, ficha, ttl=600, tags=tags_modelo(Miembro, miembro.id))
+
+Tras cada commit (``cambios_sesion``) se invalidan ``model:<Clase>:<id>`` y
+``model:<Clase>:*`` de cada fila de modelos ``BaseModel`` escrita en la
+transacción, antes de que la petición responda. Los UPDATE/DELETE masivos
+(``session.execute(update(Modelo)...)``, como los de Strawchemy) no
+identifican las filas, así que invalidan además ``model:<Clase>:dml``, que
+llevan todas las entradas por entidad.
+"""
+
+from typing import Awaitable, Optional, Tuple
+
+from ..base_model import BaseModel
+from ..cambios_sesion import Cambios, al_confirmar, en_bucle
+from .cache_service import get_cache_service, tags_modelo
+
+
+def _tags_fila(clase: type, identidad: Optional[Tuple]) -> list:
+    """``model:<Clase>:*`` y ``model:<Clase>:<id>`` de una fila."""
+    if not identidad:
+        return tags_modelo(clase)
+    id_objeto = '-'.join(str(valor) for valor in identidad)
+    return tags_modelo(clase) + tags_modelo(clase, id_objeto)[:1]
+
+
+def _tags(cambios: Cambios) -> set:
+    tags = set()
+    for clase, identidad in cambios.filas:
+        if issubclass(clase, BaseModel):
+            tags.update(_tags_fila(clase, identidad))
+    for clase in cambios.clases_dml:
+        if issubclass(clase, BaseModel):
+            tags.update(tags_modelo(clase))
+    for clase in cambios.masivas:
+        if issubclass(clase, BaseModel):
+            tags.add(f"model:{clase.__name__}:dml")
+    return tags
+
+
+@al_confirmar
+def _invalidar_tras_commit(cambios: Cambios) -> Optional[Awaitable[None]]:
+    tags = _tags(cambios)
+    if not tags:
+        return None
+    if en_bucle():
+        # Dentro de una petición: no bloquear el event loop con el pipeline de Redis
+        return get_cache_service().ainvalidar_tags(tags)
+    # Scripts síncronos: invalidación síncrona
+    get_cache_service().invalidar_tags(tags)
+    return None
@@ -2,36 +2,142 @@
 
 import os
 import json
-import pickle
+import math
+import time
+import uuid
+import random
+import asyncio
 import hashlib
 import logging
-from typing import Any, Optional, Dict, List
-from datetime import datetime, timedelta
+import functools
+from typing import Any, Awaitable, Callable, Iterable, Optional, Dict, List
+
+from .cache_memoria import CacheMemoria, MAX_ENTRADAS, MAX_BYTES, INTERVALO_BARRIDO
+from .cache_cercana import CacheCercana, CANAL_INVALIDACION, TODAS, AUSENTE
+from .cache_codec import Codec, Serializador, crear_codec, INVALIDO, UMBRAL_COMPRESION
+from .cache_metricas import MetricasCache
 
 logger = logging.getLogger(__name__)
 
-# Cache en memoria como fallback
-_memory_cache = {}
-_memory_cache_ttl = {}
+# Métricas por prefijo de clave (compartidas por todas las instancias del proceso)
+metricas = MetricasCache()
+
+# Cache en memoria como fallback (compartida por todas las instancias del proceso)
+_memoria = CacheMemoria(
+    al_desalojar=lambda key: metricas.contar('desalojos', key),
+    max_entradas=int(os.getenv('CACHE_MEMORIA_MAX_ENTRADAS', MAX_ENTRADAS)),
+    max_bytes=int(os.getenv('CACHE_MEMORIA_MAX_BYTES', MAX_BYTES)),
+    intervalo_barrido=float(os.getenv('CACHE_MEMORIA_INTERVALO_BARRIDO', INTERVALO_BARRIDO)),
+)
+
+# Versión del formato de los valores cacheados. Incrementarla cuando cambie
+# la forma de lo que se guarda (o fijar CACHE_VERSION_ESQUEMA en el despliegue).
+VERSION_ESQUEMA = '1'
+
+# Lock distribuido de get_or_compute: duración máxima y espera de los demás procesos
+TTL_LOCK = 30
+ESPERA_LOCK = 5.0
+INTERVALO_ESPERA_LOCK = 0.05
+
+# Marca de los valores guardados por get_or_compute
+_CALCULADO = '__calculado__'
+
+# Etiquetas: cada etiqueta tiene un contador de versión (``tag:<etiqueta>``)
+# que ``invalidar_tags`` incrementa. Un valor etiquetado se guarda con las
+# versiones vigentes al escribirlo y deja de servirse cuando alguna cambia.
+# Los contadores caducan a los TTL_TAG segundos sin invalidaciones, y por eso
+# ninguna entrada etiquetada vive más que eso.
+_ETIQUETADO = '__etiquetado__'
+TTL_TAG = 7 * 24 * 3600
+
+# Borra el lock solo si el token coincide (no liberar el lock de otro proceso)
+_LUA_LIBERAR_LOCK = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def _medido(operacion: str, contador: str):
+    """Cuenta la operación y mide su latencia en las métricas del prefijo de la clave."""
+    def decorador(funcion):
+        if asyncio.iscoroutinefunction(funcion):
+            @functools.wraps(funcion)
+            async def envoltura_async(self, key, *args, **kwargs):
+                inicio = time.perf_counter()
+                try:
+                    return await funcion(self, key, *args, **kwargs)
+                finally:
+                    metricas.contar(contador, key)
+                    metricas.observar(operacion, key, time.perf_counter() - inicio)
+            return envoltura_async
+
+        @functools.wraps(funcion)
+        def envoltura(self, key, *args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return funcion(self, key, *args, **kwargs)
+            finally:
+                metricas.contar(contador, key)
+                metricas.observar(operacion, key, time.perf_counter() - inicio)
+        return envoltura
+    return decorador
 
 
 class CacheService:
-    """Servicio de caché con soporte para Redis y fallback en memoria."""
-
-    def __init__(self, redis_url: Optional[str] = None):
+    """Servicio de caché con soporte para Redis y fallback en memoria.
+
+    Cada operación tiene una versión asíncrona (``aget``, ``aset``,
+    ``aincrement``...) sobre ``redis.asyncio``, que es la que deben usar los
+    resolvers y servicios async para no bloquear el event loop. Los métodos
+    síncronos se mantienen como compatibilidad (scripts, código síncrono)
+    sobre el cliente ``redis`` clásico. Ambos clientes usan su propio pool
+    de conexiones, limitado a ``max_connections``.
+
+    Con ``cache_cercana=True`` las lecturas se sirven de una L1 por proceso
+    invalidada por pub/sub (ver ``cache_cercana.py``).
+
+    Los valores se guardan en Redis con un codec compacto (msgpack si está
+    instalado, ver ``cache_codec.py``) y todas las claves llevan el prefijo
+    ``v<version_esquema>:``; al cambiar la versión en un despliegue las
+    entradas anteriores simplemente dejan de leerse.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, max_connections: int = 20,
+                 cache_cercana: bool = False, ttl_l1: int = 30,
+                 codec: Optional[Codec] = None, version_esquema: str = VERSION_ESQUEMA,
+                 umbral_compresion: Optional[int] = UMBRAL_COMPRESION):
         self.redis_client = None
+        self.redis_async_client = None
         self._redis_available = False
+        self._cercana: Optional[CacheCercana] = None
+        self._serializador = Serializador(codec or crear_codec(), umbral_compresion)
+        self._prefijo = f"v{version_esquema}"
+        # Cálculos en curso de get_or_compute (single-flight por proceso)
+        self._en_vuelo: Dict[str, asyncio.Future] = {}
+        # Scripts Lua registrados (texto -> AsyncScript, invocado con EVALSHA)
+        self._scripts: Dict[str, Any] = {}
 
         if redis_url:
-            self._setup_redis(redis_url)
+            self._setup_redis(redis_url, max_connections)
+        if cache_cercana and self._redis_available:
+            self._cercana = CacheCercana(self.redis_client, ttl_l1=ttl_l1)
 
-    def _setup_redis(self, redis_url: str) -> None:
-        """Configura conexión a Redis."""
+    def _setup_redis(self, redis_url: str, max_connections: int) -> None:
+        """Configura conexión a Redis (cliente síncrono y asíncrono)."""
         try:
             import redis
-            self.redis_client = redis.from_url(redis_url)
+            import redis.asyncio as redis_asyncio
+            self.redis_client = redis.Redis(
+                connection_pool=redis.ConnectionPool.from_url(redis_url, max_connections=max_connections)
+            )
             # Test connection
             self.redis_client.ping()
+            # El pool async abre conexiones bajo demanda en el event loop que las use
+            self.redis_async_client = redis_asyncio.Redis(
+                connection_pool=redis_asyncio.ConnectionPool.from_url(redis_url, max_connections=max_connections)
+            )
             self._redis_available = True
             logger.info("Redis conectado exitosamente")
         except ImportError:
@@ -40,17 +146,446 @@ class CacheService:
             logger.error(f"Error conectando a Redis: {e}")
             logger.warning("Usando caché en memoria como fallback")
 
+    def _k(self, key: str) -> str:
+        """Clave en Redis: con el prefijo de versión de esquema."""
+        return f"{self._prefijo}:{key}"
+
+    def _serializar(self, value: Any) -> bytes:
+        return self._serializador.codificar(value)
+
+    def _deserializar(self, raw: bytes) -> Any:
+        """Valor decodificado o ``INVALIDO`` (se trata como fallo de caché)."""
+        return self._serializador.decodificar(raw)
+
+    # === Caché cercana (L1) ===
+
+    def _invalidar(self, keys: List[str]) -> None:
+        """Tras escribir en Redis: descarta L1 local y avisa al resto de procesos."""
+        if self._cercana is not None:
+            self._cercana.invalidar_local(keys)
+            self.redis_client.publish(CANAL_INVALIDACION, CacheCercana.mensaje(keys))
+
+    async def _ainvalidar(self, keys: List[str]) -> None:
+        if self._cercana is not None:
+            self._cercana.invalidar_local(keys)
+            await self.redis_async_client.publish(CANAL_INVALIDACION, CacheCercana.mensaje(keys))
+
+    # === API asíncrona ===
+
+    async def aget(self, key: str, default: Any = None) -> Any:
+        """Obtiene un valor del caché (async)."""
+        inicio = time.perf_counter()
+        valor = await self._aget(key, AUSENTE)
+        if valor is not AUSENTE and _es_etiquetado(valor):
+            valor = (await self._avalidar_etiquetados({key: valor})).get(key, AUSENTE)
+        metricas.lectura(key, valor is not AUSENTE, time.perf_counter() - inicio)
+        return default if valor is AUSENTE else valor
+
+    async def _aget(self, key: str, default: Any = None) -> Any:
+        """Lectura sin comprobar etiquetas."""
+        try:
+            if self._redis_available:
+                if self._cercana is not None:
+                    valor = self._cercana.obtener(key)
+                    if valor is not AUSENTE:
+                        return valor
+                    generacion = self._cercana.generacion
+                    # Valor y TTL restante en un viaje: L1 no debe sobrevivir a la clave
+                    async with self.redis_async_client.pipeline(transaction=False) as pipe:
+                        pipe.get(self._k(key))
+                        pipe.pttl(self._k(key))
+                        value, pttl = await pipe.execute()
+                else:
+                    value = await self.redis_async_client.get(self._k(key))
+                valor = self._deserializar(value) if value is not None else INVALIDO
+                if valor is INVALIDO:
+                    return default
+                if self._cercana is not None:
+                    self._cercana.guardar(key, valor, generacion, pttl)
+                return valor
+
+            # Fallback a memoria
+            return self._get_from_memory(key, default)
+
+        except Exception as e:
+            logger.error(f"Error obteniendo caché para {key}: {e}")
+            return default
+
+    @_medido('set', 'escrituras')
+    async def aset(self, key: str, value: Any, ttl: Optional[int] = None,
+                   tags: Optional[Iterable[str]] = None) -> bool:
+        """Guarda un valor en caché (async), opcionalmente con etiquetas de invalidación."""
+        try:
+            if tags:
+                tags = list(tags)
+                value = _etiquetar(value, await self._aget_many([_clave_tag(t) for t in tags]), tags)
+                ttl = min(ttl or TTL_TAG, TTL_TAG)
+            if self._redis_available:
+                resultado = bool(await self.redis_async_client.set(self._k(key), self._serializar(value), ex=ttl or None))
+                await self._ainvalidar([key])
+                return resultado
+
+            # Fallback a memoria
+            return self._set_in_memory(key, value, ttl)
+
+        except Exception as e:
+            logger.error(f"Error guardando en caché para {key}: {e}")
+            return False
+
+    async def adelete(self, *keys: str) -> bool:
+        """Elimina una o varias claves del caché (async)."""
+        for key in keys:
+            metricas.contar('borrados', key)
+        try:
+            if self._redis_available:
+                resultado = bool(await self.redis_async_client.delete(*(self._k(key) for key in keys)))
+                await self._ainvalidar(list(keys))
+                return resultado
+
+            # Fallback a memoria
+            return any([self._delete_from_memory(key) for key in keys])
+
+        except Exception as e:
+            logger.error(f"Error eliminando caché para {keys}: {e}")
+            return False
+
+    async def aexists(self, key: str) -> bool:
+        """Verifica si una clave existe en el caché (async)."""
+        try:
+            if self._redis_available:
+                if self._cercana is not None and self._cercana.obtener(key) is not AUSENTE:
+                    return True
+                return bool(await self.redis_async_client.exists(self._k(key)))
+
+            # Fallback a memoria
+            return self._exists_in_memory(key)
+
+        except Exception as e:
+            logger.error(f"Error verificando existencia de {key}: {e}")
+            return False
+
+    async def aget_ttl(self, key: str) -> int:
+        """Obtiene el tiempo de vida restante de una clave (async)."""
+        try:
+            if self._redis_available:
+                return await self.redis_async_client.ttl(self._k(key))
+
+            # Fallback a memoria
+            return self._get_ttl_from_memory(key)
+
+        except Exception as e:
+            logger.error(f"Error obteniendo TTL para {key}: {e}")
+            return -1
+
+    @_medido('increment', 'escrituras')
+    async def aincrement(self, key: str, amount: int = 1) -> Optional[int]:
+        """Incrementa un contador en el caché (async)."""
+        try:
+            if self._redis_available:
+                resultado = await self.redis_async_client.incr(self._k(key), amount)
+                await self._ainvalidar([key])
+                return resultado
+
+            # Fallback a memoria
+            return self._increment_in_memory(key, amount)
+
+        except Exception as e:
+            logger.error(f"Error incrementando {key}: {e}")
+            return None
+
+    async def adecrement(self, key: str, amount: int = 1) -> Optional[int]:
+        """Decrementa un contador en el caché (async)."""
+        return await self.aincrement(key, -amount)
+
+    async def aget_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Obtiene múltiples valores del caché con un único MGET (async)."""
+        inicio = time.perf_counter()
+        resultados = await self._aget_many(keys)
+        etiquetados = {k: v for k, v in resultados.items() if _es_etiquetado(v)}
+        if etiquetados:
+            validos = await self._avalidar_etiquetados(etiquetados)
+            resultados.update({k: validos.get(k) for k in etiquetados})
+        _registrar_lectura_multiple(keys, resultados, time.perf_counter() - inicio)
+        return resultados
+
+    async def _aget_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Lectura múltiple sin comprobar etiquetas."""
+        try:
+            if self._redis_available:
+                resultados, pendientes, generacion = self._leer_l1(keys)
+                if pendientes and self._cercana is not None:
+                    async with self.redis_async_client.pipeline(transaction=False) as pipe:
+                        pipe.mget([self._k(key) for key in pendientes])
+                        for key in pendientes:
+                            pipe.pttl(self._k(key))
+                        values, *pttls = await pipe.execute()
+                    resultados.update(self._rellenar_l1(pendientes, values, generacion, pttls))
+                elif pendientes:
+                    values = await self.redis_async_client.mget([self._k(key) for key in pendientes])
+                    resultados.update(self._rellenar_l1(pendientes, values, generacion))
+                return resultados
+
+            # Fallback a memoria
+            return {key: self._get_from_memory(key) for key in keys}
+
+        except Exception as e:
+            logger.error(f"Error obteniendo múltiples valores del caché: {e}")
+            return {key: None for key in keys}
+
+    async def aset_many(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """Guarda múltiples valores en un único pipeline (async)."""
+        for key in mapping:
+            metricas.contar('escrituras', key)
+        try:
+            if self._redis_available:
+                async with self.redis_async_client.pipeline(transaction=False) as pipe:
+                    for key, value in mapping.items():
+                        pipe.set(self._k(key), self._serializar(value), ex=ttl or None)
+                    await pipe.execute()
+                await self._ainvalidar(list(mapping))
+                return True
+
+            # Fallback a memoria
+            for key, value in mapping.items():
+                self._set_in_memory(key, value, ttl)
+            return True
+
+        except Exception as e:
+            logger.error(f"Error guardando múltiples valores en caché: {e}")
+            return False
+
+    async def get_or_compute(
+        self,
+        key: str,
+        coro_factory: Callable[[], Awaitable[Any]],
+        ttl: int,
+        lock: bool = False,
+        beta: float = 1.0,
+        tags: Optional[Iterable[str]] = None,
+    ) -> Any:
+        """Obtiene un valor del caché o lo calcula, evitando estampidas.
+
+        - Dentro del proceso, las peticiones concurrentes de la misma clave
+          comparten un único cálculo (single-flight).
+        - Con ``lock=True`` y Redis, solo un proceso calcula; el resto espera
+          a que el valor aparezca (hasta ``ESPERA_LOCK`` segundos).
+        - Refresco anticipado probabilístico (XFetch): cuanto más cerca de
+          caducar y más caro de calcular es el valor, más probable es que una
+          lectura lo recalcule antes de que expire, mientras las demás siguen
+          recibiendo el valor actual. ``beta`` > 1 adelanta el refresco; 0 lo
+          desactiva.
+
+        El valor se guarda junto con su coste de cálculo y su expiración, así
+        que la clave debe leerse siempre con ``get_or_compute``.
+
+        Args:
+            key: Clave de caché
+            coro_factory: Función sin argumentos que devuelve la corrutina que calcula el valor
+            ttl: Tiempo de vida en segundos
+            lock: Coordinar además entre procesos con un lock en Redis
+            beta: Agresividad del refresco anticipado
+            tags: Etiquetas de invalidación del valor (ver ``ainvalidar_tags``)
+        """
+        actual = _desempaquetar_calculado(await self.aget(key))
+        if actual is not None:
+            valor, coste, expira = actual
+            if not _refrescar_antes(coste, expira, beta) or key in self._en_vuelo:
+                return valor
+
+        en_vuelo = self._en_vuelo.get(key)
+        if en_vuelo is not None:
+            return await asyncio.shield(en_vuelo)
+
+        futuro = asyncio.get_running_loop().create_future()
+        self._en_vuelo[key] = futuro
+        try:
+            valor = await self._calcular(key, coro_factory, ttl, lock, actual, tags)
+            futuro.set_result(valor)
+            return valor
+        except BaseException as e:
+            futuro.set_exception(e)
+            # Marcar la excepción como recuperada si nadie más esperaba
+            futuro.exception()
+            raise
+        finally:
+            del self._en_vuelo[key]
+
+    async def _calcular(self, key: str, coro_factory: Callable[[], Awaitable[Any]], ttl: int,
+                        lock: bool, actual: Optional[List[Any]],
+                        tags: Optional[Iterable[str]] = None) -> Any:
+        """Calcula y guarda el valor; con ``lock``, coordina entre procesos."""
+        token = None
+        if lock and self._redis_available:
+            token = await self._adquirir_lock(key, ttl)
+            if token is None:
+                # Otro proceso está calculando: servir el valor actual o esperar al suyo
+                if actual is not None:
+                    return actual[0]
+                valor = await self._esperar_valor(key)
+                if valor is not AUSENTE:
+                    return valor
+
+        try:
+            inicio = time.monotonic()
+            valor = await coro_factory()
+            coste = time.monotonic() - inicio
+            await self.aset(key, {_CALCULADO: [valor, coste, time.time() + ttl]}, ttl=ttl, tags=tags)
+            return valor
+        finally:
+            if token:
+                await self._liberar_lock(key, token)
+
+    async def _adquirir_lock(self, key: str, ttl: int) -> Optional[str]:
+        """SET NX del lock de ``key``.
+
+        Devuelve el token si se ha obtenido, None si lo tiene otro proceso y
+        cadena vacía si Redis ha fallado (se calcula sin coordinar).
+        """
+        token = uuid.uuid4().hex
+        try:
+            obtenido = await self.redis_async_client.set(
+                self._k(f"lock:{key}"), token, nx=True, ex=max(1, min(ttl, TTL_LOCK))
+            )
+            return token if obtenido else None
+        except Exception as e:
+            logger.error(f"Error adquiriendo lock para {key}: {e}")
+            return ''
+
+    async def _liberar_lock(self, key: str, token: str) -> None:
+        """Libera el lock solo si sigue siendo nuestro."""
+        try:
+            await self.redis_async_client.eval(_LUA_LIBERAR_LOCK, 1, self._k(f"lock:{key}"), token)
+        except Exception as e:
+            logger.error(f"Error liberando lock para {key}: {e}")
+
+    async def _esperar_valor(self, key: str) -> Any:
+        """Espera a que otro proceso guarde el valor de ``key``."""
+        limite = time.monotonic() + ESPERA_LOCK
+        while time.monotonic() < limite:
+            await asyncio.sleep(INTERVALO_ESPERA_LOCK)
+            entrada = _desempaquetar_calculado(await self.aget(key))
+            if entrada is not None:
+                return entrada[0]
+        return AUSENTE
+
+    # === Etiquetas ===
+
+    async def ainvalidar_tags(self, tags: Iterable[str]) -> None:
+        """Invalida todas las entradas guardadas con alguna de ``tags`` (async)."""
+        claves = [_clave_tag(t) for t in dict.fromkeys(tags)]
+        if not claves:
+            return
+        try:
+            if self._redis_available:
+                async with self.redis_async_client.pipeline(transaction=False) as pipe:
+                    for clave in claves:
+                        pipe.incr(self._k(clave))
+                        pipe.expire(self._k(clave), TTL_TAG)
+                    await pipe.execute()
+                await self._ainvalidar(claves)
+                return
+
+            # Fallback a memoria
+            for clave in claves:
+                self._increment_in_memory(clave)
+
+        except Exception as e:
+            logger.error(f"Error invalidando etiquetas {claves}: {e}")
+
+    def invalidar_tags(self, tags: Iterable[str]) -> None:
+        """Invalida todas las entradas guardadas con alguna de ``tags``."""
+        claves = [_clave_tag(t) for t in dict.fromkeys(tags)]
+        if not claves:
+            return
+        try:
+            if self._redis_available:
+                with self.redis_client.pipeline(transaction=False) as pipe:
+                    for clave in claves:
+                        pipe.incr(self._k(clave))
+                        pipe.expire(self._k(clave), TTL_TAG)
+                    pipe.execute()
+                self._invalidar(claves)
+                return
+
+            # Fallback a memoria
+            for clave in claves:
+                self._increment_in_memory(clave)
+
+        except Exception as e:
+            logger.error(f"Error invalidando etiquetas {claves}: {e}")
+
+    async def _avalidar_etiquetados(self, etiquetados: Dict[str, Any]) -> Dict[str, Any]:
+        """Valores de las entradas etiquetadas cuyas etiquetas no han cambiado."""
+        tags = {t for v in etiquetados.values() for t in v[_ETIQUETADO][1]}
+        versiones = await self._aget_many([_clave_tag(t) for t in tags])
+        return _vigentes(etiquetados, versiones)
+
+    def _validar_etiquetados(self, etiquetados: Dict[str, Any]) -> Dict[str, Any]:
+        tags = {t for v in etiquetados.values() for t in v[_ETIQUETADO][1]}
+        versiones = self._get_many([_clave_tag(t) for t in tags])
+        return _vigentes(etiquetados, versiones)
+
+    # === Scripts Lua ===
+
+    async def aejecutar_script(self, script: str, keys: List[str], args: Iterable[Any] = ()) -> Any:
+        """Ejecuta un script Lua de forma atómica en Redis (async).
+
+        Las claves llevan el prefijo de versión como el resto de operaciones.
+        El script se registra una vez por proceso y se invoca con ``EVALSHA``.
+        Devuelve None si no hay Redis o si la ejecución falla; quien llama
+        decide entonces cómo resolverlo en memoria.
+        """
+        if not self._redis_available:
+            return None
+        try:
+            registrado = self._scripts.get(script)
+            if registrado is None:
+                registrado = self._scripts[script] = self.redis_async_client.register_script(script)
+            return await registrado(keys=[self._k(k) for k in keys], args=list(args))
+        except Exception as e:
+            logger.error(f"Error ejecutando script en Redis sobre {keys}: {e}")
+            return None
+
+    async def aclose(self) -> None:
+        """Cierra las conexiones del pool asíncrono."""
+        if self._cercana is not None:
+            self._cercana.detener()
+        if self.redis_async_client is not None:
+            await self.redis_async_client.aclose()
+
+    # === API síncrona (compatibilidad) ===
+
     def get(self, key: str, default: Any = None) -> Any:
         """Obtiene un valor del caché."""
+        inicio = time.perf_counter()
+        valor = self._get(key, AUSENTE)
+        if valor is not AUSENTE and _es_etiquetado(valor):
+            valor = self._validar_etiquetados({key: valor}).get(key, AUSENTE)
+        metricas.lectura(key, valor is not AUSENTE, time.perf_counter() - inicio)
+        return default if valor is AUSENTE else valor
+
+    def _get(self, key: str, default: Any = None) -> Any:
+        """Lectura sin comprobar etiquetas."""
         try:
             if self._redis_available:
-                value = self.redis_client.get(key)
-                if value is not None:
-                    try:
-                        return pickle.loads(value)
-                    except Exception:
-                        return value.decode('utf-8')
-                return default
+                if self._cercana is not None:
+                    valor = self._cercana.obtener(key)
+                    if valor is not AUSENTE:
+                        return valor
+                    generacion = self._cercana.generacion
+                    # Valor y TTL restante en un viaje: L1 no debe sobrevivir a la clave
+                    with self.redis_client.pipeline(transaction=False) as pipe:
+                        pipe.get(self._k(key))
+                        pipe.pttl(self._k(key))
+                        value, pttl = pipe.execute()
+                else:
+                    value = self.redis_client.get(self._k(key))
+                valor = self._deserializar(value) if value is not None else INVALIDO
+                if valor is INVALIDO:
+                    return default
+                if self._cercana is not None:
+                    self._cercana.guardar(key, valor, generacion, pttl)
+                return valor
 
             # Fallback a memoria
             return self._get_from_memory(key, default)
@@ -59,15 +594,19 @@ class CacheService:
             logger.error(f"Error obteniendo caché para {key}: {e}")
             return default
 
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
-        """Guarda un valor en caché."""
+    @_medido('set', 'escrituras')
+    def set(self, key: str, value: Any, ttl: Optional[int] = None,
+            tags: Optional[Iterable[str]] = None) -> bool:
+        """Guarda un valor en caché, opcionalmente con etiquetas de invalidación."""
         try:
+            if tags:
+                tags = list(tags)
+                value = _etiquetar(value, self._get_many([_clave_tag(t) for t in tags]), tags)
+                ttl = min(ttl or TTL_TAG, TTL_TAG)
             if self._redis_available:
-                serialized_value = pickle.dumps(value)
-                if ttl:
-                    return self.redis_client.setex(key, ttl, serialized_value)
-                else:
-                    return self.redis_client.set(key, serialized_value)
+                resultado = bool(self.redis_client.set(self._k(key), self._serializar(value), ex=ttl or None))
+                self._invalidar([key])
+                return resultado
 
             # Fallback a memoria
             return self._set_in_memory(key, value, ttl)
@@ -76,11 +615,14 @@ class CacheService:
             logger.error(f"Error guardando en caché para {key}: {e}")
             return False
 
+    @_medido('delete', 'borrados')
     def delete(self, key: str) -> bool:
         """Elimina una clave del caché."""
         try:
             if self._redis_available:
-                return bool(self.redis_client.delete(key))
+                resultado = bool(self.redis_client.delete(self._k(key)))
+                self._invalidar([key])
+                return resultado
 
             # Fallback a memoria
             return self._delete_from_memory(key)
@@ -93,7 +635,9 @@ class CacheService:
         """Verifica si una clave existe en el caché."""
         try:
             if self._redis_available:
-                return bool(self.redis_client.exists(key))
+                if self._cercana is not None and self._cercana.obtener(key) is not AUSENTE:
+                    return True
+                return bool(self.redis_client.exists(self._k(key)))
 
             # Fallback a memoria
             return self._exists_in_memory(key)
@@ -106,7 +650,9 @@ class CacheService:
         """Limpia todo el caché."""
         try:
             if self._redis_available:
-                return self.redis_client.flushdb()
+                resultado = self.redis_client.flushdb()
+                self._invalidar([TODAS])
+                return resultado
 
             # Fallback a memoria
             return self._flush_memory()
@@ -119,7 +665,7 @@ class CacheService:
         """Obtiene el tiempo de vida restante de una clave."""
         try:
             if self._redis_available:
-                return self.redis_client.ttl(key)
+                return self.redis_client.ttl(self._k(key))
 
             # Fallback a memoria
             return self._get_ttl_from_memory(key)
@@ -128,11 +674,14 @@ class CacheService:
             logger.error(f"Error obteniendo TTL para {key}: {e}")
             return -1
 
+    @_medido('increment', 'escrituras')
     def increment(self, key: str, amount: int = 1) -> Optional[int]:
         """Incrementa un contador en el caché."""
         try:
             if self._redis_available:
-                return self.redis_client.incr(key, amount)
+                resultado = self.redis_client.incr(self._k(key), amount)
+                self._invalidar([key])
+                return resultado
 
             # Fallback a memoria
             return self._increment_in_memory(key, amount)
@@ -141,11 +690,14 @@ class CacheService:
             logger.error(f"Error incrementando {key}: {e}")
             return None
 
+    @_medido('increment', 'escrituras')
     def decrement(self, key: str, amount: int = 1) -> Optional[int]:
         """Decrementa un contador en el caché."""
         try:
             if self._redis_available:
-                return self.redis_client.decr(key, amount)
+                resultado = self.redis_client.decr(self._k(key), amount)
+                self._invalidar([key])
+                return resultado
 
             # Fallback a memoria
             return self._decrement_in_memory(key, amount)
@@ -156,23 +708,34 @@ class CacheService:
 
     def get_many(self, keys: List[str]) -> Dict[str, Any]:
         """Obtiene múltiples valores del caché."""
-        resultados = {}
-
+        inicio = time.perf_counter()
+        resultados = self._get_many(keys)
+        etiquetados = {k: v for k, v in resultados.items() if _es_etiquetado(v)}
+        if etiquetados:
+            validos = self._validar_etiquetados(etiquetados)
+            resultados.update({k: validos.get(k) for k in etiquetados})
+        _registrar_lectura_multiple(keys, resultados, time.perf_counter() - inicio)
+        return resultados
+
+    def _get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Lectura múltiple sin comprobar etiquetas."""
         try:
             if self._redis_available:
-                values = self.redis_client.mget(keys)
-                for key, value in zip(keys, values):
-                    if value is not None:
-                        try:
-                            resultados[key] = pickle.loads(value)
-                        except Exception:
-                            resultados[key] = value.decode('utf-8')
+                resultados, pendientes, generacion = self._leer_l1(keys)
+                if pendientes and self._cercana is not None:
+                    with self.redis_client.pipeline(transaction=False) as pipe:
+                        pipe.mget([self._k(key) for key in pendientes])
+                        for key in pendientes:
+                            pipe.pttl(self._k(key))
+                        values, *pttls = pipe.execute()
+                    resultados.update(self._rellenar_l1(pendientes, values, generacion, pttls))
+                elif pendientes:
+                    values = self.redis_client.mget([self._k(key) for key in pendientes])
+                    resultados.update(self._rellenar_l1(pendientes, values, generacion))
                 return resultados
 
             # Fallback a memoria
-            for key in keys:
-                resultados[key] = self.get(key)
-            return resultados
+            return {key: self._get_from_memory(key) for key in keys}
 
         except Exception as e:
             logger.error(f"Error obteniendo múltiples valores del caché: {e}")
@@ -180,22 +743,15 @@ class CacheService:
 
     def set_many(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> bool:
         """Guarda múltiples valores en el caché."""
+        for key in mapping:
+            metricas.contar('escrituras', key)
         try:
             if self._redis_available:
-                # Serializar valores
-                serialized_mapping = {}
-                for key, value in mapping.items():
-                    serialized_mapping[key] = pickle.dumps(value)
-
-                if ttl:
-                    # Usar pipeline para TTL
-                    pipe = self.redis_client.pipeline()
-                    pipe.mset(serialized_mapping)
-                    for key in mapping.keys():
-                        pipe.expire(key, ttl)
+                with self.redis_client.pipeline(transaction=False) as pipe:
+                    for key, value in mapping.items():
+                        pipe.set(self._k(key), self._serializar(value), ex=ttl or None)
                     pipe.execute()
-                else:
-                    self.redis_client.mset(serialized_mapping)
+                self._invalidar(list(mapping))
                 return True
 
             # Fallback a memoria
@@ -207,72 +763,134 @@ class CacheService:
             logger.error(f"Error guardando múltiples valores en caché: {e}")
             return False
 
+    def _leer_l1(self, keys: List[str]):
+        """Separa las claves servidas por L1 de las que hay que pedir a Redis."""
+        if self._cercana is None:
+            return {}, list(keys), 0
+        generacion = self._cercana.generacion
+        resultados, pendientes = {}, []
+        for key in keys:
+            valor = self._cercana.obtener(key)
+            if valor is AUSENTE:
+                pendientes.append(key)
+            else:
+                resultados[key] = valor
+        return resultados, pendientes, generacion
+
+    def _rellenar_l1(self, keys: List[str], values: List[Optional[bytes]], generacion: int,
+                     pttls: Optional[List[int]] = None) -> Dict[str, Any]:
+        resultados = {}
+        for i, (key, value) in enumerate(zip(keys, values)):
+            valor = self._deserializar(value) if value is not None else INVALIDO
+            if valor is INVALIDO:
+                continue
+            resultados[key] = valor
+            if self._cercana is not None:
+                self._cercana.guardar(key, resultados[key], generacion, pttls[i] if pttls else None)
+        return resultados
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """Backend activo y estadísticas de la caché en memoria."""
+        estadisticas = {
+            'backend': 'redis' if self._redis_available else 'memoria',
+            'memoria': _memoria.estadisticas(),
+        }
+        if self._cercana is not None:
+            estadisticas['l1'] = self._cercana.estadisticas()
+        return estadisticas
+
     # Métodos de caché en memoria (fallback)
     def _get_from_memory(self, key: str, default: Any = None) -> Any:
         """Obtiene valor del caché en memoria."""
-        if key in _memory_cache_ttl:
-            if datetime.utcnow() > _memory_cache_ttl[key]:
-                # Expirado
-                del _memory_cache[key]
-                del _memory_cache_ttl[key]
-                return default
-
-        return _memory_cache.get(key, default)
+        return _memoria.get(key, default)
 
     def _set_in_memory(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """Guarda valor en caché en memoria."""
-        _memory_cache[key] = value
-
-        if ttl:
-            _memory_cache_ttl[key] = datetime.utcnow() + timedelta(seconds=ttl)
-        elif key in _memory_cache_ttl:
-            del _memory_cache_ttl[key]
-
-        return True
+        return _memoria.set(key, value, ttl)
 
     def _delete_from_memory(self, key: str) -> bool:
         """Elimina valor del caché en memoria."""
-        if key in _memory_cache:
-            del _memory_cache[key]
-            if key in _memory_cache_ttl:
-                del _memory_cache_ttl[key]
-            return True
-        return False
+        return _memoria.delete(key)
 
     def _exists_in_memory(self, key: str) -> bool:
         """Verifica existencia en caché en memoria."""
-        return key in _memory_cache
+        return _memoria.exists(key)
 
     def _flush_memory(self) -> bool:
         """Limpia caché en memoria."""
-        _memory_cache.clear()
-        _memory_cache_ttl.clear()
-        return True
+        return _memoria.clear()
 
     def _get_ttl_from_memory(self, key: str) -> int:
         """Obtiene TTL de caché en memoria."""
-        if key not in _memory_cache_ttl:
-            return -1
-
-        tiempo_restante = (_memory_cache_ttl[key] - datetime.utcnow()).total_seconds()
-        return max(0, int(tiempo_restante))
+        return _memoria.get_ttl(key)
 
     def _increment_in_memory(self, key: str, amount: int = 1) -> int:
         """Incrementa contador en caché en memoria."""
-        if key not in _memory_cache:
-            _memory_cache[key] = 0
-
-        if isinstance(_memory_cache[key], (int, float)):
-            _memory_cache[key] += amount
-            return int(_memory_cache[key])
-
-        return 0
+        return _memoria.increment(key, amount)
 
     def _decrement_in_memory(self, key: str, amount: int = 1) -> int:
         """Decrementa contador en caché en memoria."""
         return self._increment_in_memory(key, -amount)
 
 
+def _desempaquetar_calculado(entrada: Any) -> Optional[List[Any]]:
+    """[valor, coste, expira] guardado por get_or_compute, o None."""
+    if isinstance(entrada, dict) and _CALCULADO in entrada:
+        return list(entrada[_CALCULADO])
+    return None
+
+
+def _refrescar_antes(coste: float, expira: float, beta: float) -> bool:
+    """Decisión XFetch: ahora - coste * beta * ln(rand) >= expira."""
+    if beta <= 0:
+        return False
+    return time.time() - coste * beta * math.log(random.random() or 1e-12) >= expira
+
+
+def _registrar_lectura_multiple(keys: List[str], resultados: Dict[str, Any], segundos: float) -> None:
+    for key in keys:
+        metricas.contar('aciertos' if resultados.get(key) is not None else 'fallos', key)
+    if keys:
+        metricas.observar('get_many', keys[0], segundos)
+
+
+def _clave_tag(tag: str) -> str:
+    return f"tag:{tag}"
+
+
+def _es_etiquetado(valor: Any) -> bool:
+    return isinstance(valor, dict) and _ETIQUETADO in valor
+
+
+def _etiquetar(valor: Any, versiones: Dict[str, Any], tags: List[str]) -> Dict[str, Any]:
+    """Envuelve ``valor`` con la versión actual de cada etiqueta."""
+    return {_ETIQUETADO: [valor, {t: versiones.get(_clave_tag(t)) for t in tags}]}
+
+
+def _vigentes(etiquetados: Dict[str, Any], versiones: Dict[str, Any]) -> Dict[str, Any]:
+    """Desenvuelve las entradas cuyas etiquetas siguen en la versión guardada."""
+    return {
+        key: valor[_ETIQUETADO][0]
+        for key, valor in etiquetados.items()
+        if all(versiones.get(_clave_tag(t)) == v for t, v in valor[_ETIQUETADO][1].items())
+    }
+
+
+def tags_modelo(modelo_clase, id_objeto: Optional[Any] = None) -> List[str]:
+    """Etiquetas de invalidación de un modelo.
+
+    Con ``id_objeto``, las de una entidad concreta: ``model:<Clase>:<id>``
+    (cambia esa fila) y ``model:<Clase>:dml`` (UPDATE/DELETE masivo del
+    modelo, del que no se conocen las filas). Sin ``id_objeto``, la del
+    modelo completo: ``model:<Clase>:*`` (cambia cualquier fila), para
+    listados y agregados.
+    """
+    nombre = modelo_clase if isinstance(modelo_clase, str) else modelo_clase.__name__
+    if id_objeto is None:
+        return [f"model:{nombre}:*"]
+    return [f"model:{nombre}:{id_objeto}", f"model:{nombre}:dml"]
+
+
 # Funciones helper para generar keys de caché
 def generar_cache_key(prefix: str, *args) -> str:
     """Genera una clave de caché única a partir de parámetros."""
@@ -305,5 +923,15 @@ def get_cache_service(redis_url: Optional[str] = None) -> CacheService:
         # Intentar obtener URL de Redis de variables de entorno
         if not redis_url:
             redis_url = os.getenv('REDIS_URL')
-        _cache_service = CacheService(redis_url)
+        max_connections = int(os.getenv('REDIS_MAX_CONNECTIONS', '20'))
+        cache_cercana = os.getenv('CACHE_CERCANA', '').lower() in ('1', 'true', 'si', 'sí')
+        _cache_service = CacheService(
+            redis_url,
+            max_connections=max_connections,
+            cache_cercana=cache_cercana,
+            ttl_l1=int(os.getenv('CACHE_CERCANA_TTL', '30')),
+            codec=crear_codec(os.getenv('CACHE_CODEC') or None),
+            version_esquema=os.getenv('CACHE_VERSION_ESQUEMA', VERSION_ESQUEMA),
+            umbral_compresion=int(os.getenv('CACHE_UMBRAL_COMPRESION', UMBRAL_COMPRESION)),
+        )
     return _cache_service
@@ -1,4 +1,9 @@
-"""Servicio unificado de configuración con validación dinámica y caché."""
+"""Servicio unificado de configuración con validación dinámica y caché.
+
+Las lecturas se sirven desde el registro de configuración del proceso
+(``registro_configuracion``) cuando está cargado; si no, se consulta la base
+de datos y se guarda en la caché de la instancia.
+"""
 
 import json
 import re
@@ -9,19 +14,30 @@ from datetime import datetime, timedelta
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from .registro_configuracion import ReglaConfig, get_registro_configuracion
+
 logger = logging.getLogger(__name__)
 
+# Formatos de duración: "30d", "24h", "60m", "3600s"
+_PATRON_DURACION = re.compile(r'^(\d+)([dhms])$')
+_PATRON_MONEDA = re.compile(r'^[A-Z]{3}$')
+
 
 class ConfiguracionService:
     """Servicio para gestionar configuración con validación dinámica y caché."""
 
     def __init__(self, session: AsyncSession):
         self.session = session
+        self.registro = get_registro_configuracion()
         self._cache = {}  # Cache simple en memoria
         self._cache_ttl = {}  # TTL para cada entrada del cache
+        self._reglas: Dict[str, Optional[ReglaConfig]] = {}  # Reglas compiladas (sin registro)
 
     async def get(self, clave: str, default: Any = None) -> Any:
         """Obtiene un valor de configuración con cache."""
+        if self.registro.cargado:
+            return self.registro.valor(clave, default)
+
         # Verificar cache
         if self._esta_en_cache(clave):
             return self._cache[clave]
@@ -79,8 +95,9 @@ class ConfiguracionService:
 
             await self.session.commit()
 
-            # Actualizar cache
-            self._guardar_en_cache(clave, valor)
+            # Actualizar cache (el NOTIFY avisará al resto de procesos)
+            self._guardar_en_cache(clave, config.get_valor())
+            self.registro.actualizar(clave, config.get_valor())
 
             logger.info(f"Configuración actualizada: {clave}")
             return True
@@ -92,99 +109,54 @@ class ConfiguracionService:
 
     async def get_bool(self, clave: str, default: bool = False) -> bool:
         """Obtiene un valor booleano con validación."""
-        valor = await self.get(clave, default)
-        if isinstance(valor, bool):
-            return valor
-        if isinstance(valor, str):
-            return valor.lower() in ['true', '1', 'yes', 'si', 'on', 'enabled']
-        return bool(valor) if valor is not None else default
+        return _a_bool(await self.get(clave, default), None, default)
 
     async def get_int(self, clave: str, default: int = 0) -> int:
         """Obtiene un valor entero con validación según reglas."""
         valor = await self.get(clave, default)
-        try:
-            int_val = int(valor) if valor is not None else default
-
-            # Obtener reglas de validación
-            reglas = await self._obtener_reglas_validacion(clave)
-            if reglas:
-                if reglas.min_valor is not None and int_val < reglas.min_valor:
-                    return int(reglas.min_valor)
-                if reglas.max_valor is not None and int_val > reglas.max_valor:
-                    return int(reglas.max_valor)
-
-            return int_val
-
-        except (ValueError, TypeError):
-            return default
+        return _a_int(valor, await self._obtener_reglas_validacion(clave), default)
 
     async def get_float(self, clave: str, default: float = 0.0) -> float:
         """Obtiene un valor float con validación según reglas."""
         valor = await self.get(clave, default)
-        try:
-            float_val = float(valor) if valor is not None else default
-
-            # Obtener reglas de validación
-            reglas = await self._obtener_reglas_validacion(clave)
-            if reglas:
-                if reglas.min_valor is not None and float_val < reglas.min_valor:
-                    return reglas.min_valor
-                if reglas.max_valor is not None and float_val > reglas.max_valor:
-                    return reglas.max_valor
-                if reglas.decimales is not None:
-                    return round(float_val, reglas.decimales)
-
-            return float_val
-
-        except (ValueError, TypeError):
-            return default
+        return _a_float(valor, await self._obtener_reglas_validacion(clave), default)
 
     async def get_string(self, clave: str, default: str = "") -> str:
         """Obtiene un string con validación según reglas."""
         valor = await self.get(clave, default)
-        if not isinstance(valor, str):
-            valor = str(valor) if valor is not None else default
-
-        # Obtener reglas de validación
-        reglas = await self._obtener_reglas_validacion(clave)
-        if reglas:
-            if reglas.max_longitud is not None and len(valor) > reglas.max_longitud:
-                valor = valor[:reglas.max_longitud]
-            if reglas.pattern_regex is not None:
-                if not re.match(reglas.pattern_regex, valor):
-                    return default
-
-        return valor
+        return _a_string(valor, await self._obtener_reglas_validacion(clave), default)
+
+    async def get_many(self, claves: Dict[str, Any]) -> Dict[str, Any]:
+        """Obtiene varias configuraciones de una vez, tipadas según su valor por defecto.
+
+        ``claves`` es ``{clave: default}``; el tipo del default (bool, int,
+        float, str, list, dict) decide la conversión y las reglas aplicadas,
+        igual que ``get_bool``/``get_int``/... Con el registro cargado no hay
+        E/S; sin él, se hace una consulta para los valores y otra para las
+        reglas de todas las claves.
+        """
+        await self._precargar(list(claves))
+        resultado = {}
+        for clave, default in claves.items():
+            valor = self._leer_local(clave, default)
+            regla = self._regla_local(clave)
+            conversor = _CONVERSORES.get(type(default))
+            resultado[clave] = conversor(valor, regla, default) if conversor else valor
+        return resultado
 
     async def get_list(self, clave: str, default: List[Any] = None) -> List[Any]:
         """Obtiene una lista de valores."""
         if default is None:
             default = []
 
-        valor = await self.get(clave, default)
-        if isinstance(valor, list):
-            return valor
-        if isinstance(valor, str):
-            try:
-                return json.loads(valor)
-            except json.JSONDecodeError:
-                return default
-        return default
+        return _a_list(await self.get(clave, default), None, default)
 
     async def get_dict(self, clave: str, default: Dict[str, Any] = None) -> Dict[str, Any]:
         """Obtiene un diccionario de valores."""
         if default is None:
             default = {}
 
-        valor = await self.get(clave, default)
-        if isinstance(valor, dict):
-            return valor
-        if isinstance(valor, str):
-            try:
-                return json.loads(valor)
-            except json.JSONDecodeError:
-                return default
-        return default
+        return _a_dict(await self.get(clave, default), None, default)
 
     async def get_timedelta(self, clave: str, default: timedelta = None) -> timedelta:
         """Obtiene un timedelta desde segundos o string."""
@@ -201,7 +173,7 @@ class ConfiguracionService:
 
         if isinstance(valor, str):
             # Formatos: "30d", "24h", "60m", "3600s"
-            match = re.match(r'^(\d+)([dhms])$', valor.lower())
+            match = _PATRON_DURACION.match(valor.lower())
             if match:
                 cantidad, unidad = int(match.group(1)), match.group(2)
                 if unidad == 'd':
@@ -217,6 +189,9 @@ class ConfiguracionService:
 
     async def get_grupo(self, grupo: str) -> Dict[str, Any]:
         """Obtiene todas las configuraciones de un grupo."""
+        if self.registro.cargado:
+            return self.registro.grupo(grupo)
+
         from ...domains.core.models.configuracion import Configuracion
 
         result = await self.session.execute(
@@ -267,6 +242,8 @@ class ConfiguracionService:
             self.session.add(config)
             await self.session.commit()
 
+            self.registro.actualizar(clave, config.get_valor(), grupo)
+
             logger.info(f"Configuración creada: {clave}")
             return True
 
@@ -296,9 +273,9 @@ class ConfiguracionService:
             await self.session.commit()
 
             # Eliminar del cache
-            if clave.upper() in self._cache:
-                del self._cache[clave.upper()]
-                del self._cache_ttl[clave.upper()]
+            self._cache.pop(clave, None)
+            self._cache_ttl.pop(clave, None)
+            self.registro.eliminar(clave)
 
             logger.info(f"Configuración eliminada: {clave}")
             return True
@@ -331,26 +308,77 @@ class ConfiguracionService:
 
         elif reglas.tipo_dato == 'moneda':
             # Validar código ISO de moneda
-            if not re.match(r'^[A-Z]{3}$', str(valor).upper()):
+            if not _PATRON_MONEDA.match(str(valor).upper()):
                 raise ValueError(f"Valor inválido para {clave}: debe ser un código ISO de moneda (EUR, USD, etc.)")
 
-        elif reglas.pattern_regex is not None:
-            if not re.match(reglas.pattern_regex, str(valor)):
-                raise ValueError(f"Valor inválido para {clave}: no cumple con el patrón requerido")
+        elif not reglas.cumple_patron(valor):
+            raise ValueError(f"Valor inválido para {clave}: no cumple con el patrón requerido")
 
         return valor
 
-    async def _obtener_reglas_validacion(self, clave: str):
-        """Obtiene las reglas de validación para una clave desde BD."""
+    async def _obtener_reglas_validacion(self, clave: str) -> Optional[ReglaConfig]:
+        """Obtiene las reglas de validación compiladas para una clave."""
+        if self.registro.cargado:
+            return self.registro.regla(clave)
+
+        if clave.upper() not in self._reglas:
+            await self._precargar_reglas([clave])
+        return self._reglas[clave.upper()]
+
+    async def _precargar(self, claves: List[str]) -> None:
+        """Sin registro, trae en una consulta los valores y reglas que no estén en caché."""
+        if self.registro.cargado:
+            return
+
+        pendientes = [clave for clave in claves if not self._esta_en_cache(clave)]
+        if pendientes:
+            from ...domains.core.models.configuracion import Configuracion
+
+            try:
+                result = await self.session.execute(
+                    select(Configuracion).where(
+                        Configuracion.clave.in_([clave.upper() for clave in pendientes]),
+                        Configuracion.eliminado == False
+                    )
+                )
+                configs = {config.clave: config for config in result.scalars().all()}
+                for clave in pendientes:
+                    config = configs.get(clave.upper())
+                    if config is not None:
+                        self._guardar_en_cache(clave, config.get_valor())
+            except Exception as e:
+                logger.error(f"Error obteniendo configuraciones {pendientes}: {e}")
+
+        await self._precargar_reglas([clave for clave in claves if clave.upper() not in self._reglas])
+
+    async def _precargar_reglas(self, claves: List[str]) -> None:
+        if not claves:
+            return
+
         from ...domains.core.models.configuracion import ReglaValidacionConfig
 
         result = await self.session.execute(
             select(ReglaValidacionConfig).where(
-                ReglaValidacionConfig.config_clave == clave.upper(),
+                ReglaValidacionConfig.config_clave.in_([clave.upper() for clave in claves]),
                 ReglaValidacionConfig.activa == True
             )
         )
-        return result.scalar_one_or_none()
+        reglas = {regla.config_clave: ReglaConfig.desde_modelo(regla) for regla in result.scalars().all()}
+        for clave in claves:
+            self._reglas[clave.upper()] = reglas.get(clave.upper())
+
+    def _leer_local(self, clave: str, default: Any) -> Any:
+        """Valor ya en memoria (registro o caché de la instancia)."""
+        if self.registro.cargado:
+            return self.registro.valor(clave, default)
+        if self._esta_en_cache(clave):
+            return self._cache[clave]
+        return default
+
+    def _regla_local(self, clave: str) -> Optional[ReglaConfig]:
+        if self.registro.cargado:
+            return self.registro.regla(clave)
+        return self._reglas.get(clave.upper())
 
     def _esta_en_cache(self, clave: str) -> bool:
         """Verifica si una clave está en caché y no ha expirado."""
@@ -377,7 +405,72 @@ class ConfiguracionService:
         """Limpia el caché de configuración."""
         self._cache.clear()
         self._cache_ttl.clear()
+        self._reglas.clear()
         logger.info("Caché de configuración limpiado")
 
 
-# Nota: No usamos singleton global en async, se crea por request con dependency injection
+def _a_bool(valor: Any, regla: Optional[ReglaConfig], default: bool) -> bool:
+    if isinstance(valor, bool):
+        return valor
+    if isinstance(valor, str):
+        return valor.lower() in ['true', '1', 'yes', 'si', 'on', 'enabled']
+    return bool(valor) if valor is not None else default
+
+
+def _a_int(valor: Any, regla: Optional[ReglaConfig], default: int) -> int:
+    try:
+        int_val = int(valor) if valor is not None else default
+    except (ValueError, TypeError):
+        return default
+    return regla.limitar_int(int_val) if regla else int_val
+
+
+def _a_float(valor: Any, regla: Optional[ReglaConfig], default: float) -> float:
+    try:
+        float_val = float(valor) if valor is not None else default
+    except (ValueError, TypeError):
+        return default
+    return regla.limitar_float(float_val) if regla else float_val
+
+
+def _a_string(valor: Any, regla: Optional[ReglaConfig], default: str) -> str:
+    if not isinstance(valor, str):
+        valor = str(valor) if valor is not None else default
+    return regla.limitar_string(valor, default) if regla else valor
+
+
+def _a_list(valor: Any, regla: Optional[ReglaConfig], default: list) -> list:
+    if isinstance(valor, list):
+        return valor
+    if isinstance(valor, str):
+        try:
+            return json.loads(valor)
+        except json.JSONDecodeError:
+            return default
+    return default
+
+
+def _a_dict(valor: Any, regla: Optional[ReglaConfig], default: dict) -> dict:
+    if isinstance(valor, dict):
+        return valor
+    if isinstance(valor, str):
+        try:
+            return json.loads(valor)
+        except json.JSONDecodeError:
+            return default
+    return default
+
+
+# Conversión de get_many según el tipo del valor por defecto
+_CONVERSORES = {
+    bool: _a_bool,
+    int: _a_int,
+    float: _a_float,
+    str: _a_string,
+    list: _a_list,
+    dict: _a_dict,
+}
+
+
+# Nota: el servicio se crea por request (necesita la sesión para escribir);
+# los valores compartidos viven en el registro de configuración del proceso.
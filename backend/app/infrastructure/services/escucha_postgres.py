@@ -0,0 +1,141 @@
+"""Escucha de canales ``NOTIFY`` de PostgreSQL para recargar registros en memoria.
+
+Los registros del proceso (configuración, estados) se suscriben a un canal
+con la corrutina que los recarga. Una única conexión asyncpg dedicada hace
+``LISTEN`` de todos los canales; cada aviso programa la recarga de su
+suscriptor, agrupando los avisos que llegan seguidos. Un aviso que llega
+con la recarga ya en marcha (que quizá ya ha leído las tablas) deja el
+canal pendiente y la recarga se repite al terminar.
+
+Los avisos emitidos mientras la conexión está caída se pierden, así que al
+conectar (y al reconectar) se recargan todos los suscriptores.
+
+``LISTEN`` solo funciona en una sesión propia: a través del pooler en modo
+transacción la conexión de servidor vuelve al pool tras cada sentencia y los
+avisos no llegan nunca. La conexión va a ``db_session_host``/``db_session_port``
+(Session Pooler o conexión directa); si no está configurado se usa
+``db_host`` y, con ``db_pgbouncer``, se avisa al arrancar.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Espera antes de reintentar la conexión de LISTEN tras un error
+ESPERA_RECONEXION = 5.0
+
+# Agrupa los avisos que llegan seguidos (p. ej. un UPDATE de varias filas) en una recarga
+RETARDO_RECARGA = 0.1
+
+
+class EscuchaPostgres:
+    """Conexión de ``LISTEN`` compartida por los registros del proceso."""
+
+    def __init__(self):
+        self._suscripciones: Dict[str, Callable[[], Awaitable[None]]] = {}
+        self._recargas: Dict[str, asyncio.Task] = {}
+        # Canales con avisos llegados durante su recarga en curso
+        self._pendientes: Set[str] = set()
+        self._tarea: Optional[asyncio.Task] = None
+        self._conexion = None
+
+    def suscribir(self, canal: str, recargar: Callable[[], Awaitable[None]]) -> None:
+        """Llama a ``recargar`` cuando llegue un aviso en ``canal``."""
+        self._suscripciones[canal] = recargar
+
+    async def iniciar(self) -> None:
+        from ...core.config import get_settings
+
+        settings = get_settings()
+        if settings.db_session_host is None and settings.db_pgbouncer:
+            logger.warning(
+                "DB_SESSION_HOST no configurado: LISTEN irá por el pooler en modo transacción y "
+                "no recibirá avisos; los cambios de otros procesos no se verán hasta la próxima recarga"
+            )
+        if self._tarea is None:
+            self._tarea = asyncio.create_task(self._escuchar())
+
+    async def detener(self) -> None:
+        tareas = [self._tarea, *self._recargas.values()]
+        for tarea in tareas:
+            if tarea is not None:
+                tarea.cancel()
+        self._tarea = None
+        self._recargas.clear()
+        self._pendientes.clear()
+        await self._cerrar_conexion()
+
+    async def _escuchar(self) -> None:
+        import asyncpg
+        from ...core.config import get_settings
+
+        settings = get_settings()
+        while True:
+            try:
+                self._conexion = await asyncpg.connect(
+                    host=settings.db_session_host or settings.db_host,
+                    port=settings.db_session_port if settings.db_session_host else settings.db_port,
+                    database=settings.db_name,
+                    user=settings.db_user, password=settings.db_password,
+                )
+                for canal in self._suscripciones:
+                    await self._conexion.add_listener(canal, self._al_notificar)
+                for canal in self._suscripciones:
+                    self.programar_recarga(canal)
+                while not self._conexion.is_closed():
+                    await asyncio.sleep(ESPERA_RECONEXION)
+                logger.warning("Conexión de LISTEN cerrada")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Escucha de NOTIFY caída: {e}")
+            finally:
+                await self._cerrar_conexion()
+            await asyncio.sleep(ESPERA_RECONEXION)
+
+    def _al_notificar(self, conexion, pid, canal, payload) -> None:
+        logger.debug(f"Aviso en {canal}: {payload}")
+        self.programar_recarga(canal)
+
+    def programar_recarga(self, canal: str) -> None:
+        """Programa la recarga del suscriptor de ``canal`` (requiere bucle de eventos)."""
+        if canal not in self._suscripciones:
+            return
+        tarea = self._recargas.get(canal)
+        if tarea is None or tarea.done():
+            self._recargas[canal] = asyncio.get_running_loop().create_task(self._recargar(canal))
+        else:
+            self._pendientes.add(canal)
+
+    async def _recargar(self, canal: str) -> None:
+        while True:
+            await asyncio.sleep(RETARDO_RECARGA)
+            # Lo que llegue a partir de aquí puede no verlo esta recarga
+            self._pendientes.discard(canal)
+            try:
+                await self._suscripciones[canal]()
+            except Exception as e:
+                logger.error(f"Error recargando tras aviso en {canal}: {e}")
+            if canal not in self._pendientes:
+                return
+
+    async def _cerrar_conexion(self) -> None:
+        conexion, self._conexion = self._conexion, None
+        if conexion is not None and not conexion.is_closed():
+            try:
+                await conexion.close()
+            except Exception:
+                pass
+
+
+_escucha: Optional[EscuchaPostgres] = None
+
+
+def get_escucha_postgres() -> EscuchaPostgres:
+    """Obtiene la escucha de NOTIFY del proceso."""
+    global _escucha
+    if _escucha is None:
+        _escucha = EscuchaPostgres()
+    return _escucha
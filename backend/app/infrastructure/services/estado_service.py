@@ -1,12 +1,19 @@
-"""Servicio para gestionar cambios de estado de entidades."""
+"""Servicio para gestionar cambios de estado de entidades.
+
+Los códigos de estado se resuelven con el registro de estados en memoria
+(``registro_estados``) y las transiciones se validan con la máquina de
+estados declarada en cada modelo (``maquinas_estado``); los modelos sin
+``TRANSICIONES`` solo impiden salir de un estado final o repetir estado.
+"""
 
 import logging
-from typing import Optional, Type, List
-from sqlalchemy import select
+from typing import Any, Dict, Iterable, Optional, List
+from sqlalchemy import Uuid, any_, bindparam, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.inspection import inspect
 
-from ..base_model import BaseModel
+from ..maquinas_estado import CampoEstado, campo_estado, maquina_de
+from ..registro_estados import InfoEstado, registro_estados
 
 logger = logging.getLogger(__name__)
 
@@ -19,62 +26,168 @@ class EstadoService:
 
     async def cambiar_estado(self, entidad, nuevo_estado_codigo: str,
                             usuario_id: Optional[str] = None, motivo: Optional[str] = None):
-        """Cambia el estado de cualquier entidad que tenga un campo de estado."""
+        """Cambia el estado de una entidad si la transición está permitida."""
         from ...domains.core.models.estados import HistorialEstado
         import uuid
 
-        # Obtener el tipo de entidad
         entidad_tipo = entidad.__class__.__name__.lower()
+        campo = self._get_campo_estado(entidad.__class__)
 
-        # Buscar el campo de estado en la entidad
-        estado_field = None
-        mapper = inspect(entidad.__class__)
-
-        for prop in mapper.attrs:
-            if hasattr(prop, 'columns') and 'estado' in prop.key:
-                estado_field = prop.key
-                break
-
-        if not estado_field:
-            raise ValueError(f"La entidad {entidad_tipo} no tiene un campo de estado")
-
-        # Obtener estado anterior
-        estado_anterior = getattr(entidad, estado_field)
-        estado_anterior_codigo = estado_anterior.codigo if estado_anterior else None
-
-        # Buscar el nuevo estado
-        estado_class = self._get_estado_class(entidad_tipo)
-        if not estado_class:
-            raise ValueError(f"No se encontró clase de estado para {entidad_tipo}")
-
-        result = await self.session.execute(
-            select(estado_class).where(estado_class.codigo == nuevo_estado_codigo)
-        )
-        nuevo_estado = result.scalar_one_or_none()
-
+        await registro_estados.asegurar_cargado()
+        nuevo_estado = registro_estados.buscar(campo.tabla, nuevo_estado_codigo)
         if not nuevo_estado:
             raise ValueError(f"Estado {nuevo_estado_codigo} no encontrado para {entidad_tipo}")
 
-        # Actualizar el estado
-        setattr(entidad, estado_field, nuevo_estado)
+        estado_anterior_id = getattr(entidad, campo.atributo)
+        estado_anterior = registro_estados.estado(estado_anterior_id)
+        if not self._es_transicion_permitida(entidad, estado_anterior, nuevo_estado):
+            raise ValueError(f"Transición no permitida para {entidad_tipo}: "
+                             f"{estado_anterior.codigo} -> {nuevo_estado.codigo}")
+
+        # Actualizar el estado y aplicar los efectos de la transición
+        setattr(entidad, campo.atributo, nuevo_estado.id)
+        maquina = maquina_de(entidad.__class__)
+        transicion = maquina.transicion(estado_anterior.codigo, nuevo_estado.codigo) if maquina and estado_anterior else None
+        if transicion is not None:
+            for atributo, valor in (transicion.valores or {}).items():
+                setattr(entidad, atributo, valor)
+            if transicion.efecto is not None:
+                transicion.efecto(entidad)
 
         # Registrar en historial
         historial = HistorialEstado(
             id=uuid.uuid4(),
             entidad_tipo=entidad_tipo,
-            entidad_id=str(entidad.id),
-            estado_anterior_codigo=estado_anterior_codigo,
-            estado_nuevo_codigo=nuevo_estado_codigo,
+            entidad_id=entidad.id,
+            estado_tabla=campo.tabla,
+            estado_anterior_id=estado_anterior_id,
+            estado_nuevo_id=nuevo_estado.id,
             usuario_id=usuario_id,
             motivo=motivo
         )
         self.session.add(historial)
 
         logger.info(f"Estado cambiado: {entidad_tipo}:{entidad.id} "
-                   f"{estado_anterior_codigo}->{nuevo_estado_codigo}")
+                   f"{estado_anterior.codigo if estado_anterior else None}->{nuevo_estado.codigo}")
 
         return historial
 
+    async def cambiar_estado_masivo(self, modelo, nuevo_estado_codigo: str,
+                                    ids: Optional[Iterable] = None, filtro: Optional[Any] = None,
+                                    usuario_id: Optional[str] = None, motivo: Optional[str] = None) -> int:
+        """Cambia de estado en bloque las entidades de ``modelo`` seleccionadas.
+
+        Las entidades se eligen por ``ids`` y/o ``filtro`` (condición o lista de
+        condiciones sobre ``modelo``, p. ej. ``CuotaAnual.ejercicio == 2025``).
+        La transición se valida en SQL: solo cambian las filas cuyo estado
+        actual es origen de una transición sin guarda ni efecto hacia el nuevo
+        estado (sin máquina declarada: las que no están en un estado final ni
+        en el nuevo estado); las filas sin estado cambian siempre. Cada transición aplicable es un único
+        ``UPDATE ... RETURNING`` que devuelve el estado anterior, y el
+        historial se inserta con INSERT multi-fila. Devuelve cuántas
+        entidades han cambiado.
+        """
+        from ...domains.core.models.estados import HistorialEstado
+
+        if ids is None and filtro is None:
+            raise ValueError("Indica ids o filtro para el cambio de estado masivo")
+
+        entidad_tipo = modelo.__name__.lower()
+        campo = self._get_campo_estado(modelo)
+
+        await registro_estados.asegurar_cargado()
+        nuevo_estado = registro_estados.buscar(campo.tabla, nuevo_estado_codigo)
+        if not nuevo_estado:
+            raise ValueError(f"Estado {nuevo_estado_codigo} no encontrado para {entidad_tipo}")
+
+        condiciones = []
+        if ids is not None:
+            # Un único parámetro array en lugar de un IN con un parámetro por id
+            condiciones.append(modelo.id == any_(bindparam('ids_masivo', list(ids), type_=ARRAY(Uuid))))
+        if filtro is not None:
+            condiciones.extend(filtro if isinstance(filtro, (list, tuple)) else [filtro])
+        if 'eliminado' in modelo.__table__.c:
+            condiciones.append(modelo.eliminado == False)
+
+        columna = getattr(modelo, campo.atributo)
+        maquina = maquina_de(modelo)
+        if maquina is None:
+            excluidos = [estado.id for estado in registro_estados.estados(campo.tabla, solo_activos=False)
+                         if estado.es_final or estado.id == nuevo_estado.id]
+            # Sin estado se puede pasar a cualquiera (como en cambiar_estado); NOT IN
+            # daría NULL para esas filas y las saltaría
+            grupos = [(or_(columna.is_(None), columna.notin_(excluidos)), {})]
+        else:
+            # Las filas sin estado pasan a cualquiera, sin valores de transición
+            grupos = [(columna.is_(None), {})]
+            for transicion, origenes in maquina.masivas(nuevo_estado.codigo):
+                origen_estados = (registro_estados.buscar(campo.tabla, codigo) for codigo in origenes)
+                ids_origen = [estado.id for estado in origen_estados if estado is not None]
+                if ids_origen:
+                    grupos.append((columna.in_(ids_origen), transicion.valores or {}))
+
+        cambiados = []
+        for condicion_origen, valores in grupos:
+            valores = {**valores, campo.atributo: nuevo_estado.id}
+            if usuario_id and 'modificado_por_id' in modelo.__table__.c:
+                valores['modificado_por_id'] = usuario_id
+            cambiados.extend(await self._actualizar_en_bloque(modelo, campo, [condicion_origen, *condiciones], valores))
+        if not cambiados:
+            return 0
+
+        await self.session.execute(insert(HistorialEstado), [
+            {
+                'entidad_tipo': entidad_tipo,
+                'entidad_id': entidad_id,
+                'estado_tabla': campo.tabla,
+                'estado_anterior_id': estado_anterior_id,
+                'estado_nuevo_id': nuevo_estado.id,
+                'usuario_id': usuario_id,
+                'motivo': motivo,
+            }
+            for entidad_id, estado_anterior_id in cambiados
+        ])
+
+        logger.info(f"Estado cambiado en bloque: {len(cambiados)} {entidad_tipo} -> {nuevo_estado.codigo}")
+        return len(cambiados)
+
+    async def _actualizar_en_bloque(self, modelo, campo: CampoEstado, condiciones: list,
+                                    valores: Dict[str, Any]) -> list:
+        """UPDATE de las filas que cumplen ``condiciones``; devuelve ``(id, estado anterior)``."""
+        # El subselect bloquea las filas y conserva el estado anterior para el historial
+        previo = (
+            select(modelo.id.label('id'), getattr(modelo, campo.atributo).label('anterior'))
+            .where(*condiciones)
+            .with_for_update()
+            .subquery('previo')
+        )
+        result = await self.session.execute(
+            update(modelo)
+            .where(modelo.id == previo.c.id)
+            .values(valores)
+            .returning(modelo.id, previo.c.anterior)
+            .execution_options(synchronize_session=False)
+        )
+        return result.all()
+
+    def _get_campo_estado(self, modelo) -> CampoEstado:
+        """Columna de estado de ``modelo`` (resuelta una vez por clase)."""
+        campo = campo_estado(modelo)
+        if campo is None:
+            raise ValueError(f"La entidad {modelo.__name__.lower()} no tiene un campo de estado")
+        return campo
+
+    def _es_transicion_permitida(self, entidad, actual: Optional[InfoEstado], nuevo: InfoEstado) -> bool:
+        if actual is None:
+            return True  # Si no hay estado actual, cualquier transición es válida
+
+        maquina = maquina_de(entidad.__class__)
+        if maquina is not None:
+            return maquina.permite(entidad, actual.codigo, nuevo.codigo)
+
+        # Sin máquina declarada: no se sale de un estado final ni se repite estado
+        return not actual.es_final and actual.id != nuevo.id
+
     def _get_estado_class(self, entidad_tipo: str):
         """Obtiene la clase de estado correspondiente al tipo de entidad."""
         from ...domains.core.models import estados
@@ -94,88 +207,49 @@ class EstadoService:
 
         return estado_mapping.get(entidad_tipo)
 
-    async def get_estados_disponibles(self, entidad_tipo: str, es_inicial: bool = False) -> List:
+    async def get_estados_disponibles(self, entidad_tipo: str, es_inicial: bool = False) -> List[InfoEstado]:
         """Obtiene todos los estados disponibles para un tipo de entidad."""
         estado_class = self._get_estado_class(entidad_tipo)
         if not estado_class:
             return []
 
-        stmt = select(estado_class).where(estado_class.activo == True)
+        await registro_estados.asegurar_cargado()
+        estados = registro_estados.estados(estado_class)
 
         if es_inicial:
-            stmt = stmt.where(estado_class.es_inicial == True)
-
-        stmt = stmt.order_by(estado_class.orden)
+            estados = [estado for estado in estados if estado.es_inicial]
 
-        result = await self.session.execute(stmt)
-        return result.scalars().all()
+        return estados
 
     async def get_estado_actual(self, entidad) -> Optional[str]:
         """Obtiene el código del estado actual de una entidad."""
-        estado_field = None
-        mapper = inspect(entidad.__class__)
-
-        for prop in mapper.attrs:
-            if hasattr(prop, 'columns') and 'estado' in prop.key:
-                estado_field = prop.key
-                break
-
-        if estado_field:
-            estado = getattr(entidad, estado_field)
-            return estado.codigo if estado else None
+        campo = campo_estado(entidad.__class__)
+        if campo:
+            await registro_estados.asegurar_cargado()
+            return registro_estados.codigo_de(getattr(entidad, campo.atributo))
 
         return None
 
     async def es_estado_final(self, entidad) -> bool:
         """Verifica si la entidad está en un estado final."""
-        estado_field = None
-        mapper = inspect(entidad.__class__)
-
-        for prop in mapper.attrs:
-            if hasattr(prop, 'columns') and 'estado' in prop.key:
-                estado_field = prop.key
-                break
-
-        if estado_field:
-            estado = getattr(entidad, estado_field)
+        campo = campo_estado(entidad.__class__)
+        if campo:
+            await registro_estados.asegurar_cargado()
+            estado = registro_estados.estado(getattr(entidad, campo.atributo))
             return estado.es_final if estado else False
 
         return False
 
     async def es_transicion_valida(self, entidad, nuevo_estado_codigo: str) -> bool:
         """Valida si una transición de estado es válida."""
-        estado_actual = await self.get_estado_actual(entidad)
-        if not estado_actual:
+        campo = campo_estado(entidad.__class__)
+        if not campo or getattr(entidad, campo.atributo) is None:
             return True  # Si no hay estado actual, cualquier transición es válida
 
-        estado_class = self._get_estado_class(entidad.__class__.__name__.lower())
-        if not estado_class:
-            return False
-
-        # Obtener el estado actual de la BD
-        result_actual = await self.session.execute(
-            select(estado_class).where(estado_class.codigo == estado_actual)
-        )
-        estado_actual_obj = result_actual.scalar_one_or_none()
-
-        if not estado_actual_obj:
-            return True
-
-        # Obtener el nuevo estado
-        result_nuevo = await self.session.execute(
-            select(estado_class).where(estado_class.codigo == nuevo_estado_codigo)
-        )
-        nuevo_estado_obj = result_nuevo.scalar_one_or_none()
-
-        if not nuevo_estado_obj:
-            return False
-
-        # Regla básica: no se puede cambiar desde un estado final
-        if estado_actual_obj.es_final:
-            return False
-
-        # Regla básica: no se puede cambiar al mismo estado
-        if estado_actual == nuevo_estado_codigo:
+        await registro_estados.asegurar_cargado()
+        nuevo_estado = registro_estados.buscar(campo.tabla, nuevo_estado_codigo)
+        if not nuevo_estado:
             return False
 
-        return True
+        estado_actual = registro_estados.estado(getattr(entidad, campo.atributo))
+        return self._es_transicion_permitida(entidad, estado_actual, nuevo_estado)
@@ -0,0 +1,138 @@
+"""Limitador de tasa GCRA sobre ``CacheService``.
+
+GCRA (*Generic Cell Rate Algorithm*) equivale a una ventana deslizante con
+ráfaga, pero guarda un único número por clave: el instante teórico de
+llegada (TAT) de la siguiente petición. Un ``Limite`` de ``peticiones`` por
+``periodo`` reparte el periodo en intervalos de ``periodo / peticiones`` y
+admite una ráfaga de hasta ``rafaga`` peticiones seguidas (por defecto todo
+el presupuesto); el presupuesto se recupera de forma continua, una petición
+por intervalo, en lugar de reiniciarse de golpe al acabar una ventana fija.
+
+Con Redis, leer el TAT, decidir y guardarlo es un único script Lua (atómico
+entre procesos, sin carreras entre el incremento y el TTL) que toma la hora
+del propio Redis. Sin Redis, o si el script falla, se aplica el mismo
+algoritmo en memoria, con el límite por proceso.
+"""
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from .cache_memoria import CacheMemoria
+from .cache_service import CacheService, get_cache_service, generar_cache_key
+
+# Claves de límite que se conservan en memoria cuando no hay Redis
+MAX_CLAVES_MEMORIA = 50_000
+
+# KEYS[1]: TAT en ms; ARGV: intervalo (ms), tolerancia (ms), coste.
+# Devuelve {1, ms hasta vaciar el cubo} si se admite, {0, ms de espera} si no.
+_LUA_GCRA = """
+local intervalo = tonumber(ARGV[1])
+local tolerancia = tonumber(ARGV[2])
+local coste = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local ahora = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1]) or ahora)
+if tat < ahora then
+    tat = ahora
+end
+local nuevo = tat + intervalo * coste
+if nuevo - tolerancia > ahora then
+    return {0, nuevo - tolerancia - ahora}
+end
+if coste > 0 then
+    redis.call('SET', KEYS[1], nuevo, 'PX', nuevo - ahora)
+end
+return {1, nuevo - ahora}
+"""
+
+
+@dataclass(frozen=True)
+class Limite:
+    """``peticiones`` cada ``periodo`` segundos, con ráfagas de hasta ``rafaga``."""
+    nombre: str
+    peticiones: int
+    periodo: float
+    rafaga: Optional[int] = None
+
+    @property
+    def intervalo_ms(self) -> int:
+        return max(1, round(self.periodo * 1000 / max(1, self.peticiones)))
+
+    @property
+    def tolerancia_ms(self) -> int:
+        return self.intervalo_ms * (self.rafaga or self.peticiones)
+
+
+@dataclass(frozen=True)
+class ResultadoLimite:
+    """Decisión del limitador para una petición."""
+    permitido: bool
+    restantes: int
+    reintentar_en: float = 0.0  # segundos hasta que se admita la siguiente
+    reinicio_en: float = 0.0    # segundos hasta recuperar el presupuesto completo
+
+
+class LimitadorTasa:
+    """Limitador GCRA atómico en Redis con el mismo algoritmo en memoria."""
+
+    def __init__(self, cache: Optional[CacheService] = None, max_claves_memoria: int = MAX_CLAVES_MEMORIA):
+        self.cache = cache or get_cache_service()
+        self._memoria = CacheMemoria(max_entradas=max_claves_memoria)
+        self._lock = threading.Lock()
+
+    async def consumir(self, limite: Limite, identificador: str, coste: int = 1) -> ResultadoLimite:
+        """Consume ``coste`` del presupuesto de ``identificador`` si cabe."""
+        key = generar_cache_key('limite', limite.nombre, identificador)
+        respuesta = await self.cache.aejecutar_script(
+            _LUA_GCRA, [key], [limite.intervalo_ms, limite.tolerancia_ms, coste]
+        )
+        if respuesta is None:
+            permitido, ms = self._gcra_memoria(key, limite, coste)
+        else:
+            permitido, ms = int(respuesta[0]) == 1, int(respuesta[1])
+        return _resultado(limite, permitido, ms, coste)
+
+    async def consultar(self, limite: Limite, identificador: str) -> ResultadoLimite:
+        """Estado del presupuesto sin consumir nada."""
+        return await self.consumir(limite, identificador, coste=0)
+
+    async def reiniciar(self, limite: Limite, identificador: str) -> None:
+        """Devuelve a ``identificador`` su presupuesto completo."""
+        key = generar_cache_key('limite', limite.nombre, identificador)
+        await self.cache.adelete(key)
+        self._memoria.delete(key)
+
+    def _gcra_memoria(self, key: str, limite: Limite, coste: int) -> Tuple[bool, int]:
+        """El script ``_LUA_GCRA`` sobre la memoria del proceso."""
+        intervalo, tolerancia = limite.intervalo_ms, limite.tolerancia_ms
+        with self._lock:
+            ahora = int(time.monotonic() * 1000)
+            tat = max(self._memoria.get(key, ahora), ahora)
+            nuevo = tat + intervalo * coste
+            if nuevo - tolerancia > ahora:
+                return False, nuevo - tolerancia - ahora
+            if coste > 0:
+                self._memoria.set(key, nuevo, math.ceil((nuevo - ahora) / 1000))
+            return True, nuevo - ahora
+
+
+def _resultado(limite: Limite, permitido: bool, ms: int, coste: int) -> ResultadoLimite:
+    if not permitido:
+        return ResultadoLimite(permitido=False, restantes=0, reintentar_en=ms / 1000,
+                               reinicio_en=(ms + limite.tolerancia_ms - limite.intervalo_ms * coste) / 1000)
+    restantes = max(0, (limite.tolerancia_ms - ms) // limite.intervalo_ms)
+    return ResultadoLimite(permitido=True, restantes=restantes, reinicio_en=ms / 1000)
+
+
+_limitador: Optional[LimitadorTasa] = None
+
+
+def get_limitador_tasa() -> LimitadorTasa:
+    """Obtiene el limitador de tasa del proceso."""
+    global _limitador
+    if _limitador is None:
+        _limitador = LimitadorTasa()
+    return _limitador
@@ -0,0 +1,212 @@
+"""Lista de IPs bloqueadas en memoria, con rangos CIDR y expiración.
+
+Se carga de ``ips_bloqueadas`` (``IPBloqueada``), cuyo ``ip_address`` puede
+ser una dirección (``203.0.113.7``) o una red (``203.0.113.0/24``,
+``2001:db8::/32``). Las redes se guardan por versión de IP y longitud de
+prefijo en dicts ``{prefijo (int): expira}``: comprobar una dirección es
+desplazar su entero y buscarlo en cada longitud presente (unas pocas), sin
+consultas ni objetos ``ip_network`` por petición. Una IPv4 mapeada en IPv6
+(``::ffff:203.0.113.7``) se comprueba como IPv4.
+
+Cada entrada caduca en ``fecha_desbloqueo`` (las permanentes nunca), y la
+expiración se comprueba al consultar. La lista se sincroniza de forma
+incremental: el trigger de la migración ``j9k0l1m2n3o4`` emite ``NOTIFY`` en
+``CANAL_IPS_BLOQUEADAS`` y solo se releen las filas creadas o modificadas
+desde la última sincronización. Cada ``RECARGA_COMPLETA`` segundos se
+recarga entera para recoger los borrados físicos.
+"""
+
+import ipaddress
+import logging
+import math
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, or_, select
+
+from .escucha_postgres import get_escucha_postgres
+
+logger = logging.getLogger(__name__)
+
+CANAL_IPS_BLOQUEADAS = 'ips_bloqueadas_cambios'
+
+# Tras este tiempo, la siguiente sincronización recarga la tabla completa
+RECARGA_COMPLETA = 300
+
+# Margen al releer cambios: cubre transacciones confirmadas después de la
+# última sincronización con ``fecha_modificacion`` anterior a ella
+SOLAPE_SINCRONIZACION = timedelta(seconds=60)
+
+# prefijo (bits de red como entero) -> expiración (epoch; inf si es permanente)
+Redes = Dict[int, float]
+
+
+class ListaBloqueoIP:
+    """IPs y redes bloqueadas indexadas por versión y longitud de prefijo."""
+
+    def __init__(self):
+        # versión -> longitud de prefijo -> redes
+        self._redes: Dict[int, Dict[int, Redes]] = {4: {}, 6: {}}
+        # versión -> [(longitud, redes)] de las longitudes con alguna red, de más a menos específica
+        self._tablas: Dict[int, List[Tuple[int, Redes]]] = {4: [], 6: []}
+        # id de fila -> (versión, longitud, prefijo), para aplicar cambios y bajas
+        self._por_id: Dict[uuid.UUID, Tuple[int, int, int]] = {}
+        self._marca: Optional[datetime] = None
+        self._ultima_completa = 0.0
+        self.cargado = False
+
+    # === Consulta (síncrona, sin E/S) ===
+
+    def expira(self, ip: str) -> Optional[float]:
+        """Epoch en que expira el bloqueo de ``ip`` (inf si es permanente), o None si no lo está."""
+        try:
+            direccion = ipaddress.ip_address(ip)
+        except ValueError:
+            return None
+        if direccion.version == 6 and direccion.ipv4_mapped is not None:
+            direccion = direccion.ipv4_mapped
+
+        valor, bits = int(direccion), direccion.max_prefixlen
+        ahora = time.time()
+        for longitud, redes in self._tablas[direccion.version]:
+            expira = redes.get(valor >> (bits - longitud))
+            if expira is not None and expira > ahora:
+                return expira
+        return None
+
+    def esta_bloqueada(self, ip: str) -> bool:
+        return self.expira(ip) is not None
+
+    def segundos_restantes(self, ip: str) -> Optional[int]:
+        """Segundos de bloqueo que quedan; -1 si es permanente, None si no está bloqueada."""
+        expira = self.expira(ip)
+        if expira is None:
+            return None
+        return -1 if math.isinf(expira) else max(1, math.ceil(expira - time.time()))
+
+    # === Actualización local ===
+
+    def bloquear(self, ip: str, hasta: Optional[datetime] = None, fila_id: Optional[uuid.UUID] = None) -> None:
+        """Bloquea ``ip`` (dirección o red) hasta ``hasta`` (UTC), o para siempre si es None."""
+        try:
+            red = ipaddress.ip_network(ip, strict=False)
+        except ValueError:
+            logger.error(f"IP o red inválida en la lista de bloqueo: {ip}")
+            return
+        if red.version == 6 and red.network_address.ipv4_mapped is not None and red.prefixlen >= 96:
+            red = ipaddress.ip_network(f"{red.network_address.ipv4_mapped}/{red.prefixlen - 96}")
+
+        if fila_id is not None:
+            self._quitar(fila_id)
+        longitud = red.prefixlen
+        prefijo = int(red.network_address) >> (red.max_prefixlen - longitud)
+        expira = math.inf if hasta is None else _epoch(hasta)
+        redes = self._redes[red.version].setdefault(longitud, {})
+        redes[prefijo] = max(expira, redes.get(prefijo, 0.0))
+        if fila_id is not None:
+            self._por_id[fila_id] = (red.version, longitud, prefijo)
+        self._reindexar(red.version)
+
+    def _quitar(self, fila_id: uuid.UUID) -> None:
+        ubicacion = self._por_id.pop(fila_id, None)
+        if ubicacion is None:
+            return
+        version, longitud, prefijo = ubicacion
+        redes = self._redes[version].get(longitud, {})
+        redes.pop(prefijo, None)
+        if not redes:
+            self._redes[version].pop(longitud, None)
+        self._reindexar(version)
+
+    def _reindexar(self, version: int) -> None:
+        self._tablas[version] = sorted(self._redes[version].items(), reverse=True)
+
+    # === Carga ===
+
+    async def cargar(self, session_factory=None) -> None:
+        """Carga todas las IPs bloqueadas vigentes desde la base de datos."""
+        from ...core.database import async_session
+        from ...domains.core.models.seguridad import IPBloqueada
+
+        async with (session_factory or async_session)() as session:
+            filas = (await session.execute(
+                select(IPBloqueada).where(
+                    IPBloqueada.eliminado == False,
+                    or_(IPBloqueada.bloqueado_permanente == True,
+                        IPBloqueada.fecha_desbloqueo > datetime.utcnow()),
+                )
+            )).scalars().all()
+            marca = (await session.execute(
+                select(func.max(func.coalesce(IPBloqueada.fecha_modificacion, IPBloqueada.fecha_creacion)))
+            )).scalar()
+
+        nueva = ListaBloqueoIP()
+        for fila in filas:
+            nueva._aplicar(fila)
+
+        # Sustitución atómica: los lectores ven la lista anterior o la nueva
+        self._redes, self._tablas, self._por_id = nueva._redes, nueva._tablas, nueva._por_id
+        self._marca = marca
+        self._ultima_completa = time.monotonic()
+        self.cargado = True
+        logger.info(f"Lista de bloqueo de IPs cargada: {len(filas)} entradas")
+
+    async def sincronizar(self, session_factory=None) -> None:
+        """Aplica las filas creadas o modificadas desde la última sincronización."""
+        from ...core.database import async_session
+        from ...domains.core.models.seguridad import IPBloqueada
+
+        if (not self.cargado or self._marca is None
+                or time.monotonic() - self._ultima_completa > RECARGA_COMPLETA):
+            await self.cargar(session_factory)
+            return
+
+        cambio = func.coalesce(IPBloqueada.fecha_modificacion, IPBloqueada.fecha_creacion)
+        async with (session_factory or async_session)() as session:
+            filas = (await session.execute(
+                select(IPBloqueada).where(cambio >= self._marca - SOLAPE_SINCRONIZACION)
+            )).scalars().all()
+
+        for fila in filas:
+            self._aplicar(fila)
+            self._marca = max(self._marca, fila.fecha_modificacion or fila.fecha_creacion)
+        logger.debug(f"Lista de bloqueo de IPs sincronizada: {len(filas)} cambios")
+
+    def _aplicar(self, fila) -> None:
+        """Refleja una fila de ``IPBloqueada``: la añade si está vigente y si no la quita."""
+        if not fila.eliminado and fila.esta_bloqueada():
+            self.bloquear(fila.ip_address, None if fila.bloqueado_permanente else fila.fecha_desbloqueo, fila.id)
+        else:
+            self._quitar(fila.id)
+
+    async def asegurar_cargado(self) -> None:
+        if not self.cargado:
+            await self.cargar()
+
+    async def iniciar(self) -> None:
+        """Carga la lista y se suscribe a los avisos de cambio. No falla si no hay base de datos."""
+        try:
+            await self.cargar()
+        except Exception as e:
+            logger.error(f"No se pudo cargar la lista de bloqueo de IPs: {e}")
+        get_escucha_postgres().suscribir(CANAL_IPS_BLOQUEADAS, self.sincronizar)
+
+
+def _epoch(fecha: datetime) -> float:
+    """Epoch de una fecha naive en UTC (como las que guarda ``datetime.utcnow()``)."""
+    if fecha.tzinfo is None:
+        fecha = fecha.replace(tzinfo=timezone.utc)
+    return fecha.timestamp()
+
+
+_lista: Optional[ListaBloqueoIP] = None
+
+
+def get_lista_bloqueo_ip() -> ListaBloqueoIP:
+    """Obtiene la lista de bloqueo de IPs del proceso."""
+    global _lista
+    if _lista is None:
+        _lista = ListaBloqueoIP()
+    return _lista
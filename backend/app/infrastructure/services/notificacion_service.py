@@ -106,7 +106,7 @@ class NotificacionService:
 
         # Invalidar caché de notificaciones no leídas
         cache_key = generar_cache_key("notificaciones_no_leidas", str(usuario_id))
-        self.cache.delete(cache_key)
+        await self.cache.adelete(cache_key)
 
         return notificacion
 
@@ -164,27 +164,21 @@ class NotificacionService:
             Número de notificaciones no leídas
         """
         cache_key = generar_cache_key("notificaciones_no_leidas", str(usuario_id))
-        count = self.cache.get(cache_key)
 
-        if count is not None:
-            return count
-
-        stmt = select(func.count(Notificacion.id)).where(
-            and_(
-                Notificacion.usuario_id == usuario_id,
-                Notificacion.leida == False,
-                Notificacion.archivada == False,
-                Notificacion.eliminado == False
+        async def contar() -> int:
+            stmt = select(func.count(Notificacion.id)).where(
+                and_(
+                    Notificacion.usuario_id == usuario_id,
+                    Notificacion.leida == False,
+                    Notificacion.archivada == False,
+                    Notificacion.eliminado == False
+                )
             )
-        )
-
-        result = await self.session.execute(stmt)
-        count = result.scalar() or 0
-
-        # Cachear por 5 minutos
-        self.cache.set(cache_key, count, ttl=300)
+            result = await self.session.execute(stmt)
+            return result.scalar() or 0
 
-        return count
+        # Cachear por 5 minutos; las peticiones concurrentes comparten la consulta
+        return await self.cache.get_or_compute(cache_key, contar, ttl=300)
 
     async def marcar_como_leida(self, notificacion_id: uuid.UUID, usuario_id: uuid.UUID) -> bool:
         """
@@ -214,7 +208,7 @@ class NotificacionService:
 
         # Invalidar caché
         cache_key = generar_cache_key("notificaciones_no_leidas", str(usuario_id))
-        self.cache.delete(cache_key)
+        await self.cache.adelete(cache_key)
 
         logger.info(f"Notificación {notificacion_id} marcada como leída")
         return True
@@ -249,7 +243,7 @@ class NotificacionService:
 
         # Invalidar caché
         cache_key = generar_cache_key("notificaciones_no_leidas", str(usuario_id))
-        self.cache.delete(cache_key)
+        await self.cache.adelete(cache_key)
 
         logger.info(f"{count} notificaciones marcadas como leídas para usuario {usuario_id}")
         return count
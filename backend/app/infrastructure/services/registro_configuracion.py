@@ -0,0 +1,213 @@
+"""Registro de configuración compartido por todo el proceso.
+
+``ConfiguracionService`` se crea por request (``SeguridadService`` crea uno
+en cada login), así que su caché por instancia no evitaba consultar
+``configuraciones`` una y otra vez. El registro carga al arrancar todas las
+filas de ``configuraciones`` y las reglas activas de
+``reglas_validacion_config`` y las sirve desde memoria.
+
+Para enterarse de los cambios hechos por otros procesos (u otras réplicas),
+los triggers de la migración ``h7i8j9k0l1m2`` emiten ``NOTIFY`` en el canal
+``CANAL_CONFIGURACION`` tras cada escritura en esas dos tablas. El registro
+se suscribe al canal en ``EscuchaPostgres`` y, al recibir un aviso, se recarga
+completo (son pocas filas). ``EscuchaPostgres`` lo recarga también cada vez
+que (re)conecta, y por si aun así se pierde algún aviso hay una recarga
+completa cada ``RECARGA_PERIODICA`` segundos.
+
+Mientras el registro no está cargado (scripts, tests, base de datos sin
+acceso al arrancar), ``ConfiguracionService`` consulta la base de datos como
+antes.
+"""
+
+import asyncio
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Pattern
+
+from sqlalchemy import select
+
+from .escucha_postgres import get_escucha_postgres
+
+logger = logging.getLogger(__name__)
+
+CANAL_CONFIGURACION = 'configuraciones_cambios'
+
+# Recarga completa de respaldo: acota cuánto tarda en verse un cambio si se pierde el aviso
+RECARGA_PERIODICA = 300
+
+
+@dataclass(frozen=True)
+class ReglaConfig:
+    """``ReglaValidacionConfig`` activa compilada para aplicarla en memoria.
+
+    El patrón se compila una vez, así que aplicar la regla no hace E/S ni
+    compila nada.
+    """
+    config_clave: str
+    tipo_dato: str
+    min_valor: Optional[float] = None
+    max_valor: Optional[float] = None
+    max_longitud: Optional[int] = None
+    decimales: Optional[int] = None
+    patron: Optional[Pattern] = None
+    mensaje_error: Optional[str] = None
+
+    @classmethod
+    def desde_modelo(cls, regla) -> 'ReglaConfig':
+        patron = None
+        if regla.pattern_regex is not None:
+            try:
+                patron = re.compile(regla.pattern_regex)
+            except re.error as e:
+                logger.error(f"Patrón inválido en la regla de {regla.config_clave}: {e}")
+        return cls(
+            config_clave=regla.config_clave,
+            tipo_dato=regla.tipo_dato,
+            min_valor=regla.min_valor,
+            max_valor=regla.max_valor,
+            max_longitud=regla.max_longitud,
+            decimales=regla.decimales,
+            patron=patron,
+            mensaje_error=regla.mensaje_error,
+        )
+
+    def limitar_int(self, valor: int) -> int:
+        """Ajusta el valor al rango [min_valor, max_valor]."""
+        if self.min_valor is not None and valor < self.min_valor:
+            return int(self.min_valor)
+        if self.max_valor is not None and valor > self.max_valor:
+            return int(self.max_valor)
+        return valor
+
+    def limitar_float(self, valor: float) -> float:
+        """Ajusta el valor al rango y lo redondea a ``decimales``."""
+        if self.min_valor is not None and valor < self.min_valor:
+            return self.min_valor
+        if self.max_valor is not None and valor > self.max_valor:
+            return self.max_valor
+        if self.decimales is not None:
+            return round(valor, self.decimales)
+        return valor
+
+    def limitar_string(self, valor: str, default: str) -> str:
+        """Recorta a ``max_longitud``; ``default`` si no cumple el patrón."""
+        if self.max_longitud is not None and len(valor) > self.max_longitud:
+            valor = valor[:self.max_longitud]
+        if self.patron is not None and not self.patron.match(valor):
+            return default
+        return valor
+
+    def cumple_patron(self, valor: Any) -> bool:
+        return self.patron is None or self.patron.match(str(valor)) is not None
+
+class RegistroConfiguracion:
+    """Valores de configuración y reglas de validación en memoria."""
+
+    def __init__(self):
+        self._valores: Dict[str, Any] = {}
+        self._grupos: Dict[str, Dict[str, Any]] = {}
+        self._reglas: Dict[str, ReglaConfig] = {}
+        self._tarea_recarga: Optional[asyncio.Task] = None
+        self.cargado = False
+
+    # === Lectura (O(1), sin E/S) ===
+
+    def contiene(self, clave: str) -> bool:
+        return clave.upper() in self._valores
+
+    def valor(self, clave: str, default: Any = None) -> Any:
+        return self._valores.get(clave.upper(), default)
+
+    def grupo(self, grupo: str) -> Dict[str, Any]:
+        return dict(self._grupos.get(grupo, {}))
+
+    def regla(self, clave: str) -> Optional[ReglaConfig]:
+        return self._reglas.get(clave.upper())
+
+    # === Carga y actualización ===
+
+    async def cargar(self, session_factory=None) -> None:
+        """Carga todas las configuraciones y reglas activas desde la base de datos."""
+        from ...core.database import async_session
+        from ...domains.core.models.configuracion import Configuracion, ReglaValidacionConfig
+
+        async with (session_factory or async_session)() as session:
+            configs = (await session.execute(
+                select(Configuracion).where(Configuracion.eliminado == False)
+            )).scalars().all()
+            reglas = (await session.execute(
+                select(ReglaValidacionConfig).where(ReglaValidacionConfig.activa == True)
+            )).scalars().all()
+
+        valores: Dict[str, Any] = {}
+        grupos: Dict[str, Dict[str, Any]] = {}
+        for config in configs:
+            try:
+                valor = config.get_valor()
+            except (ValueError, TypeError) as e:
+                logger.error(f"Valor inválido en configuración {config.clave}: {e}")
+                continue
+            valores[config.clave] = valor
+            grupos.setdefault(config.grupo, {})[config.clave] = valor
+
+        # Sustitución atómica: los lectores ven el registro anterior o el nuevo
+        self._valores = valores
+        self._grupos = grupos
+        self._reglas = {regla.config_clave: ReglaConfig.desde_modelo(regla) for regla in reglas}
+        self.cargado = True
+        logger.info(f"Registro de configuración cargado: {len(valores)} claves, {len(self._reglas)} reglas")
+
+    def actualizar(self, clave: str, valor: Any, grupo: Optional[str] = None) -> None:
+        """Refleja en el proceso una escritura propia sin esperar al NOTIFY."""
+        if not self.cargado:
+            return
+        clave = clave.upper()
+        self._valores[clave] = valor
+        for valores_grupo in self._grupos.values():
+            if clave in valores_grupo:
+                valores_grupo[clave] = valor
+                break
+        else:
+            if grupo is not None:
+                self._grupos.setdefault(grupo, {})[clave] = valor
+
+    def eliminar(self, clave: str) -> None:
+        clave = clave.upper()
+        self._valores.pop(clave, None)
+        for valores_grupo in self._grupos.values():
+            valores_grupo.pop(clave, None)
+
+    async def iniciar(self) -> None:
+        """Carga el registro y se suscribe a los avisos de cambio. No falla si no hay base de datos."""
+        try:
+            await self.cargar()
+        except Exception as e:
+            logger.error(f"No se pudo cargar el registro de configuración: {e}")
+        get_escucha_postgres().suscribir(CANAL_CONFIGURACION, self.cargar)
+        if self._tarea_recarga is None:
+            self._tarea_recarga = asyncio.create_task(self._recargar_periodicamente())
+
+    async def detener(self) -> None:
+        tarea, self._tarea_recarga = self._tarea_recarga, None
+        if tarea is not None:
+            tarea.cancel()
+
+    async def _recargar_periodicamente(self) -> None:
+        while True:
+            await asyncio.sleep(RECARGA_PERIODICA)
+            try:
+                await self.cargar()
+            except Exception as e:
+                logger.error(f"Error en la recarga periódica del registro de configuración: {e}")
+
+
+_registro: Optional[RegistroConfiguracion] = None
+
+
+def get_registro_configuracion() -> RegistroConfiguracion:
+    """Obtiene el registro de configuración del proceso."""
+    global _registro
+    if _registro is None:
+        _registro = RegistroConfiguracion()
+    return _registro
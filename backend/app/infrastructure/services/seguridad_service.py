@@ -4,17 +4,29 @@ import re
 import hashlib
 import ipaddress
 import logging
+import uuid
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .cache_service import get_cache_service, generar_cache_key
 from .configuracion_service import ConfiguracionService
+from .limitador_tasa import Limite, get_limitador_tasa
+from .lista_bloqueo_ip import get_lista_bloqueo_ip
 
 logger = logging.getLogger(__name__)
 
+# Periodo en el que se recuperan todos los intentos de login fallidos
+PERIODO_INTENTOS_LOGIN = 3600
+
+
+def _limite_intentos_login(max_intentos: int) -> Limite:
+    """``max_intentos`` fallos seguidos por identificador; se recupera uno cada hora / max."""
+    return Limite('intentos_login', max_intentos, PERIODO_INTENTOS_LOGIN)
+
 
 class SeguridadService:
     """Servicio de seguridad para proteger contra ataques y gestionar intentos fallidos."""
@@ -23,22 +35,22 @@ class SeguridadService:
         self.session = session
         self.cache = get_cache_service()
         self.config = ConfiguracionService(session)
+        self.limitador = get_limitador_tasa()
+        self.lista_bloqueo = get_lista_bloqueo_ip()
 
     async def registrar_intento_login(self, identificador: str, ip_address: str,
                                       exitoso: bool = False, usuario_id: Optional[str] = None) -> Dict[str, Any]:
         """Registra un intento de login."""
         try:
-            key_intentos = generar_cache_key("intentos_login", identificador)
-            key_ip = generar_cache_key("intentos_ip", ip_address)
-
             # Obtener configuración
-            max_intentos = await self.config.get_int('MAX_INTENTOS_LOGIN', 5)
-            tiempo_bloqueo = await self.config.get_int('TIEMPO_BLOQUEO_MINUTOS', 30)
+            limites = await self.config.get_many({'MAX_INTENTOS_LOGIN': 5, 'TIEMPO_BLOQUEO_MINUTOS': 30})
+            max_intentos = limites['MAX_INTENTOS_LOGIN']
+            tiempo_bloqueo = limites['TIEMPO_BLOQUEO_MINUTOS']
+            limite = _limite_intentos_login(max_intentos)
 
             if exitoso:
                 # Limpiar intentos fallidos si el login fue exitoso
-                self.cache.delete(key_intentos)
-                self.cache.delete(key_ip)
+                await self.limitador.reiniciar(limite, identificador)
 
                 # Actualizar último acceso del usuario
                 if usuario_id:
@@ -62,22 +74,15 @@ class SeguridadService:
                 }
 
             else:
-                # Incrementar contadores de intentos fallidos
-                intentos_identificador = self.cache.increment(key_intentos)
-                intentos_ip = self.cache.increment(key_ip)
-
-                # Establecer TTL en los contadores
-                if intentos_identificador == 1:
-                    self.cache.set(key_intentos, 1, 3600)  # 1 hora
-                if intentos_ip == 1:
-                    self.cache.set(key_ip, 1, 3600)  # 1 hora
+                # Consumir un intento del presupuesto (atómico: un único script en Redis)
+                resultado = await self.limitador.consumir(limite, identificador)
 
-                # Verificar si se excedió el límite
-                bloqueado = intentos_identificador >= max_intentos
+                # Bloqueado al agotar el presupuesto
+                bloqueado = resultado.restantes == 0
 
                 if bloqueado:
                     # Bloquear la IP también
-                    self._bloquear_ip(ip_address, tiempo_bloqueo)
+                    await self._bloquear_ip(ip_address, tiempo_bloqueo)
 
                     # Si hay usuario, bloquearlo en la BD
                     if usuario_id:
@@ -92,7 +97,7 @@ class SeguridadService:
                             usuario.bloqueado_hasta = datetime.utcnow() + timedelta(minutes=tiempo_bloqueo)
                             await self.session.commit()
 
-                intentos_restantes = max(0, max_intentos - intentos_identificador)
+                intentos_restantes = resultado.restantes
 
                 return {
                     'exitoso': False,
@@ -113,24 +118,24 @@ class SeguridadService:
     async def verificar_bloqueo_login(self, identificador: str, ip_address: str) -> Dict[str, Any]:
         """Verifica si un usuario o IP está bloqueado."""
         try:
-            key_intentos = generar_cache_key("intentos_login", identificador)
-            key_ip_bloqueada = generar_cache_key("ip_bloqueada", ip_address)
-
-            # Verificar bloqueo de IP
-            if self.cache.exists(key_ip_bloqueada):
-                ttl = self.cache.get_ttl(key_ip_bloqueada)
+            # Verificar bloqueo de IP (lista en memoria, incluye rangos CIDR)
+            await self.lista_bloqueo.asegurar_cargado()
+            ttl = self.lista_bloqueo.segundos_restantes(ip_address)
+            if ttl is not None:
                 return {
                     'bloqueado': True,
                     'razon': 'IP_BLOQUEADA',
                     'tiempo_restante_segundos': ttl,
-                    'mensaje': f'Esta IP está bloqueada temporalmente. Intente nuevamente en {ttl} segundos.'
+                    'mensaje': ('Esta IP está bloqueada.' if ttl < 0 else
+                                f'Esta IP está bloqueada temporalmente. Intente nuevamente en {ttl} segundos.')
                 }
 
             # Verificar bloqueo de usuario
-            intentos = self.cache.get(key_intentos, 0)
             max_intentos = await self.config.get_int('MAX_INTENTOS_LOGIN', 5)
+            resultado = await self.limitador.consultar(_limite_intentos_login(max_intentos), identificador)
+            intentos = max_intentos - resultado.restantes
 
-            if intentos >= max_intentos:
+            if resultado.restantes == 0:
                 return {
                     'bloqueado': True,
                     'razon': 'USUARIO_BLOQUEADO',
@@ -151,17 +156,42 @@ class SeguridadService:
                 'error': str(e)
             }
 
-    def _bloquear_ip(self, ip_address: str, minutos: int):
-        """Bloquea una IP temporalmente."""
-        key = generar_cache_key("ip_bloqueada", ip_address)
-        self.cache.set(key, True, minutos * 60)
+    async def _bloquear_ip(self, ip_address: str, minutos: int):
+        """Bloquea una IP temporalmente.
+
+        Se registra en ``ips_bloqueadas`` (el resto de procesos lo recibe por
+        NOTIFY) y en la lista de bloqueo de este proceso al momento.
+        """
+        from ...domains.core.models.seguridad import IPBloqueada
+
+        hasta = datetime.utcnow() + timedelta(minutes=minutos)
+        stmt = pg_insert(IPBloqueada).values(
+            id=uuid.uuid4(),
+            ip_address=ip_address,
+            motivo='Demasiados intentos de login fallidos',
+            intentos_fallidos=1,
+            fecha_desbloqueo=hasta,
+        )
+        await self.session.execute(stmt.on_conflict_do_update(
+            index_elements=[IPBloqueada.ip_address],
+            set_={
+                'motivo': stmt.excluded.motivo,
+                'intentos_fallidos': IPBloqueada.intentos_fallidos + 1,
+                'fecha_desbloqueo': stmt.excluded.fecha_desbloqueo,
+                'eliminado': False,
+                'fecha_modificacion': func.now(),
+            },
+        ))
+        await self.session.commit()
+
+        self.lista_bloqueo.bloquear(ip_address, hasta)
         logger.warning(f"IP bloqueada: {ip_address} por {minutos} minutos")
 
     async def registrar_cambio_contrasena(self, usuario_id: str, ip_address: str) -> bool:
         """Registra un cambio de contraseña exitoso."""
         try:
             key = generar_cache_key("cambio_contrasena", usuario_id)
-            self.cache.set(key, {
+            await self.cache.aset(key, {
                 'fecha': datetime.utcnow().isoformat(),
                 'ip': ip_address
             }, 86400)  # 24 horas
@@ -177,7 +207,7 @@ class SeguridadService:
         """Verifica si se cambió la contraseña recientemente."""
         try:
             key = generar_cache_key("cambio_contrasena", usuario_id)
-            cambio = self.cache.get(key)
+            cambio = await self.cache.aget(key)
 
             if cambio:
                 fecha_cambio = datetime.fromisoformat(cambio['fecha'])
@@ -208,11 +238,18 @@ class SeguridadService:
     async def validar_fortaleza_contrasena(self, contrasena: str) -> Dict[str, Any]:
         """Valida la fortaleza de una contraseña."""
         try:
-            longitud_minima = await self.config.get_int('CONTRASENA_LONGITUD_MINIMA', 8)
-            requiere_mayusculas = await self.config.get_bool('CONTRASENA_REQUIERE_MAYUSCULAS', True)
-            requiere_minusculas = await self.config.get_bool('CONTRASENA_REQUIERE_MINUSCULAS', True)
-            requiere_numeros = await self.config.get_bool('CONTRASENA_REQUIERE_NUMEROS', True)
-            requiere_especiales = await self.config.get_bool('CONTRASENA_REQUIERE_ESPECIALES', False)
+            politica = await self.config.get_many({
+                'CONTRASENA_LONGITUD_MINIMA': 8,
+                'CONTRASENA_REQUIERE_MAYUSCULAS': True,
+                'CONTRASENA_REQUIERE_MINUSCULAS': True,
+                'CONTRASENA_REQUIERE_NUMEROS': True,
+                'CONTRASENA_REQUIERE_ESPECIALES': False,
+            })
+            longitud_minima = politica['CONTRASENA_LONGITUD_MINIMA']
+            requiere_mayusculas = politica['CONTRASENA_REQUIERE_MAYUSCULAS']
+            requiere_minusculas = politica['CONTRASENA_REQUIERE_MINUSCULAS']
+            requiere_numeros = politica['CONTRASENA_REQUIERE_NUMEROS']
+            requiere_especiales = politica['CONTRASENA_REQUIERE_ESPECIALES']
 
             errores = []
             puntuacion = 0
@@ -329,7 +366,7 @@ class SeguridadService:
             }
 
             # TTL de 24 horas
-            self.cache.set(key, datos_sesion, 86400)
+            await self.cache.aset(key, datos_sesion, 86400)
 
             return True
 
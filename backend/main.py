@@ -4,12 +4,28 @@ Punto de entrada de la aplicación AIEL.
 API GraphQL con generación automática desde modelos SQLAlchemy usando Strawchemy.
 """
 
-from fastapi import FastAPI
+import hmac
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from strawberry.fastapi import GraphQLRouter
 
+from app.core.auth import cerrar_pool_hash
+from app.core.admision import ControlAdmisionMiddleware, get_control_admision
+from app.core.bloqueo_ip import BloqueoIPMiddleware, ip_cliente
+from app.core.config import get_settings
+from app.core.database import exportar_metricas_pool
+from app.core.limite_tasa import LimiteTasaMiddleware
 from app.graphql.context import get_context
 from app.graphql.schema_simple import schema
+from app.infrastructure.services.cache_service import get_cache_service, metricas as metricas_cache
+from app.infrastructure.registro_estados import registro_estados
+from app.infrastructure.registro_permisos import registro_permisos
+from app.infrastructure.services.escucha_postgres import get_escucha_postgres
+from app.infrastructure.services.lista_bloqueo_ip import get_lista_bloqueo_ip
+from app.infrastructure.services.registro_configuracion import get_registro_configuracion
 
 # Crear router GraphQL con contexto de sesión DB
 graphql_app = GraphQLRouter(
@@ -18,13 +34,39 @@ graphql_app = GraphQLRouter(
     graphiql=True,  # Habilitar GraphiQL playground
 )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Arranque y parada de recursos compartidos."""
+    await get_registro_configuracion().iniciar()
+    await registro_estados.iniciar()
+    await registro_permisos.iniciar()
+    await get_lista_bloqueo_ip().iniciar()
+    await get_escucha_postgres().iniciar()
+    yield
+    await get_escucha_postgres().detener()
+    await get_registro_configuracion().detener()
+    await registro_permisos.detener()
+    await get_cache_service().aclose()
+    cerrar_pool_hash()
+
+
 # Crear aplicación FastAPI
 app = FastAPI(
+    lifespan=lifespan,
     title="AIEL API",
     description="API GraphQL para gestión de asociación política con generación automática desde SQLAlchemy",
     version="0.1.0",
 )
 
+# Control de admisión: operaciones /graphql en curso acotadas por worker, 503 al saturarse
+app.add_middleware(ControlAdmisionMiddleware, prefijo="/graphql")
+
+# Límite de tasa por IP y por usuario en /graphql (dentro de CORS: los 429 llevan sus cabeceras)
+app.add_middleware(LimiteTasaMiddleware, prefijo="/graphql")
+
+# IPs bloqueadas (lista en memoria): se rechazan antes de consumir el límite de tasa
+app.add_middleware(BloqueoIPMiddleware, prefijo="/graphql")
+
 # Configurar CORS
 app.add_middleware(
     CORSMiddleware,
@@ -53,3 +95,23 @@ async def root():
 async def health():
     """Health check endpoint."""
     return {"status": "ok"}
+
+
+CLIENTES_LOCALES = {"127.0.0.1", "::1"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics(request: Request):
+    """Métricas en formato Prometheus.
+
+    Con ``METRICS_TOKEN`` exige ``Authorization: Bearer <token>``; sin él solo
+    responde a clientes locales (el scraper en la misma máquina).
+    """
+    token = get_settings().metrics_token
+    if token:
+        recibido = request.headers.get("authorization", "")
+        if not hmac.compare_digest(recibido.encode(), f"Bearer {token}".encode()):
+            raise HTTPException(status_code=401, detail="Token de métricas inválido")
+    elif ip_cliente(request.scope) not in CLIENTES_LOCALES:
+        raise HTTPException(status_code=404)
+    return metricas_cache.exportar() + exportar_metricas_pool() + get_control_admision().exportar()
@@ -0,0 +1,79 @@
+"""Benchmark de verificación de contraseñas bajo carga concurrente.
+
+Compara ``verify_password`` llamado directamente desde corrutinas (bloquea
+el event loop) con ``averify_password`` (pool de hilos acotado). Para cada
+modo lanza ``--logins`` verificaciones con ``--simultaneos`` en vuelo y, a
+la vez, una tarea que mide el retraso del event loop: es lo que sufre
+cualquier otra petición atendida por el mismo worker.
+
+Uso (desde backend/):
+    python -m scripts.benchmark_login --logins 64 --simultaneos 16 --concurrencia 4
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+TICK = 0.01
+
+
+async def medir_retraso(parar: asyncio.Event, retrasos: list) -> None:
+    """Retraso de cada tick de ``TICK`` segundos respecto a lo previsto."""
+    while not parar.is_set():
+        inicio = time.perf_counter()
+        await asyncio.sleep(TICK)
+        retrasos.append(time.perf_counter() - inicio - TICK)
+
+
+async def ejecutar(nombre: str, verificar, hashed: str, logins: int, simultaneos: int) -> None:
+    semaforo = asyncio.Semaphore(simultaneos)
+    latencias = []
+
+    async def login():
+        async with semaforo:
+            inicio = time.perf_counter()
+            assert await verificar("Contrasena-Segura-1", hashed)
+            latencias.append(time.perf_counter() - inicio)
+
+    parar, retrasos = asyncio.Event(), []
+    monitor = asyncio.create_task(medir_retraso(parar, retrasos))
+    inicio = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    total = time.perf_counter() - inicio
+    parar.set()
+    await monitor
+
+    latencias.sort()
+    print(f"{nombre:<12} {logins / total:8.1f} logins/s   "
+          f"p50 {statistics.median(latencias) * 1000:7.1f} ms   "
+          f"p99 {latencias[int(len(latencias) * 0.99) - 1] * 1000:7.1f} ms   "
+          f"retraso máx. del loop {max(retrasos, default=0) * 1000:7.1f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--simultaneos", type=int, default=16, help="logins en vuelo a la vez")
+    parser.add_argument("--concurrencia", type=int, default=None, help="tamaño del pool (HASH_CONCURRENCIA)")
+    args = parser.parse_args()
+
+    if args.concurrencia is not None:
+        os.environ["HASH_CONCURRENCIA"] = str(args.concurrencia)
+    from app.core.auth import averify_password, cerrar_pool_hash, hash_password, verify_password
+    from app.core.config import get_settings
+
+    hashed = hash_password("Contrasena-Segura-1")
+    print(f"CPUs: {os.cpu_count()}   pool: {get_settings().hash_concurrencia} hilos   "
+          f"{args.logins} logins, {args.simultaneos} simultáneos\n")
+
+    async def sincrono(plain, hashed):
+        return verify_password(plain, hashed)
+
+    await ejecutar("síncrono", sincrono, hashed, args.logins, args.simultaneos)
+    await ejecutar("pool", averify_password, hashed, args.logins, args.simultaneos)
+    cerrar_pool_hash()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
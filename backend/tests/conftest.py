@@ -0,0 +1,14 @@
+"""Configuración común de los tests unitarios (sin base de datos ni Redis)."""
+
+import os
+
+# Settings exige la conexión y el secreto JWT; los tests no se conectan a nada
+for variable, valor in {
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_NAME": "test",
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "JWT_SECRET": "test",
+}.items():
+    os.environ.setdefault(variable, valor)
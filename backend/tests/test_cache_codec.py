@@ -0,0 +1,106 @@
+"""Codecs de caché: ida y vuelta, compresión y lectura entre codecs."""
+
+import enum
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+
+import pytest
+
+from app.infrastructure.services.cache_codec import (
+    INVALIDO,
+    CodecMsgpack,
+    CodecOrjson,
+    CodecPickle,
+    Serializador,
+    crear_codec,
+)
+
+
+class Color(enum.Enum):
+    ROJO = 'rojo'
+
+
+def _codec(fabrica):
+    try:
+        return fabrica()
+    except ImportError as e:
+        pytest.skip(f"{fabrica.__name__} no disponible: {e}")
+
+
+VALOR = {
+    'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'importe': Decimal('12.50'),
+    'fecha': date(2025, 3, 31),
+    'creado': datetime(2025, 3, 31, 10, 30, 5),
+    'hora': time(9, 15),
+    'etiquetas': {'a', 'b'},
+    'lista': [1, 2.5, None, True, 'texto'],
+}
+
+
+@pytest.mark.parametrize('fabrica', [CodecPickle, CodecMsgpack])
+def test_conserva_tipos(fabrica):
+    serializador = Serializador(_codec(fabrica))
+
+    assert serializador.decodificar(serializador.codificar(VALOR)) == VALOR
+
+
+def test_orjson_devuelve_cadenas():
+    serializador = Serializador(_codec(CodecOrjson))
+    valor = {'id': VALOR['id'], 'importe': Decimal('12.50'), 'fecha': date(2025, 3, 31), 'color': Color.ROJO}
+
+    assert serializador.decodificar(serializador.codificar(valor)) == {
+        'id': str(VALOR['id']), 'importe': '12.50', 'fecha': '2025-03-31', 'color': 'rojo',
+    }
+
+
+@pytest.mark.parametrize('valor', [0, 42, -7, 10 ** 12])
+def test_enteros_en_ascii(valor):
+    serializador = Serializador(CodecPickle())
+
+    datos = serializador.codificar(valor)
+
+    assert datos == str(valor).encode()
+    assert serializador.decodificar(datos) == valor
+    # Lo que deja INCR en Redis se lee igual
+    assert serializador.decodificar(b'43') == 43
+
+
+def test_booleanos_no_son_enteros():
+    serializador = Serializador(CodecPickle())
+
+    assert serializador.decodificar(serializador.codificar(True)) is True
+
+
+def test_compresion_por_encima_del_umbral():
+    pytest.importorskip('zstandard')
+    serializador = Serializador(CodecPickle(), umbral_compresion=100)
+    valor = 'x' * 10_000
+
+    datos = serializador.codificar(valor)
+
+    assert datos[:2] == b'PZ'
+    assert len(datos) < 1000
+    assert serializador.decodificar(datos) == valor
+    assert serializador.codificar('corto')[:2] == b'P-'
+
+
+def test_lee_valores_de_otro_codec():
+    escrito = Serializador(CodecPickle()).codificar({'a': 1})
+    lector = Serializador(_codec(CodecOrjson))
+
+    assert lector.decodificar(escrito) == {'a': 1}
+
+
+def test_datos_ilegibles_son_invalidos():
+    serializador = Serializador(CodecPickle())
+
+    assert serializador.decodificar(b'P-basura') is INVALIDO
+    assert serializador.decodificar(b'Q-desconocido') is INVALIDO
+
+
+def test_crear_codec():
+    assert isinstance(crear_codec('pickle'), CodecPickle)
+    with pytest.raises(ValueError):
+        crear_codec('xml')
@@ -0,0 +1,89 @@
+"""Seguimiento de escrituras por transacción y tareas tras el commit."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import Integer, String, create_engine, update
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from app.core.database import esperar_tareas_tras_commit
+from app.infrastructure import cambios_sesion
+from app.infrastructure.cambios_sesion import al_confirmar
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class Pais(_Base):
+    __tablename__ = 'paises_test'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    nombre: Mapped[str] = mapped_column(String(50))
+
+
+@pytest.fixture
+def sesion():
+    engine = create_engine('sqlite://')
+    _Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def recibidos(monkeypatch):
+    monkeypatch.setattr(cambios_sesion, '_funciones', [])
+    recibidos = []
+    al_confirmar(recibidos.append)
+    return recibidos
+
+
+def test_anota_flush_y_dml(sesion, recibidos):
+    pais = Pais(id=1, nombre='España')
+    sesion.add(pais)
+    sesion.commit()
+    pais.nombre = 'Portugal'
+    sesion.flush()
+    sesion.execute(update(Pais).where(Pais.id == 1).values(nombre='Francia'))
+    sesion.commit()
+
+    insercion, modificacion = recibidos
+    # Las filas nuevas aún no tienen identidad en after_flush
+    assert insercion.filas == {(Pais, None)}
+    assert not insercion.clases_dml
+    assert modificacion.tablas == {'paises_test'}
+    assert modificacion.filas == {(Pais, (1,))}
+    assert modificacion.clases_dml == modificacion.masivas == {Pais}
+
+
+def test_sin_escrituras_no_llama(sesion, recibidos):
+    sesion.get(Pais, 1)
+    sesion.commit()
+
+    assert recibidos == []
+
+
+def test_rollback_descarta(sesion, recibidos):
+    sesion.add(Pais(id=1, nombre='España'))
+    sesion.flush()
+    sesion.rollback()
+    sesion.commit()
+
+    assert recibidos == []
+
+
+async def test_la_peticion_espera_las_tareas(sesion, monkeypatch):
+    monkeypatch.setattr(cambios_sesion, '_funciones', [])
+    hechas = []
+
+    async def invalidar(tablas):
+        await asyncio.sleep(0.01)
+        hechas.append(tablas)
+
+    al_confirmar(lambda cambios: invalidar(cambios.tablas))
+    sesion.add(Pais(id=1, nombre='España'))
+    sesion.commit()
+
+    assert hechas == []
+    await esperar_tareas_tras_commit(sesion)
+    assert hechas == [{'paises_test'}]
@@ -0,0 +1,117 @@
+"""Análisis estático de coste y profundidad de las operaciones GraphQL."""
+
+import pytest
+from graphql import FragmentDefinitionNode, OperationDefinitionNode, build_schema, parse
+
+from app.graphql import coste
+from app.graphql.coste import TAMANIO_LISTA_SIN_LIMITE, AnalizadorCoste
+from app.graphql.paginacion import PAGINA_POR_DEFECTO
+
+SCHEMA = build_schema("""
+    type Agrupacion { id: ID! nombre: String! miembros(limit: Int): [Miembro!]! }
+    type Miembro {
+        id: ID!
+        nombre: String!
+        agrupacion: Agrupacion!
+        cuotas(limit: Int): [Cuota!]!
+        cuotasAggregate: Agregado!
+    }
+    type Cuota { id: ID! importe: Float! }
+    type Agregado { count: Int! }
+    type Donacion { id: ID! donante: Miembro! }
+
+    union Movimiento = Cuota | Donacion
+    interface Nodo { id: ID! }
+    type Campania implements Nodo { id: ID! responsable: Miembro! }
+    type Tarea implements Nodo { id: ID! }
+
+    type Arista { cursor: String! node: Miembro! }
+    type MiembroConexion { edges: [Arista!]! }
+
+    type Query {
+        miembros(limit: Int): [Miembro!]!
+        miembro(id: ID!): Miembro
+        agrupaciones(limit: Int): [Agrupacion!]!
+        movimientos(limit: Int): [Movimiento!]!
+        nodo(id: ID!): Nodo
+        miembrosConexion(first: Int, after: String): MiembroConexion!
+    }
+""")
+
+
+def analizar(consulta, variables=None):
+    documento = parse(consulta)
+    operacion = next(d for d in documento.definitions if isinstance(d, OperationDefinitionNode))
+    fragmentos = {d.name.value: d for d in documento.definitions if isinstance(d, FragmentDefinitionNode)}
+    return AnalizadorCoste(SCHEMA, fragmentos, variables, operacion).analizar(operacion)
+
+
+def test_escalares_no_pesan():
+    assert analizar('{ miembro(id: 1) { id nombre } }') == (1, 1)
+
+
+def test_lista_con_limite_cuesta_por_fila():
+    assert analizar('{ miembros(limit: 10) { id agrupacion { nombre } } }') == (10 * (1 + 1), 2)
+
+
+def test_limite_por_variable_y_por_defecto():
+    consulta = 'query ($n: Int = 5) { miembros(limit: $n) { id } }'
+    assert analizar(consulta) == (5, 1)
+    assert analizar(consulta, {'n': 20}) == (20, 1)
+
+
+def test_lista_sin_limite_es_cara():
+    assert analizar('{ miembros { id } }') == (TAMANIO_LISTA_SIN_LIMITE, 1)
+
+
+def test_listas_anidadas_se_multiplican():
+    total, profundidad = analizar('{ agrupaciones(limit: 10) { miembros(limit: 20) { cuotas(limit: 3) { id } } } }')
+    assert total == 10 * (1 + 20 * (1 + 3 * 1))
+    assert profundidad == 3
+
+
+def test_agregados_pesan_mas():
+    assert analizar('{ miembro(id: 1) { cuotasAggregate { count } } }') == (1 + coste.PESO_AGREGADO, 2)
+
+
+def test_pesos_por_campo(monkeypatch):
+    monkeypatch.setitem(coste.PESOS, 'Miembro.agrupacion', 10)
+    assert analizar('{ miembro(id: 1) { agrupacion { id } } }') == (11, 2)
+
+
+def test_conexion_aplica_first_a_edges():
+    assert analizar('{ miembrosConexion(first: 10) { edges { node { id } } } }') == (1 + 10 * (1 + 1), 3)
+    assert analizar('{ miembrosConexion { edges { node { id } } } }') == (1 + PAGINA_POR_DEFECTO * 2, 3)
+
+
+def test_union_cuesta_lo_del_tipo_mas_caro():
+    consulta = '''{
+        movimientos(limit: 10) {
+            ... on Cuota { importe }
+            ... on Donacion { donante { agrupacion { id } } }
+        }
+    }'''
+    assert analizar(consulta) == (10 * (1 + 2), 3)
+
+
+def test_interfaz_con_fragmentos():
+    consulta = '''
+        fragment Responsable on Campania { responsable { cuotas(limit: 4) { id } } }
+        { nodo(id: 1) { id ...Responsable } }
+    '''
+    assert analizar(consulta) == (1 + 1 + 4, 3)
+
+
+def test_fragmento_de_otro_tipo_no_cuenta():
+    consulta = '{ nodo(id: 1) { ... on Tarea { id } ... on Campania { responsable { id } } } }'
+    assert analizar(consulta) == (1 + 1, 2)
+
+
+def test_introspeccion_no_cuesta():
+    assert analizar('{ __schema { types { name fields { name } } } }') == (0, 0)
+
+
+@pytest.mark.parametrize('niveles', [1, 4, 9])
+def test_profundidad(niveles):
+    consulta = '{ miembro(id: 1) { ' + 'agrupacion { miembros(limit: 1) { ' * niveles + 'id' + ' } }' * niveles + ' } }'
+    assert analizar(consulta)[1] == 1 + 2 * niveles
@@ -0,0 +1,103 @@
+"""Cambio de estado masivo: un UPDATE ... RETURNING por transición y un único INSERT de historial."""
+
+import uuid
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models import *  # noqa: F401,F403  (configura todos los mappers)
+from app.domains.core.models.estados import EstadoCuota
+from app.domains.financiero.models.cuotas import CuotaAnual
+from app.infrastructure.registro_estados import _info_catalogo, registro_estados
+from app.infrastructure.services.estado_service import EstadoService
+
+TRANSICIONES = 100_000
+
+
+class _Fila:
+    def __init__(self, codigo, orden):
+        self.id = uuid.uuid4()
+        self.codigo = codigo
+        self.nombre = codigo.title()
+        self.orden = orden
+        self.activo = True
+        self.es_final = codigo in EstadoCuota.CODIGOS_FINALES
+
+
+class _Resultado:
+    def __init__(self, filas):
+        self._filas = filas
+
+    def all(self):
+        return self._filas
+
+
+class _SesionFalsa:
+    """Registra las sentencias y devuelve ``filas_por_update`` filas a cada UPDATE."""
+
+    def __init__(self, filas_por_update):
+        self.filas_por_update = list(filas_por_update)
+        self.sentencias = []
+
+    async def execute(self, sentencia, parametros=None):
+        self.sentencias.append((sentencia, parametros))
+        if sentencia.is_dml and sentencia.is_update:
+            return _Resultado(self.filas_por_update.pop(0))
+        return _Resultado([])
+
+
+@pytest.fixture
+def estados_cuota(monkeypatch):
+    filas = [_Fila(codigo, orden) for orden, codigo in
+             enumerate(('PENDIENTE', 'COBRADA', 'IMPAGADA', 'ANULADA', 'EXENTA'))]
+    catalogo = _info_catalogo(EstadoCuota, filas)
+    monkeypatch.setattr(registro_estados, '_por_codigo', {EstadoCuota.__tablename__: catalogo})
+    monkeypatch.setattr(registro_estados, '_por_id', {estado.id: estado for estado in catalogo.values()})
+    monkeypatch.setattr(registro_estados, 'cargado', True)
+    return catalogo
+
+
+def _sql(sentencia) -> str:
+    return str(sentencia.compile(dialect=postgresql.dialect()))
+
+
+async def test_un_update_por_transicion_y_un_insert_de_historial(estados_cuota):
+    ids = [uuid.uuid4() for _ in range(TRANSICIONES)]
+    pendiente, impagada = estados_cuota['PENDIENTE'].id, estados_cuota['IMPAGADA'].id
+    # Sin estado, desde PENDIENTE y desde IMPAGADA (las dos transiciones hacia ANULADA)
+    sesion = _SesionFalsa([
+        [(ids[0], None)],
+        [(i, pendiente) for i in ids[1:60_000]],
+        [(i, impagada) for i in ids[60_000:]],
+    ])
+
+    cambiados = await EstadoService(sesion).cambiar_estado_masivo(CuotaAnual, 'ANULADA', ids=ids)
+
+    assert cambiados == TRANSICIONES
+    updates = [s for s, _ in sesion.sentencias if s.is_update]
+    inserts = [(s, p) for s, p in sesion.sentencias if s.is_insert]
+    assert len(updates) == 3
+    assert all('RETURNING' in _sql(s) for s in updates)
+    assert 'estado_id IS NULL' in _sql(updates[0])
+    # Los ids van en un único parámetro array, no uno por id
+    assert _sql(updates[0]).count('%(ids_masivo') == 1
+
+    assert len(inserts) == 1
+    historial = inserts[0][1]
+    assert len(historial) == TRANSICIONES
+    assert historial[0]['estado_anterior_id'] is None
+    assert {fila['estado_nuevo_id'] for fila in historial} == {estados_cuota['ANULADA'].id}
+
+
+async def test_sin_cambios_no_inserta_historial(estados_cuota):
+    sesion = _SesionFalsa([[], [], []])
+
+    cambiados = await EstadoService(sesion).cambiar_estado_masivo(CuotaAnual, 'ANULADA', ids=[uuid.uuid4()])
+
+    assert cambiados == 0
+    assert not any(s.is_insert for s, _ in sesion.sentencias)
+
+
+async def test_exige_ids_o_filtro(estados_cuota):
+    with pytest.raises(ValueError):
+        await EstadoService(_SesionFalsa([])).cambiar_estado_masivo(CuotaAnual, 'ANULADA')
@@ -0,0 +1,89 @@
+"""Algoritmo GCRA del limitador de tasa (implementación en memoria, sin Redis)."""
+
+import pytest
+
+from app.infrastructure.services import limitador_tasa
+from app.infrastructure.services.cache_service import CacheService
+from app.infrastructure.services.limitador_tasa import Limite, LimitadorTasa
+
+# 10 peticiones cada 10 s: una por segundo, ráfaga de 10
+LIMITE = Limite('test', peticiones=10, periodo=10)
+
+
+class _Reloj:
+    def __init__(self):
+        self.ahora = 1000.0
+
+    def monotonic(self):
+        return self.ahora
+
+
+@pytest.fixture
+def reloj(monkeypatch):
+    reloj = _Reloj()
+    monkeypatch.setattr(limitador_tasa.time, 'monotonic', reloj.monotonic)
+    return reloj
+
+
+@pytest.fixture
+def limitador(reloj):
+    return LimitadorTasa(cache=CacheService())
+
+
+def test_intervalo_y_tolerancia():
+    assert LIMITE.intervalo_ms == 1000
+    assert LIMITE.tolerancia_ms == 10_000
+    assert Limite('r', 10, 10, rafaga=3).tolerancia_ms == 3000
+
+
+async def test_rafaga_y_recuperacion_continua(limitador, reloj):
+    resultados = [await limitador.consumir(LIMITE, 'ip:1') for _ in range(10)]
+    assert all(r.permitido for r in resultados)
+    assert [r.restantes for r in resultados] == list(range(9, -1, -1))
+
+    rechazado = await limitador.consumir(LIMITE, 'ip:1')
+    assert not rechazado.permitido
+    assert rechazado.reintentar_en == pytest.approx(1.0)
+
+    # Se recupera una petición por intervalo, no todo el presupuesto de golpe
+    reloj.ahora += 1
+    assert (await limitador.consumir(LIMITE, 'ip:1')).permitido
+    assert not (await limitador.consumir(LIMITE, 'ip:1')).permitido
+
+
+async def test_presupuesto_por_identificador(limitador):
+    for _ in range(10):
+        await limitador.consumir(LIMITE, 'ip:1')
+
+    assert not (await limitador.consumir(LIMITE, 'ip:1')).permitido
+    assert (await limitador.consumir(LIMITE, 'ip:2')).permitido
+
+
+async def test_coste(limitador, reloj):
+    assert (await limitador.consumir(LIMITE, 'u', coste=7)).restantes == 3
+
+    rechazado = await limitador.consumir(LIMITE, 'u', coste=5)
+    assert not rechazado.permitido
+    assert rechazado.reintentar_en == pytest.approx(2.0)
+
+    reloj.ahora += 2
+    assert (await limitador.consumir(LIMITE, 'u', coste=5)).permitido
+
+
+async def test_coste_mayor_que_la_rafaga_nunca_cabe(limitador):
+    assert not (await limitador.consumir(LIMITE, 'u', coste=11)).permitido
+
+
+async def test_consultar_no_consume(limitador):
+    await limitador.consumir(LIMITE, 'u', coste=4)
+
+    assert (await limitador.consultar(LIMITE, 'u')).restantes == 6
+    assert (await limitador.consultar(LIMITE, 'u')).restantes == 6
+
+
+async def test_reiniciar(limitador):
+    await limitador.consumir(LIMITE, 'u', coste=10)
+
+    await limitador.reiniciar(LIMITE, 'u')
+
+    assert (await limitador.consumir(LIMITE, 'u')).restantes == 9
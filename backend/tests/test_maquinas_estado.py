@@ -0,0 +1,64 @@
+"""Máquinas de estados declarativas: compilación, validación y transiciones masivas."""
+
+from app.models import *  # noqa: F401,F403  (configura todos los mappers)
+from app.domains.financiero.models.cuotas import CuotaAnual
+from app.infrastructure.maquinas_estado import CampoEstado, MaquinaEstados, Transicion, campo_estado, maquina_de
+
+
+class Pedido:
+    pass
+
+
+def _maquina():
+    return MaquinaEstados(Pedido, CampoEstado('estado_id', 'estados_pedido'), (
+        Transicion('NUEVO', ('PAGADO', 'ANULADO')),
+        Transicion('PAGADO', 'ENVIADO', guarda=lambda pedido: pedido.direccion is not None),
+        Transicion('ENVIADO', 'ENTREGADO', efecto=lambda pedido: None),
+        Transicion(('PAGADO', 'ENVIADO'), 'DEVUELTO', valores={'reembolsado': True}),
+    ))
+
+
+def test_permite_solo_transiciones_declaradas():
+    maquina = _maquina()
+
+    assert maquina.permite(Pedido(), 'NUEVO', 'PAGADO')
+    assert maquina.permite(Pedido(), 'NUEVO', 'ANULADO')
+    assert not maquina.permite(Pedido(), 'PAGADO', 'NUEVO')
+    assert not maquina.permite(Pedido(), 'ANULADO', 'PAGADO')
+
+
+def test_guarda():
+    maquina = _maquina()
+    con_direccion, sin_direccion = Pedido(), Pedido()
+    con_direccion.direccion, sin_direccion.direccion = 'Calle Mayor 1', None
+
+    assert maquina.permite(con_direccion, 'PAGADO', 'ENVIADO')
+    assert not maquina.permite(sin_direccion, 'PAGADO', 'ENVIADO')
+
+
+def test_varios_origenes_comparten_transicion():
+    maquina = _maquina()
+
+    transicion = maquina.transicion('PAGADO', 'DEVUELTO')
+    assert transicion is maquina.transicion('ENVIADO', 'DEVUELTO')
+    assert transicion.valores == {'reembolsado': True}
+    assert maquina.transicion('NUEVO', 'DEVUELTO') is None
+
+
+def test_masivas_excluye_guardas_y_efectos():
+    maquina = _maquina()
+
+    assert maquina.masivas('ENVIADO') == []
+    assert maquina.masivas('ENTREGADO') == []
+    [(transicion, origenes)] = maquina.masivas('DEVUELTO')
+    assert origenes == {'PAGADO', 'ENVIADO'}
+    assert transicion.masiva
+
+
+def test_maquina_de_un_modelo():
+    assert campo_estado(CuotaAnual) == CampoEstado('estado_id', 'estados_cuota')
+    maquina = maquina_de(CuotaAnual)
+    assert maquina is maquina_de(CuotaAnual)
+    assert maquina.permite(None, 'PENDIENTE', 'COBRADA')
+    assert maquina.permite(None, 'IMPAGADA', 'PENDIENTE')
+    assert not maquina.permite(None, 'COBRADA', 'PENDIENTE')
@@ -0,0 +1,60 @@
+"""Cursores de la paginación por keyset."""
+
+import uuid
+from datetime import date, datetime
+
+import pytest
+
+from app.models import *  # noqa: F401,F403  (configura todos los mappers)
+from app.domains.financiero.models.cuotas import CuotaAnual
+from app.graphql.paginacion import (
+    PAGINA_MAXIMA,
+    PAGINA_POR_DEFECTO,
+    CursorInvalido,
+    OrdenKeyset,
+    codificar_cursor,
+    decodificar_cursor,
+    tamano_pagina,
+)
+
+ORDEN = OrdenKeyset((CuotaAnual.ejercicio, CuotaAnual.fecha_vencimiento, CuotaAnual.id))
+
+
+def test_ida_y_vuelta_conserva_tipos():
+    valores = [2025, date(2025, 3, 31), uuid.uuid4()]
+
+    cursor = codificar_cursor(valores)
+
+    assert '=' not in cursor
+    assert decodificar_cursor(cursor, ORDEN) == valores
+
+
+def test_valores_nulos():
+    valores = [2025, None, uuid.uuid4()]
+
+    assert decodificar_cursor(codificar_cursor(valores), ORDEN) == valores
+
+
+def test_fecha_y_hora():
+    orden = OrdenKeyset((CuotaAnual.fecha_creacion, CuotaAnual.id))
+    valores = [datetime(2025, 1, 2, 3, 4, 5), uuid.uuid4()]
+
+    assert decodificar_cursor(codificar_cursor(valores), orden) == valores
+
+
+@pytest.mark.parametrize('cursor', [
+    'no-es-base64!',
+    codificar_cursor([2025, '2025-03-31']),               # faltan claves
+    codificar_cursor([2025, '2025-03-31', 'no-uuid']),    # tipo incorrecto
+    codificar_cursor([2025, 'mañana', str(uuid.uuid4())]),
+])
+def test_cursor_invalido(cursor):
+    with pytest.raises(CursorInvalido):
+        decodificar_cursor(cursor, ORDEN)
+
+
+def test_tamano_pagina():
+    assert tamano_pagina(None) == PAGINA_POR_DEFECTO
+    assert tamano_pagina(0) == 1
+    assert tamano_pagina(10) == 10
+    assert tamano_pagina(10_000) == PAGINA_MAXIMA